@@ -2,289 +2,919 @@ import sys
 import pyperclip
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget, QPushButton, 
                             QTextEdit, QHBoxLayout, QGroupBox, QComboBox, QSpinBox, QColorDialog,
-                            QMenu, QAction, QMessageBox, QFileDialog, QScrollArea, QGridLayout)
+                            QMenu, QAction, QMessageBox, QFileDialog, QScrollArea, QGridLayout,
+                            QProgressDialog, QDialog, QTableWidget, QTableWidgetItem, QCompleter,
+                            QSlider, QToolTip, QLineEdit, QListWidget, QListWidgetItem, QActionGroup)
 from PyQt5.QtGui import (QColor, QPixmap, QScreen, QPainter, QFont, QIcon, QPalette, QImage, 
-                        QClipboard)
-from PyQt5.QtCore import Qt, QTimer, QPoint, QSize
-from PIL import ImageGrab
-import numpy as np
+                        QClipboard, QPen)
+from PyQt5.QtCore import Qt, QTimer, QPoint, QRect, QSize, QSettings, QThread, pyqtSignal
+import codecs
+import csv
 import json
 import os
+import re
+import struct
+import time
 
-class ColorNameFinder:
-    def __init__(self):
-        self.load_color_databases()
-        
-    def is_valid_rgb(self, rgb):
-        """验证RGB值是否有效"""
-        if not isinstance(rgb, (tuple, list)) or len(rgb) != 3:
+from color_core import DATABASES, DEFAULT_LOCALE, LOCALES, METRICS, METRIC_NAMES, ColorNameFinder, parse_rgb_value
+
+
+def iter_json_entries(f, chunk_size=65536):
+    """增量解析JSON数组或对象, 逐条产出条目
+
+    数组逐个产出元素; 对象逐个产出 (键, 值) 二元组。
+    每次只读取 chunk_size 个字符, 不会一次性载入整个文件。
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
             return False
-        return all(isinstance(x, (int, float)) and 0 <= x <= 255 for x in rgb)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
 
-    def get_gb_color_name(self, rgb):
-        """获取GB标准颜色名称"""
-        if not self.is_valid_rgb(rgb):
-            return None
-            
-        r, g, b = rgb
-        
-        # 首先检查是否有精确匹配
-        for color_id, color_data in self.gb_colors.items():
-            if isinstance(color_data, dict) and 'rgb' in color_data:
-                if tuple(color_data['rgb']) == (r, g, b):
-                    return color_data.get('name', color_id)
-        
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    def decode_value():
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # 数字可能被截断在块边界处, 需要读到分隔符为止
+                if end == len(buffer) and not eof and fill():
+                    continue
+                pos = end
+                return value
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise
+
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] not in '[{':
+        raise ValueError("文件格式不正确: 需要JSON数组或对象")
+    is_object = buffer[pos] == '{'
+    closing = '}' if is_object else ']'
+    pos += 1
+
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("文件意外结束")
+        if buffer[pos] == closing:
+            return
+        if buffer[pos] == ',':
+            pos += 1
+            continue
+
+        if is_object:
+            key = decode_value()
+            skip_whitespace()
+            if pos >= len(buffer) or buffer[pos] != ':':
+                raise ValueError("文件格式不正确: 缺少冒号")
+            pos += 1
+            skip_whitespace()
+            yield key, decode_value()
+        else:
+            yield decode_value()
+
+
+def normalize_color_entry(entry):
+    """将导入的一条记录规范化为 (rgb, 名称) , 名称可能为None; 无效记录返回None"""
+    name = None
+    if isinstance(entry, dict):
+        rgb = parse_rgb_value(entry.get('rgb')) if 'rgb' in entry else None
+        if rgb is None and 'hex' in entry:
+            rgb = parse_rgb_value(entry.get('hex'))
+        name = entry.get('name')
+    elif isinstance(entry, tuple) and len(entry) == 2:
+        # 颜色数据库格式: {"(r, g, b)": 名称} 或 {名称: [r, g, b]}
+        key, value = entry
+        rgb = parse_rgb_value(key)
+        if rgb is not None:
+            name = value
+        else:
+            rgb = parse_rgb_value(value)
+            if rgb is None and isinstance(value, dict):
+                return normalize_color_entry(value)
+            name = key
+    else:
+        rgb = parse_rgb_value(entry)
+
+    if rgb is None:
         return None
+    if name is not None and not isinstance(name, str):
+        name = str(name)
+    if name is not None:
+        name = name.strip() or None
+    return rgb, name
 
 
+class _TextReader:
+    """以UTF-8增量解码二进制文件, 同时保留底层文件的读取位置"""
+    def __init__(self, raw):
+        self.raw = raw
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
 
-    def load_color_databases(self):
-        """加载各种颜色数据库"""
-        # 国标颜色名称 (GSB05-1426-2001)
-        self.gb_colors = self.load_color_file('gb_colors.json')
-        
-        # 中国传统颜色
-        self.chinese_traditional_colors = self.load_color_file('chinese_colors.json')
-        
-        # CSS颜色名称
-        self.css_colors = self.load_color_file('css_colors.json')
-        
-        # X11颜色名称
-        self.x11_colors = self.load_color_file('x11_colors.json')
-        
-        # RAL经典色卡
-        self.ral_colors = self.load_color_file('ral_colors.json')
-        
-        # Pantone色卡
-        self.pantone_colors = self.load_color_file('pantone_colors.json')
-        
-        # NCS自然色彩系统
-        self.ncs_colors = self.load_color_file('ncs_colors.json')
-        
-        # 日本传统色
-        self.japanese_colors = self.load_color_file('japanese_colors.json')
-        
-    def load_color_file(self, filename):
-        """尝试加载颜色数据库文件"""
+    def read(self, size):
+        while True:
+            data = self.raw.read(size)
+            text = self.decoder.decode(data, final=not data)
+            if text or not data:
+                return text
+
+
+class ColorImportWorker(QThread):
+    """后台流式导入颜色
+
+    增量解析文件, 按批次校验和规范化记录, 通过RGB索引去重。
+    合并模式会跳过已收藏的颜色; 替换模式只在导入文件内部去重。
+    取消后不会修改收藏列表。
+    """
+    progress = pyqtSignal(int, int, float)  # 已读字节, 文件总字节, 速率(条/秒)
+    completed = pyqtSignal(list, dict)  # 导入的颜色, 统计信息
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, color_finder, existing_colors=None, mode='merge',
+                 batch_size=1000, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.color_finder = color_finder
+        self.mode = mode
+        self.batch_size = batch_size
+        self._cancelled = False
+        # 去重索引: 合并模式下包含已有收藏
+        self.index = set()
+        if mode == 'merge' and existing_colors:
+            for fav in existing_colors:
+                rgb = parse_rgb_value(fav.get('rgb')) if isinstance(fav, dict) else None
+                if rgb is not None:
+                    self.index.add(rgb)
+
+    def cancel(self):
+        """请求取消导入"""
+        self._cancelled = True
+
+    def run(self):
+        stats = {'total': 0, 'imported': 0, 'duplicates': 0, 'invalid': 0,
+                 'cancelled': False, 'seconds': 0.0, 'rate': 0.0}
+        imported = []
+        name_cache = {}
+        start = time.perf_counter()
         try:
-            # 首先尝试从当前目录加载
-            filepath = os.path.join(os.path.dirname(__file__), filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            
-            # 如果不存在，使用内置的默认值
-            return getattr(self, f'default_{filename.replace(".json", "")}', {})
-        except:
-            return {}
-
-    # 默认颜色数据库（如果文件不存在）
-    @property
-    def default_gb_colors(self):
-        return {
-            (255, 255, 255): "白色",
-            (0, 0, 0): "黑色",
-            (255, 0, 0): "红色",
-            # 更多颜色...
-        }
-    
-    @property
-    def default_chinese_colors(self):
-        return {
-            (238, 221, 187): "杏仁黄",
-            (240, 223, 187): "麦秆黄",
-            # 更多颜色...
-        }
-    
-    # 其他默认颜色数据库...
+            total_bytes = os.path.getsize(self.file_path)
+            with open(self.file_path, 'rb') as raw:
+                f = _TextReader(raw)
+                batch = []
+                for entry in iter_json_entries(f):
+                    batch.append(entry)
+                    if len(batch) >= self.batch_size:
+                        self._process_batch(batch, imported, stats, name_cache)
+                        batch = []
+                        elapsed = time.perf_counter() - start
+                        self.progress.emit(raw.tell(), total_bytes,
+                                           stats['total'] / elapsed if elapsed > 0 else 0.0)
+                        if self._cancelled:
+                            break
+                if batch and not self._cancelled:
+                    self._process_batch(batch, imported, stats, name_cache)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
 
-    def find_closest_color(self, rgb, database='all'):
-        """查找最接近的颜色名称"""
-        if not self.is_valid_rgb(rgb):
-            return "无效颜色", float('inf')
-        
-        r, g, b = rgb
-        
-        # 获取指定数据库
-        if database == 'all':
-            # 合并所有颜色数据库，GB标准优先
-            color_db = {}
-            
-            # 首先添加GB颜色
-            for color_id, color_data in self.gb_colors.items():
-                if isinstance(color_data, dict) and 'rgb' in color_data:
-                    color_db[tuple(color_data['rgb'])] = color_data.get('name', color_id)
-            
-            # 添加其他数据库
-            color_db.update(self.chinese_traditional_colors)
-            color_db.update(self.css_colors)
-            color_db.update(self.x11_colors)
-            color_db.update(self.ral_colors)
-            color_db.update(self.pantone_colors)
-            color_db.update(self.ncs_colors)
-            color_db.update(self.japanese_colors)
+        stats['seconds'] = time.perf_counter() - start
+        stats['rate'] = stats['total'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        stats['cancelled'] = self._cancelled
+        self.completed.emit([] if self._cancelled else imported, stats)
+
+    def _process_batch(self, batch, imported, stats, name_cache):
+        """校验、去重并补全一批记录"""
+        for entry in batch:
+            stats['total'] += 1
+            normalized = normalize_color_entry(entry)
+            if normalized is None:
+                stats['invalid'] += 1
+                continue
+            rgb, name = normalized
+            if rgb in self.index:
+                stats['duplicates'] += 1
+                continue
+            self.index.add(rgb)
+
+            if name is None:
+                name = name_cache.get(rgb)
+                if name is None:
+                    name, _ = self.color_finder.find_closest_color(rgb)
+                    name_cache[rgb] = name
+            r, g, b = rgb
+            imported.append({
+                'rgb': rgb,
+                'name': name,
+                'hex': f"#{r:02x}{g:02x}{b:02x}".upper()
+            })
+            stats['imported'] += 1
+
+
+def _color_slug(name, used):
+    """将颜色名称转换为可用作变量名的标识符, 并保证唯一"""
+    slug = re.sub(r'[^\w-]+', '-', str(name).strip().lower()).strip('-') or 'color'
+    if slug[0].isdigit():
+        slug = 'color-' + slug
+    candidate = slug
+    suffix = used.get(slug, 2)
+    while candidate in used:
+        candidate = f"{slug}-{suffix}"
+        suffix += 1
+    # 记录下一个可用后缀, 避免大量同名颜色时重复从头尝试
+    used[slug] = suffix
+    used.setdefault(candidate, 2)
+    return candidate
+
+
+class PaletteWriter:
+    """调色板导出格式的基类
+
+    子类实现 begin / write_entry / end, 每次只写出一条记录,
+    不在内存中构建完整文档。需要多遍写出的格式(如ACO)设置 passes。
+    """
+    name = ''
+    description = ''
+    extensions = ()
+    binary = False
+    passes = 1
+
+    def begin(self, f, count):
+        pass
+
+    def begin_pass(self, f, index):
+        pass
+
+    def write_entry(self, f, entry):
+        raise NotImplementedError
+
+    def end(self, f):
+        pass
+
+
+class JsonPaletteWriter(PaletteWriter):
+    name = 'json'
+    description = 'JSON文件'
+    extensions = ('.json',)
+
+    def begin(self, f, count):
+        self.first = True
+        f.write('[')
+
+    def write_entry(self, f, entry):
+        f.write('\n  ' if self.first else ',\n  ')
+        self.first = False
+        f.write(json.dumps({'rgb': list(entry['rgb']), 'name': entry['name'], 'hex': entry['hex']},
+                           ensure_ascii=False))
+
+    def end(self, f):
+        f.write('\n]\n' if not self.first else ']\n')
+
+
+class GplPaletteWriter(PaletteWriter):
+    name = 'gpl'
+    description = 'GIMP调色板'
+    extensions = ('.gpl',)
+
+    def begin(self, f, count):
+        f.write("GIMP Palette\nName: 我的颜色收藏\nColumns: 10\n#\n")
+
+    def write_entry(self, f, entry):
+        r, g, b = entry['rgb']
+        f.write(f"{r:3d} {g:3d} {b:3d}\t{entry['name']}\n")
+
+
+class AsePaletteWriter(PaletteWriter):
+    """Adobe色板交换文件 (.ase), 大端字节序"""
+    name = 'ase'
+    description = 'Adobe色板交换文件'
+    extensions = ('.ase',)
+    binary = True
+
+    def begin(self, f, count):
+        f.write(b'ASEF' + struct.pack('>HHI', 1, 0, count))
+
+    def write_entry(self, f, entry):
+        r, g, b = entry['rgb']
+        name = (str(entry['name']) + '\0').encode('utf-16-be')
+        body = (struct.pack('>H', len(name) // 2) + name + b'RGB '
+                + struct.pack('>fffH', r / 255, g / 255, b / 255, 2))
+        f.write(struct.pack('>HI', 0x0001, len(body)) + body)
+
+
+class AcoPaletteWriter(PaletteWriter):
+    """Photoshop色板 (.aco), 依次写出无名称的版本1和带名称的版本2"""
+    name = 'aco'
+    description = 'Photoshop色板'
+    extensions = ('.aco',)
+    binary = True
+    passes = 2
+    max_colors = 0xFFFF
+
+    def begin(self, f, count):
+        if count > self.max_colors:
+            raise ValueError(f"ACO格式最多只能保存 {self.max_colors} 种颜色")
+        self.count = count
+
+    def begin_pass(self, f, index):
+        self.version = index + 1
+        f.write(struct.pack('>HH', self.version, self.count))
+
+    def write_entry(self, f, entry):
+        r, g, b = entry['rgb']
+        f.write(struct.pack('>5H', 0, r * 257, g * 257, b * 257, 0))
+        if self.version == 2:
+            name = str(entry['name']).encode('utf-16-be')
+            f.write(struct.pack('>I', len(name) // 2 + 1) + name + b'\0\0')
+
+
+class CssPaletteWriter(PaletteWriter):
+    name = 'css'
+    description = 'CSS自定义属性'
+    extensions = ('.css',)
+
+    def begin(self, f, count):
+        self.used = {}
+        f.write(":root {\n")
+
+    def write_entry(self, f, entry):
+        f.write(f"  --{_color_slug(entry['name'], self.used)}: {entry['hex']};\n")
+
+    def end(self, f):
+        f.write("}\n")
+
+
+class TailwindPaletteWriter(PaletteWriter):
+    name = 'tailwind'
+    description = 'Tailwind配置'
+    extensions = ('.js',)
+
+    def begin(self, f, count):
+        self.used = {}
+        f.write("module.exports = {\n  theme: {\n    extend: {\n      colors: {\n")
+
+    def write_entry(self, f, entry):
+        key = json.dumps(_color_slug(entry['name'], self.used), ensure_ascii=False)
+        f.write(f"        {key}: '{entry['hex']}',\n")
+
+    def end(self, f):
+        f.write("      },\n    },\n  },\n};\n")
+
+
+class CsvPaletteWriter(PaletteWriter):
+    name = 'csv'
+    description = 'CSV表格'
+    extensions = ('.csv',)
+
+    def begin(self, f, count):
+        self.writer = csv.writer(f)
+        self.writer.writerow(['name', 'hex', 'r', 'g', 'b'])
+
+    def write_entry(self, f, entry):
+        r, g, b = entry['rgb']
+        self.writer.writerow([entry['name'], entry['hex'], r, g, b])
+
+
+# 可用的导出格式, 新格式只需继承 PaletteWriter 并加入此列表
+PALETTE_WRITERS = [
+    JsonPaletteWriter,
+    GplPaletteWriter,
+    AsePaletteWriter,
+    AcoPaletteWriter,
+    CssPaletteWriter,
+    TailwindPaletteWriter,
+    CsvPaletteWriter,
+]
+
+
+def get_palette_writer(file_path, name=None):
+    """按格式名称或文件扩展名选择导出格式"""
+    ext = os.path.splitext(file_path)[1].lower()
+    for writer_class in PALETTE_WRITERS:
+        if writer_class.name == name or (name is None and ext in writer_class.extensions):
+            return writer_class()
+    return JsonPaletteWriter()
+
+
+def write_palette(file_path, colors, writer=None, progress=None, is_cancelled=None):
+    """将颜色逐条写入文件, 写到临时文件后再替换目标文件
+
+    返回是否完成写出; 被取消时删除临时文件并返回False。
+    """
+    writer = writer or get_palette_writer(file_path)
+    temp_path = file_path + '.part'
+    total = len(colors) * writer.passes
+    done = 0
+    cancelled = False
+    try:
+        if writer.binary:
+            f = open(temp_path, 'wb')
         else:
-            # 只使用指定数据库
-            if database == 'gb':
-                color_db = {}
-                for color_id, color_data in self.gb_colors.items():
-                    if isinstance(color_data, dict) and 'rgb' in color_data:
-                        color_db[tuple(color_data['rgb'])] = color_data.get('name', color_id)
-            else:
-                color_db = getattr(self, f'{database}_colors', {})
-        
-        # 首先检查是否有精确匹配
-        if (r, g, b) in color_db:
-            return color_db[(r, g, b)], 0
-        
-        # 如果没有精确匹配，则查找最接近的颜色
-        def color_distance(c1, c2):
-            try:
-                c1 = tuple(int(x) for x in c1)
-                c2 = tuple(int(x) for x in c2)
-                return sum((a - b) ** 2 for a, b in zip(c1, c2))
-            except (ValueError, TypeError):
-                return float('inf')
-        
+            f = open(temp_path, 'w', encoding='utf-8', newline='')
+        with f:
+            writer.begin(f, len(colors))
+            for index in range(writer.passes):
+                writer.begin_pass(f, index)
+                for entry in colors:
+                    writer.write_entry(f, entry)
+                    done += 1
+                    if done % 2000 == 0:
+                        if progress is not None:
+                            progress(done, total)
+                        if is_cancelled is not None and is_cancelled():
+                            cancelled = True
+                            break
+                if cancelled:
+                    break
+            if not cancelled:
+                writer.end(f)
+        if cancelled:
+            os.remove(temp_path)
+            return False
+        os.replace(temp_path, file_path)
+        if progress is not None:
+            progress(total, total)
+        return True
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class ColorExportWorker(QThread):
+    """后台导出颜色"""
+    progress = pyqtSignal(int, int)  # 已写出条目, 总条目
+    completed = pyqtSignal(bool, float)  # 是否完成, 用时(秒)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, colors, writer, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        # 只复制列表本身, 导出期间收藏被修改不会影响本次导出
+        self.colors = list(colors)
+        self.writer = writer
+        self._cancelled = False
+
+    def cancel(self):
+        """请求取消导出"""
+        self._cancelled = True
+
+    def run(self):
+        start = time.perf_counter()
         try:
-            closest_color = min(color_db.keys(), key=lambda color: color_distance(color, rgb))
-            distance = color_distance(closest_color, rgb)
-            return color_db[closest_color], distance
-        except ValueError:  # 空数据库时
-            return "未知颜色", float('inf')
-
-
-    def get_all_color_names(self, rgb):
-        """获取颜色的所有名称"""
-        r, g, b = rgb
-        names = []
-        
-        # 定义所有要检查的数据库
-        databases = [
-            ('国标', self.gb_colors),
-            ('中国传统', self.chinese_traditional_colors),
-            ('CSS', self.css_colors),
-            ('X11', self.x11_colors),
-            ('RAL', self.ral_colors),
-            ('Pantone', self.pantone_colors),
-            ('NCS', self.ncs_colors),
-            ('日本传统', self.japanese_colors)
-        ]
-        
-        # 特殊处理GB标准(嵌套字典结构)
-        for color_id, color_data in self.gb_colors.items():
-            if isinstance(color_data, dict) and 'rgb' in color_data and tuple(color_data['rgb']) == (r, g, b):
-                names.append(f"国标: {color_data.get('name', color_id)}")
-        
-        # 检查其他数据库(简单键值对结构)
-        for db_name, db in databases[1:]:
-            if (r, g, b) in db:
-                names.append(f"{db_name}: {db[(r, g, b)]}")
-        
-        # 如果没有找到精确匹配，查找最接近的颜色
-        if not names:
-            closest_name, distance = self.find_closest_color(rgb)
-            names.append(f"近似: {closest_name} (Δ={distance})")
-        
-        return names
+            finished = write_palette(self.file_path, self.colors, self.writer,
+                                     progress=self.progress.emit,
+                                     is_cancelled=lambda: self._cancelled)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.completed.emit(finished, time.perf_counter() - start)
 
 
-    
-    def get_color_formats(self, r, g, b):
-        """获取不同格式的颜色值"""
-        hex_color = f"#{r:02x}{g:02x}{b:02x}".upper()
-        cmyk = self.rgb_to_cmyk(r, g, b)
-        hsv = self.rgb_to_hsv(r, g, b)
-        hsl = self.rgb_to_hsl(r, g, b)
-        
-        return {
-            'RGB': f"RGB({r}, {g}, {b})",
-            'HEX': hex_color,
-            'CMYK': f"CMYK({cmyk[0]}%, {cmyk[1]}%, {cmyk[2]}%, {cmyk[3]}%)",
-            'HSV': f"HSV({hsv[0]}°, {hsv[1]}%, {hsv[2]}%)",
-            'HSL': f"HSL({hsl[0]}°, {hsl[1]}%, {hsl[2]}%)"
-        }
-    
-    def rgb_to_cmyk(self, r, g, b):
-        """RGB转CMYK"""
-        if (r, g, b) == (0, 0, 0):
-            return 0, 0, 0, 100
-            
-        c = 1 - r / 255
-        m = 1 - g / 255
-        y = 1 - b / 255
-        
-        min_cmy = min(c, m, y)
-        c = (c - min_cmy) / (1 - min_cmy) * 100
-        m = (m - min_cmy) / (1 - min_cmy) * 100
-        y = (y - min_cmy) / (1 - min_cmy) * 100
-        k = min_cmy * 100
-        
-        return round(c), round(m), round(y), round(k)
-    
-    def rgb_to_hsv(self, r, g, b):
-        """RGB转HSV"""
-        r, g, b = r/255.0, g/255.0, b/255.0
-        max_val = max(r, g, b)
-        min_val = min(r, g, b)
-        diff = max_val - min_val
-        
-        if max_val == min_val:
-            h = 0
-        elif max_val == r:
-            h = (60 * ((g - b)/diff)) % 360
-        elif max_val == g:
-            h = (60 * ((b - r)/diff) + 120) % 360
-        elif max_val == b:
-            h = (60 * ((r - g)/diff) + 240) % 360
-        
-        if max_val == 0:
-            s = 0
-        else:
-            s = (diff / max_val) * 100
-            
-        v = max_val * 100
-        
-        return round(h), round(s), round(v)
-    
-    def rgb_to_hsl(self, r, g, b):
-        """RGB转HSL"""
-        r, g, b = r/255.0, g/255.0, b/255.0
-        max_val = max(r, g, b)
-        min_val = min(r, g, b)
-        diff = max_val - min_val
-        
-        l = (max_val + min_val) / 2
-        
-        if diff == 0:
-            h = s = 0
+class ImageAnalysisWorker(QThread):
+    """后台分析图片主色"""
+    completed = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, color_finder, k=8, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.color_finder = color_finder
+        self.k = k
+
+    def run(self):
+        try:
+            # 图片分析依赖numpy和PIL, 只在需要时导入
+            from image_analysis import analyze_image
+            result = analyze_image(self.file_path, self.color_finder, self.k,
+                                   databases=['all'] + list(DATABASES))
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.completed.emit(result)
+
+
+class PaletteResultDialog(QDialog):
+    """显示一组颜色及其名称, 点击色块可选中该颜色
+
+    rows 中的每一项为 {'rgb', 'hex', 'fraction', 'names'}, 可带 'label' 标注(如平均色)。
+    提供 on_favorite 时每行显示一个收藏按钮。
+    """
+    def __init__(self, title, summary, rows, on_select, on_favorite=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(560, 480)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(summary))
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        content = QWidget()
+        grid = QGridLayout(content)
+        scroll.setWidget(content)
+        layout.addWidget(scroll)
+
+        for row, color in enumerate(rows):
+            r, g, b = color['rgb']
+            btn = QPushButton()
+            btn.setFixedSize(40, 40)
+            btn.setStyleSheet(f"background-color: rgb({r}, {g}, {b}); border: 1px solid gray;")
+            btn.clicked.connect(lambda _, rgb=(r, g, b): on_select(*rgb))
+            grid.addWidget(btn, row, 0)
+
+            header = color['hex']
+            if color.get('label'):
+                header = f"{color['label']}  {header}"
+            if color.get('fraction') is not None:
+                header += f"  占比 {color['fraction'] * 100:.1f}%"
+            lines = [header]
+            for database, match in color['names'].items():
+                label = DATABASES[database][1] if database in DATABASES else '全部'
+                lines.append(f"{label}: {match['name']} (Δ={match['distance']:g})")
+            text = QLabel("\n".join(lines))
+            text.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            grid.addWidget(text, row, 1)
+
+            if on_favorite is not None:
+                favorite_button = QPushButton("收藏")
+                favorite_button.clicked.connect(lambda _, rgb=(r, g, b): on_favorite(*rgb))
+                grid.addWidget(favorite_button, row, 2)
+
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+
+class RegionSelectOverlay(QWidget):
+    """全屏覆盖层: 先截取整个屏幕一次, 再在截图上拖动鼠标框选区域
+
+    松开鼠标后发出 selected 信号, 参数为所选区域的截图; 按 Esc 取消。
+    """
+    selected = pyqtSignal(QPixmap)
+
+    def __init__(self):
+        super().__init__(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        screen = QApplication.primaryScreen()
+        self.screenshot = screen.grabWindow(0)
+        self.setGeometry(screen.geometry())
+        self.setCursor(Qt.CrossCursor)
+        self.origin = None
+        self.current = None
+
+    def selection_rect(self):
+        if self.origin is None or self.current is None:
+            return QRect()
+        return QRect(self.origin, self.current).normalized()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), self.screenshot)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 100))
+        rect = self.selection_rect()
+        if not rect.isEmpty():
+            # 选区内显示原始截图, 便于看清要分析的内容
+            ratio = self.screenshot.devicePixelRatio()
+            source = QRect(rect.topLeft() * ratio, rect.size() * ratio)
+            painter.drawPixmap(rect, self.screenshot, source)
+            painter.setPen(QPen(QColor(0, 160, 255), 1))
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+            painter.drawText(rect.bottomLeft() + QPoint(4, 16), f"{rect.width()} × {rect.height()}")
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.origin = self.current = event.pos()
+            self.update()
+
+    def mouseMoveEvent(self, event):
+        if self.origin is not None:
+            self.current = event.pos()
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton or self.origin is None:
+            return
+        self.current = event.pos()
+        rect = self.selection_rect()
+        self.close()
+        if rect.width() > 0 and rect.height() > 0:
+            ratio = self.screenshot.devicePixelRatio()
+            self.selected.emit(self.screenshot.copy(QRect(rect.topLeft() * ratio, rect.size() * ratio)))
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close()
+
+
+def qimage_to_array(image):
+    """将QImage转换为 (高, 宽, 3) 的 uint8 numpy数组"""
+    import numpy as np
+
+    image = image.convertToFormat(QImage.Format_RGB888)
+    width, height = image.width(), image.height()
+    bits = image.constBits()
+    bits.setsize(image.byteCount())
+    # 每行可能有对齐填充, 按 bytesPerLine 切分后再去掉
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(height, image.bytesPerLine())
+    return rows[:, :width * 3].reshape(height, width, 3).copy()
+
+
+class CrossReferenceDialog(QDialog):
+    """标准色对照: 显示某个标准色在其他颜色标准中最接近的颜色
+
+    数据来自预先编译的对照表, 切换颜色时只是查表。双击结果行可选中该颜色。
+    """
+    def __init__(self, palettes, color_finder, rgb=None, on_select=None, parent=None):
+        super().__init__(parent)
+        self.palettes = palettes
+        self.on_select = on_select
+        self.setWindowTitle("标准色对照")
+        self.resize(620, 520)
+        layout = QVBoxLayout(self)
+
+        selector = QHBoxLayout()
+        selector.addWidget(QLabel("标准:"))
+        self.database_combo = QComboBox()
+        for database in palettes.databases:
+            self.database_combo.addItem(DATABASES[database][1], database)
+        selector.addWidget(self.database_combo)
+        selector.addWidget(QLabel("颜色:"))
+        self.entry_combo = QComboBox()
+        self.entry_combo.setEditable(True)
+        self.entry_combo.setInsertPolicy(QComboBox.NoInsert)
+        self.entry_combo.completer().setFilterMode(Qt.MatchContains)
+        self.entry_combo.completer().setCompletionMode(QCompleter.PopupCompletion)
+        selector.addWidget(self.entry_combo, 1)
+        layout.addLayout(selector)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["标准", "名称", "HEX", "ΔE"])
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.cellDoubleClicked.connect(self.select_row)
+        layout.addWidget(self.table)
+
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.database_combo.currentIndexChanged.connect(self.load_entries)
+        self.entry_combo.currentIndexChanged.connect(self.show_equivalents)
+        self.load_entries()
+        if rgb is not None:
+            # 从当前颜色在所选标准中最接近的颜色开始
+            database = self.database_combo.currentData()
+            name, _ = color_finder.find_closest_color(tuple(rgb), database, 'lab')
+            index = self.entry_combo.findText(name)
+            if index >= 0:
+                self.entry_combo.setCurrentIndex(index)
+
+    def load_entries(self):
+        database = self.database_combo.currentData()
+        self.entry_combo.blockSignals(True)
+        self.entry_combo.clear()
+        self.entry_combo.addItems(self.palettes.names(database))
+        self.entry_combo.blockSignals(False)
+        self.show_equivalents()
+
+    def show_equivalents(self):
+        database = self.database_combo.currentData()
+        result = self.palettes.equivalents(database, self.entry_combo.currentText()) or {}
+        rows = [(target, match) for target, matches in result.items() for match in matches]
+        self.table.setRowCount(len(rows))
+        for row, (target, match) in enumerate(rows):
+            r, g, b = match['rgb']
+            items = [QTableWidgetItem(DATABASES[target][1]), QTableWidgetItem(match['name']),
+                     QTableWidgetItem(match['hex']), QTableWidgetItem(f"{match['delta_e']:.2f}")]
+            items[2].setBackground(QColor(r, g, b))
+            items[2].setForeground(QColor(0, 0, 0) if (r * 299 + g * 587 + b * 114) > 128000 else QColor(255, 255, 255))
+            items[0].setData(Qt.UserRole, (r, g, b))
+            for column, item in enumerate(items):
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+
+    def select_row(self, row, column):
+        rgb = self.table.item(row, 0).data(Qt.UserRole)
+        if self.on_select is not None and rgb:
+            self.on_select(*rgb)
+
+
+class PaletteGeneratorDialog(QDialog):
+    """根据当前颜色生成配色方案, 切换方案和色阶数时即时刷新
+
+    生成结果按基准色缓存在 PaletteGenerator 中, 拖动滑块只是查缓存。
+    """
+    def __init__(self, generator, base, on_select, on_favorite=None, parent=None):
+        super().__init__(parent)
+        from palette_generator import DEFAULT_STEPS, SCHEMES
+
+        self.generator = generator
+        self.base = tuple(base)
+        self.end = None
+        self.on_select = on_select
+        self.on_favorite = on_favorite
+        self.setWindowTitle("配色生成")
+        self.resize(520, 560)
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("方案:"))
+        self.scheme_combo = QComboBox()
+        for scheme, label in SCHEMES.items():
+            self.scheme_combo.addItem(label, scheme)
+        controls.addWidget(self.scheme_combo)
+        controls.addWidget(QLabel("色阶:"))
+        self.steps_slider = QSlider(Qt.Horizontal)
+        self.steps_slider.setRange(2, 15)
+        self.steps_slider.setValue(DEFAULT_STEPS)
+        controls.addWidget(self.steps_slider, 1)
+        self.steps_label = QLabel(str(DEFAULT_STEPS))
+        controls.addWidget(self.steps_label)
+        self.end_button = QPushButton("渐变终点...")
+        self.end_button.clicked.connect(self.choose_end_color)
+        controls.addWidget(self.end_button)
+        layout.addLayout(controls)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        content = QWidget()
+        self.grid = QGridLayout(content)
+        self.grid.setAlignment(Qt.AlignTop)
+        scroll.setWidget(content)
+        layout.addWidget(scroll)
+
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.scheme_combo.currentIndexChanged.connect(self.refresh)
+        self.steps_slider.valueChanged.connect(self.refresh)
+        self.refresh()
+
+    def choose_end_color(self):
+        color = QColorDialog.getColor(QColor(*(self.end or (255, 255, 255))), self, "选择渐变终点")
+        if color.isValid():
+            self.end = (color.red(), color.green(), color.blue())
+            self.scheme_combo.setCurrentIndex(self.scheme_combo.findData('gradient'))
+            self.refresh()
+
+    def refresh(self):
+        scheme = self.scheme_combo.currentData()
+        steps = self.steps_slider.value()
+        self.steps_label.setText(str(steps))
+        while self.grid.count():
+            widget = self.grid.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+        if scheme == 'gradient' and self.end is None:
+            self.grid.addWidget(QLabel("请先选择渐变终点颜色"), 0, 0)
+            return
+
+        for row, stop in enumerate(self.generator.palette(self.base, scheme, steps, self.end)):
+            r, g, b = stop['rgb']
+            btn = QPushButton()
+            btn.setFixedSize(40, 30)
+            btn.setStyleSheet(f"background-color: rgb({r}, {g}, {b}); border: 1px solid gray;")
+            btn.clicked.connect(lambda _, rgb=(r, g, b): self.on_select(*rgb))
+            self.grid.addWidget(btn, row, 0)
+            self.grid.addWidget(QLabel(f"{stop['hex']}  {stop['name']} (Δ={stop['distance']:g})"), row, 1)
+            if self.on_favorite is not None:
+                favorite_button = QPushButton("收藏")
+                favorite_button.clicked.connect(lambda _, rgb=(r, g, b): self.on_favorite(*rgb))
+                self.grid.addWidget(favorite_button, row, 2)
+
+
+class ContrastHeatmap(QLabel):
+    """对比度热力图, 鼠标悬停时显示对应颜色对的对比度"""
+    def __init__(self, ratios, labels, parent=None):
+        super().__init__(parent)
+        from contrast_matrix import LEVEL_NAMES, contrast_levels, heatmap_pixels
+
+        self.ratios = ratios
+        self.labels = labels
+        self.levels = contrast_levels(ratios)
+        self.level_names = LEVEL_NAMES
+        count = len(labels)
+        self.cell_size = max(1, min(48, 600 // max(1, count)))
+        pixels = heatmap_pixels(ratios, self.cell_size)
+        size = count * self.cell_size
+        image = QImage(pixels.data, size, size, size * 3, QImage.Format_RGB888).copy()
+        pixmap = QPixmap.fromImage(image)
+        if self.cell_size >= 36:
+            # 格子足够大时直接标出对比度数值
+            painter = QPainter(pixmap)
+            painter.setFont(QFont("Microsoft YaHei", 8))
+            for i in range(count):
+                for j in range(count):
+                    if i != j:
+                        rect = QRect(j * self.cell_size, i * self.cell_size, self.cell_size, self.cell_size)
+                        painter.drawText(rect, Qt.AlignCenter, f"{ratios[i, j]:.1f}")
+            painter.end()
+        self.setPixmap(pixmap)
+        self.setFixedSize(pixmap.size())
+        self.setMouseTracking(True)
+
+    def mouseMoveEvent(self, event):
+        row, column = event.y() // self.cell_size, event.x() // self.cell_size
+        if 0 <= row < len(self.labels) and 0 <= column < len(self.labels) and row != column:
+            QToolTip.showText(event.globalPos(),
+                              f"{self.labels[row]} / {self.labels[column]}\n"
+                              f"对比度 {self.ratios[row, column]:.2f} ({self.level_names[self.levels[row, column]]})",
+                              self)
         else:
-            if l < 0.5:
-                s = diff / (max_val + min_val)
-            else:
-                s = diff / (2 - max_val - min_val)
-                
-            if max_val == r:
-                h = (g - b) / diff
-            elif max_val == g:
-                h = 2 + (b - r) / diff
-            else:
-                h = 4 + (r - g) / diff
-                
-            h *= 60
-            if h < 0:
-                h += 360
-                
-        return round(h), round(s*100), round(l*100)
+            QToolTip.hideText()
+
+
+class ContrastMatrixDialog(QDialog):
+    """收藏颜色两两之间的WCAG对比度热力图"""
+    def __init__(self, favorites, ratios, parent=None):
+        super().__init__(parent)
+        import numpy as np
+        from contrast_matrix import LEVEL_COLORS, LEVEL_NAMES, contrast_levels
+
+        self.ratios = ratios
+        self.labels = [f"{fav['name']} {fav['hex']}" for fav in favorites]
+        self.setWindowTitle("对比度矩阵")
+        self.resize(700, 720)
+        layout = QVBoxLayout(self)
+
+        # 只统计上三角, 每对颜色计一次
+        count = len(favorites)
+        upper = contrast_levels(ratios[np.triu_indices(count, 1)])
+        totals = np.bincount(upper, minlength=len(LEVEL_NAMES)).tolist()
+        summary = f"{count} 种收藏颜色, {count * (count - 1) // 2} 对: " + ", ".join(
+            f"{name} {total}" for name, total in zip(LEVEL_NAMES, totals))
+        layout.addWidget(QLabel(summary))
+
+        legend = QHBoxLayout()
+        for name, (r, g, b) in zip(LEVEL_NAMES, LEVEL_COLORS.tolist()):
+            swatch = QLabel(name)
+            swatch.setStyleSheet(f"background-color: rgb({r}, {g}, {b}); padding: 2px 6px;")
+            legend.addWidget(swatch)
+        legend.addStretch(1)
+        layout.addLayout(legend)
+
+        scroll = QScrollArea()
+        scroll.setWidget(ContrastHeatmap(ratios, self.labels))
+        layout.addWidget(scroll, 1)
+
+        buttons = QHBoxLayout()
+        export_button = QPushButton("导出CSV...")
+        export_button.clicked.connect(self.export_csv)
+        buttons.addWidget(export_button)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def export_csv(self):
+        from contrast_matrix import write_contrast_csv
+
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出对比度矩阵", "contrast.csv", "CSV文件 (*.csv)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+                write_contrast_csv(f, self.labels, self.ratios)
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"导出失败: {e}")
+
 
 class ColorPickerWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         
-        self.color_finder = ColorNameFinder()
+        # 拾色时鼠标常停留在同一颜色上, 缓存转换结果避免重复计算
+        self.color_finder = ColorNameFinder(preload=True, conversion_cache_size=4096)
+        # 没有精确匹配时查找近似色所用的颜色空间
+        self.match_metric = 'rgb'
+        # 显示器ICC配置文件及由它预编译的 设备RGB -> sRGB 查找表, 未设置时按sRGB处理
+        self.display_profile = ''
+        self.display_lut = None
         self.max_recent_colors = 100
         self.recent_colors = []
         self.favorite_colors = []
+        self.pick_histogram = None
+        # 各名称语言的颜色搜索索引
+        self.search_indexes = {}
         
         self.initUI()
         
@@ -302,6 +932,7 @@ class ColorPickerWindow(QMainWindow):
         
         # 加载设置
         self.load_settings()
+        QTimer.singleShot(0, self.get_search_index)
         
     def initUI(self):
         self.setWindowTitle('高级颜色识别工具')
@@ -322,6 +953,20 @@ class ColorPickerWindow(QMainWindow):
         picker_group.setLayout(picker_layout)
         main_layout.addWidget(picker_group)
         
+        # 按名称或编号搜索颜色, 结果列表在有输入时显示
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索颜色名称、编号或拼音, 如 朱红、zhuhong、RAL 3020、sakura...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.search_colors)
+        self.search_edit.returnPressed.connect(lambda: self.select_search_result(self.search_results.item(0)))
+        picker_layout.addWidget(self.search_edit)
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.hide()
+        self.search_results.itemClicked.connect(self.select_search_result)
+        self.search_results.itemActivated.connect(self.select_search_result)
+        picker_layout.addWidget(self.search_results)
+        
         # 颜色预览区域
         self.color_preview = QLabel()
         self.color_preview.setFixedHeight(80)
@@ -355,9 +1000,18 @@ class ColorPickerWindow(QMainWindow):
         
         picker_layout.addLayout(other_formats_layout)
         
-        # 颜色名称显示
+        # 颜色名称显示和匹配空间选择
+        name_layout = QHBoxLayout()
         self.color_name_label = QLabel("颜色名称: 未选择")
-        picker_layout.addWidget(self.color_name_label)
+        name_layout.addWidget(self.color_name_label, 1)
+        name_layout.addWidget(QLabel("匹配空间:"))
+        self.metric_combo = QComboBox()
+        for metric in METRICS:
+            self.metric_combo.addItem(METRIC_NAMES[metric], metric)
+        self.metric_combo.setToolTip("没有精确匹配时, 在此颜色空间中查找最接近的颜色")
+        self.metric_combo.currentIndexChanged.connect(self.on_metric_changed)
+        name_layout.addWidget(self.metric_combo)
+        picker_layout.addLayout(name_layout)
         
         # 所有颜色名称显示
         self.all_names_text = QTextEdit()
@@ -379,6 +1033,11 @@ class ColorPickerWindow(QMainWindow):
         self.stop_button.setEnabled(False)
         buttons_layout.addWidget(self.stop_button)
         
+        # 框选区域按钮
+        self.region_button = QPushButton("框选区域取色")
+        self.region_button.clicked.connect(self.select_region)
+        buttons_layout.addWidget(self.region_button)
+        
         # 颜色对话框按钮
         self.color_dialog_button = QPushButton("选择颜色...")
         self.color_dialog_button.clicked.connect(self.open_color_dialog)
@@ -469,6 +1128,13 @@ class ColorPickerWindow(QMainWindow):
         
         file_menu.addSeparator()
         
+        # 分析图片主色
+        analyze_image_action = QAction('分析图片颜色...', self)
+        analyze_image_action.triggered.connect(self.analyze_image)
+        file_menu.addAction(analyze_image_action)
+        
+        file_menu.addSeparator()
+        
         # 退出
         exit_action = QAction('退出', self)
         exit_action.setShortcut('Ctrl+Q')
@@ -515,6 +1181,53 @@ class ColorPickerWindow(QMainWindow):
         zoom_out_action.triggered.connect(self.zoom_out)
         view_menu.addAction(zoom_out_action)
         
+        view_menu.addSeparator()
+        
+        # 拾色统计
+        pick_stats_action = QAction('拾色统计...', self)
+        pick_stats_action.triggered.connect(self.show_pick_statistics)
+        view_menu.addAction(pick_stats_action)
+        
+        # 标准色对照
+        cross_reference_action = QAction('标准色对照...', self)
+        cross_reference_action.triggered.connect(self.show_cross_reference)
+        view_menu.addAction(cross_reference_action)
+        
+        # 配色生成
+        palette_generator_action = QAction('配色生成...', self)
+        palette_generator_action.triggered.connect(self.show_palette_generator)
+        view_menu.addAction(palette_generator_action)
+        
+        # 收藏颜色对比度
+        contrast_action = QAction('收藏颜色对比度...', self)
+        contrast_action.triggered.connect(self.show_contrast_matrix)
+        view_menu.addAction(contrast_action)
+        
+        view_menu.addSeparator()
+        
+        # 显示器颜色配置文件
+        display_profile_action = QAction('显示器颜色配置文件...', self)
+        display_profile_action.triggered.connect(self.choose_display_profile)
+        view_menu.addAction(display_profile_action)
+        
+        clear_profile_action = QAction('按sRGB处理屏幕颜色', self)
+        clear_profile_action.triggered.connect(lambda: self.set_display_profile(''))
+        view_menu.addAction(clear_profile_action)
+        
+        view_menu.addSeparator()
+        
+        # 颜色名称语言
+        locale_menu = view_menu.addMenu('颜色名称语言')
+        locale_group = QActionGroup(self)
+        self.locale_actions = {}
+        for locale, label in LOCALES.items():
+            locale_action = QAction(label, self, checkable=True)
+            locale_action.setChecked(locale == DEFAULT_LOCALE)
+            locale_action.triggered.connect(lambda _, value=locale: self.set_name_locale(value))
+            locale_group.addAction(locale_action)
+            locale_menu.addAction(locale_action)
+            self.locale_actions[locale] = locale_action
+        
         # 帮助菜单
         help_menu = menubar.addMenu('帮助')
         
@@ -560,6 +1273,13 @@ class ColorPickerWindow(QMainWindow):
             color = QColor(image.pixel(0, 0))
             r, g, b = color.red(), color.green(), color.blue()
             
+            # 按显示器配置文件转换到sRGB
+            if self.display_lut is not None:
+                r, g, b = self.display_lut.apply_pixel(r, g, b)
+            
+            # 记录拾色轨迹
+            self.record_picked_color(r, g, b)
+            
             # 更新UI
             self.update_color_display(r, g, b)
         except Exception as e:
@@ -582,7 +1302,7 @@ class ColorPickerWindow(QMainWindow):
         self.hsl_label.setText(f"HSL: {color_formats['HSL']}")
         
         # 获取颜色名称
-        color_names = self.color_finder.get_all_color_names((r, g, b))
+        color_names = self.color_finder.get_all_color_names((r, g, b), self.match_metric)
         
         # 显示主要颜色名称
         if color_names:
@@ -603,6 +1323,45 @@ class ColorPickerWindow(QMainWindow):
         # 保存当前颜色
         self.current_color = (r, g, b)
     
+    def search_colors(self, text):
+        """输入变化时搜索颜色; 索引在启动后空闲时已经建立 (见 get_search_index)"""
+        self.search_results.clear()
+        if not text.strip():
+            self.search_results.hide()
+            return
+        for result in self.get_search_index().search(text, limit=50):
+            label = DATABASES[result['database']][1]
+            item = QListWidgetItem(QIcon(self.create_color_icon(QColor(*result['rgb']), 16)),
+                                   f"{result['name']}  [{label}]  {result['hex']}")
+            item.setData(Qt.UserRole, tuple(result['rgb']))
+            self.search_results.addItem(item)
+        self.search_results.setVisible(self.search_results.count() > 0)
+
+    def get_search_index(self):
+        """当前名称语言的颜色搜索索引, 启动后在空闲时建立, 使第一次输入也不必等待"""
+        index = self.search_indexes.get(self.color_finder.locale)
+        if index is None:
+            from color_search import ColorSearchIndex
+            # 先加载编译后的调色板, 直接使用其中的拼音/罗马字键和多语言名称; 加载失败时逐个生成
+            index = self.search_indexes[self.color_finder.locale] = ColorSearchIndex(
+                self.color_finder, palettes=self.load_compiled_palettes(quiet=True))
+        return index
+
+    def select_search_result(self, item):
+        if item is None:
+            return
+        self.update_color_display(*item.data(Qt.UserRole))
+
+    def on_metric_changed(self, index):
+        """切换匹配空间; 数据库已加载, 只需为新空间建立索引并刷新当前颜色"""
+        metric = self.metric_combo.itemData(index)
+        if not metric or metric == self.match_metric:
+            return
+        self.match_metric = metric
+        if hasattr(self, 'current_color'):
+            self.update_color_display(*self.current_color)
+        self.statusBar().showMessage(f"匹配空间: {METRIC_NAMES[metric]}", 2000)
+
     def add_to_recent_colors(self, r, g, b):
         """添加到最近使用的颜色"""
         color = (r, g, b)
@@ -643,27 +1402,30 @@ class ColorPickerWindow(QMainWindow):
     def add_to_favorites(self):
         """添加到收藏"""
         if hasattr(self, 'current_color'):
-            r, g, b = self.current_color
-            color_names = self.color_finder.get_all_color_names((r, g, b))
-            primary_name = color_names[0].split(": ")[1].split(" (Δ=")[0] if color_names else "自定义颜色"
-            
-            # 检查是否已经收藏
-            for fav in self.favorite_colors:
-                if fav['rgb'] == (r, g, b):
-                    QMessageBox.information(self, "提示", "该颜色已经在收藏列表中!")
-                    return
-            
-            self.favorite_colors.append({
-                'rgb': (r, g, b),
-                'name': primary_name,
-                'hex': f"#{r:02x}{g:02x}{b:02x}".upper()
-            })
-            
-            self.update_favorites_list()
-            self.statusBar().showMessage(f"已添加到收藏: {primary_name}", 2000)
-            
-            # 保存收藏
-            self.save_settings()
+            self.add_color_to_favorites(*self.current_color)
+    
+    def add_color_to_favorites(self, r, g, b):
+        """将指定颜色添加到收藏"""
+        color_names = self.color_finder.get_all_color_names((r, g, b), self.match_metric)
+        primary_name = color_names[0].split(": ")[1].split(" (Δ=")[0] if color_names else "自定义颜色"
+        
+        # 检查是否已经收藏
+        for fav in self.favorite_colors:
+            if fav['rgb'] == (r, g, b):
+                QMessageBox.information(self, "提示", "该颜色已经在收藏列表中!")
+                return
+        
+        self.favorite_colors.append({
+            'rgb': (r, g, b),
+            'name': primary_name,
+            'hex': f"#{r:02x}{g:02x}{b:02x}".upper()
+        })
+        
+        self.update_favorites_list()
+        self.statusBar().showMessage(f"已添加到收藏: {primary_name}", 2000)
+        
+        # 保存收藏
+        self.save_settings()
     
     def update_favorites_list(self):
         """更新收藏列表"""
@@ -672,13 +1434,15 @@ class ColorPickerWindow(QMainWindow):
             self.favorites_list.setPlainText("暂无收藏颜色")
             return
             
-        self.favorites_list.append("收藏的颜色:")
+        # 一次性设置文本, 避免大量收藏时逐行追加过慢
+        lines = ["收藏的颜色:"]
         for idx, fav in enumerate(self.favorite_colors, 1):
             r, g, b = fav['rgb']
-            self.favorites_list.append(f"{idx}. {fav['name']}")
-            self.favorites_list.append(f"   RGB: {r}, {g}, {b}")
-            self.favorites_list.append(f"   HEX: {fav['hex']}")
-            self.favorites_list.append("")
+            lines.append(f"{idx}. {fav['name']}")
+            lines.append(f"   RGB: {r}, {g}, {b}")
+            lines.append(f"   HEX: {fav['hex']}")
+            lines.append("")
+        self.favorites_list.setPlainText("\n".join(lines))
     
     def open_color_dialog(self):
         """打开颜色选择对话框"""
@@ -696,7 +1460,7 @@ class ColorPickerWindow(QMainWindow):
             
         r, g, b = self.current_color
         color_formats = self.color_finder.get_color_formats(r, g, b)
-        color_names = self.color_finder.get_all_color_names((r, g, b))
+        color_names = self.color_finder.get_all_color_names((r, g, b), self.match_metric)
         
         text_to_copy = "颜色信息:\n"
         text_to_copy += f"RGB: {color_formats['RGB']}\n"
@@ -720,7 +1484,7 @@ class ColorPickerWindow(QMainWindow):
             
         r, g, b = self.current_color
         color_formats = self.color_finder.get_color_formats(r, g, b)
-        color_names = self.color_finder.get_all_color_names((r, g, b))
+        color_names = self.color_finder.get_all_color_names((r, g, b), self.match_metric)
         
         if format_type == 'RGB':
             pyperclip.copy(color_formats['RGB'])
@@ -744,7 +1508,7 @@ class ColorPickerWindow(QMainWindow):
             return
             
         r, g, b = self.current_color
-        color_names = self.color_finder.get_all_color_names((r, g, b))
+        color_names = self.color_finder.get_all_color_names((r, g, b), self.match_metric)
         primary_name = color_names[0].split(": ")[1].split(" (Δ=")[0] if color_names else "自定义颜色"
         
         file_path, _ = QFileDialog.getSaveFileName(
@@ -764,44 +1528,355 @@ class ColorPickerWindow(QMainWindow):
     
     def import_colors(self):
         """导入颜色"""
+        if getattr(self, 'import_worker', None) is not None:
+            QMessageBox.information(self, "提示", "正在导入颜色, 请稍候...")
+            return
+
         file_path, _ = QFileDialog.getOpenFileName(
             self, "导入颜色", 
             "", "JSON文件 (*.json);;所有文件 (*)"
         )
         
-        if file_path:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                    if isinstance(data, list):
-                        self.favorite_colors = data
-                        self.update_favorites_list()
-                        self.save_settings()
-                        QMessageBox.information(self, "成功", f"已导入 {len(data)} 种颜色!")
-                    else:
-                        QMessageBox.warning(self, "错误", "文件格式不正确!")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"导入失败: {str(e)}")
+        if not file_path:
+            return
+
+        mode = 'replace'
+        if self.favorite_colors:
+            box = QMessageBox(self)
+            box.setWindowTitle("导入方式")
+            box.setText("是否将导入的颜色合并到现有收藏中?")
+            merge_button = box.addButton("合并", QMessageBox.AcceptRole)
+            replace_button = box.addButton("替换", QMessageBox.DestructiveRole)
+            box.addButton("取消", QMessageBox.RejectRole)
+            box.exec_()
+            if box.clickedButton() == merge_button:
+                mode = 'merge'
+            elif box.clickedButton() != replace_button:
+                return
+
+        self.import_progress = QProgressDialog("正在导入颜色...", "取消", 0, 1000, self)
+        self.import_progress.setWindowTitle("导入颜色")
+        self.import_progress.setWindowModality(Qt.WindowModal)
+        self.import_progress.setMinimumDuration(300)
+        self.import_progress.setValue(0)
+
+        self.import_worker = ColorImportWorker(file_path, self.color_finder,
+                                               self.favorite_colors, mode, parent=self)
+        self.import_worker.progress.connect(self.on_import_progress)
+        self.import_worker.completed.connect(self.on_import_completed)
+        self.import_worker.failed.connect(self.on_import_failed)
+        self.import_progress.canceled.connect(self.import_worker.cancel)
+        self.import_worker.start()
+
+    def on_import_progress(self, read_bytes, total_bytes, rate):
+        """更新导入进度"""
+        if total_bytes > 0:
+            self.import_progress.setValue(min(999, int(read_bytes * 1000 / total_bytes)))
+        self.import_progress.setLabelText(f"正在导入颜色... {rate:,.0f} 条/秒")
+
+    def on_import_completed(self, colors, stats):
+        """导入完成后更新收藏"""
+        mode = self.import_worker.mode
+        self.finish_import()
+
+        if stats['cancelled']:
+            self.statusBar().showMessage("导入已取消, 收藏未修改", 3000)
+            return
+
+        if mode == 'merge':
+            self.favorite_colors.extend(colors)
+        else:
+            self.favorite_colors = colors
+        self.update_favorites_list()
+        self.save_settings()
+
+        message = f"已导入 {stats['imported']} 种颜色!"
+        if stats['duplicates'] or stats['invalid']:
+            message += f"\n跳过重复 {stats['duplicates']} 条, 无效 {stats['invalid']} 条。"
+        message += f"\n共处理 {stats['total']} 条, 用时 {stats['seconds']:.2f} 秒 ({stats['rate']:,.0f} 条/秒)"
+        QMessageBox.information(self, "成功", message)
+
+    def on_import_failed(self, error):
+        """导入出错"""
+        self.finish_import()
+        QMessageBox.critical(self, "错误", f"导入失败: {error}")
+
+    def finish_import(self):
+        """清理导入线程和进度对话框"""
+        self.import_progress.reset()
+        self.import_worker.wait()
+        self.import_worker.deleteLater()
+        self.import_worker = None
     
     def export_colors(self):
         """导出颜色"""
         if not self.favorite_colors:
             QMessageBox.warning(self, "警告", "没有可导出的颜色!")
             return
-            
-        file_path, _ = QFileDialog.getSaveFileName(
+        if getattr(self, 'export_worker', None) is not None:
+            QMessageBox.information(self, "提示", "正在导出颜色, 请稍候...")
+            return
+
+        filters = [f"{w.description} ({' '.join('*' + ext for ext in w.extensions)})"
+                   for w in PALETTE_WRITERS]
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self, "导出颜色", 
-            "我的颜色收藏.json", "JSON文件 (*.json)"
+            "我的颜色收藏.json", ";;".join(filters)
         )
         
+        if not file_path:
+            return
+
+        writer_class = PALETTE_WRITERS[filters.index(selected_filter)] if selected_filter in filters else None
+        ext = os.path.splitext(file_path)[1].lower()
+        if writer_class is not None and ext not in writer_class.extensions:
+            if not ext:
+                file_path += writer_class.extensions[0]
+            else:
+                # 用户手动输入了其他扩展名时按扩展名选择格式
+                writer_class = None
+        writer = writer_class() if writer_class is not None else get_palette_writer(file_path)
+
+        self.export_progress = QProgressDialog("正在导出颜色...", "取消", 0, 1000, self)
+        self.export_progress.setWindowTitle("导出颜色")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(300)
+        self.export_progress.setValue(0)
+
+        self.export_worker = ColorExportWorker(file_path, self.favorite_colors, writer, parent=self)
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.completed.connect(self.on_export_completed)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        self.export_worker.start()
+
+    def on_export_progress(self, done, total):
+        """更新导出进度"""
+        if total > 0:
+            self.export_progress.setValue(min(999, int(done * 1000 / total)))
+
+    def on_export_completed(self, finished, seconds):
+        """导出完成"""
+        count = len(self.export_worker.colors)
+        self.finish_export()
+        if finished:
+            QMessageBox.information(self, "成功", f"已导出 {count} 种颜色! (用时 {seconds:.2f} 秒)")
+        else:
+            self.statusBar().showMessage("导出已取消", 3000)
+
+    def on_export_failed(self, error):
+        """导出出错"""
+        self.finish_export()
+        QMessageBox.critical(self, "错误", f"导出失败: {error}")
+
+    def finish_export(self):
+        """清理导出线程和进度对话框"""
+        self.export_progress.reset()
+        self.export_worker.wait()
+        self.export_worker.deleteLater()
+        self.export_worker = None
+    
+    def analyze_image(self):
+        """分析图片主色"""
+        if getattr(self, 'image_worker', None) is not None:
+            QMessageBox.information(self, "提示", "正在分析图片, 请稍候...")
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "分析图片颜色", "",
+            "图片文件 (*.png *.jpg *.jpeg *.bmp *.gif *.tif *.tiff *.webp);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+
+        self.image_worker = ImageAnalysisWorker(file_path, self.color_finder, parent=self)
+        self.image_worker.completed.connect(self.on_image_analyzed)
+        self.image_worker.failed.connect(self.on_image_analysis_failed)
+        self.image_worker.start()
+        self.statusBar().showMessage("正在分析图片颜色...")
+
+    def on_image_analyzed(self, result):
+        """显示图片分析结果"""
+        self.finish_image_analysis()
+        self.statusBar().showMessage(f"图片分析完成, 用时 {result['timings']['total']:.2f} 秒", 3000)
+        if result['colors']:
+            self.update_color_display(*result['colors'][0]['rgb'])
+        width, height = result['size']
+        summary = (f"图片尺寸: {width}×{height}, 采样 {result['sampled_pixels']} 像素, "
+                   f"用时 {result['timings']['total']:.2f} 秒")
+        PaletteResultDialog(f"图片主色 - {os.path.basename(result['image'])}", summary,
+                            result['colors'], self.update_color_display, self.add_color_to_favorites,
+                            self).exec_()
+
+    def on_image_analysis_failed(self, error):
+        """图片分析出错"""
+        self.finish_image_analysis()
+        QMessageBox.critical(self, "错误", f"分析图片失败: {error}")
+
+    def finish_image_analysis(self):
+        """清理图片分析线程"""
+        self.image_worker.wait()
+        self.image_worker.deleteLater()
+        self.image_worker = None
+    
+    def select_region(self):
+        """隐藏主窗口后显示框选覆盖层"""
+        if self.picking:
+            self.stop_picking()
+        self.hide()
+        # 等待窗口真正隐藏后再截屏, 避免主窗口出现在截图中
+        QTimer.singleShot(250, self.show_region_overlay)
+
+    def show_region_overlay(self):
+        self.region_overlay = RegionSelectOverlay()
+        self.region_overlay.selected.connect(self.on_region_selected)
+        self.region_overlay.destroyed.connect(self.show)
+        self.region_overlay.showFullScreen()
+        self.region_overlay.activateWindow()
+
+    def on_region_selected(self, pixmap):
+        """分析框选区域的平均色、中位色和主色"""
+        try:
+            from image_analysis import analyze_region
+            pixels = qimage_to_array(pixmap.toImage())
+            if self.display_lut is not None:
+                pixels = self.display_lut.apply(pixels)
+            result = analyze_region(pixels, self.color_finder, k=5, databases=['all'] + list(DATABASES))
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"分析区域颜色失败: {e}")
+            return
+
+        self.show()
+        # 主色按占比从低到高加入最近颜色, 平均色最后显示, 排在最前
+        for color in reversed(result['colors']):
+            self.add_to_recent_colors(*color['rgb'])
+        self.add_to_recent_colors(*result['median']['rgb'])
+        self.update_color_display(*result['average']['rgb'])
+
+        width, height = result['size']
+        summary = (f"区域尺寸: {width}×{height}, 采样 {result['sampled_pixels']} 像素 "
+                   f"(步长 {result['step']}), 用时 {result['seconds']:.3f} 秒")
+        rows = [dict(result['average'], label='平均色'), dict(result['median'], label='中位色')]
+        rows += [dict(color, label=f"主色{i}") for i, color in enumerate(result['colors'], 1)]
+        self.statusBar().showMessage(f"区域平均色: {result['average']['hex']}", 3000)
+        PaletteResultDialog("区域颜色", summary, rows, self.update_color_display,
+                            self.add_color_to_favorites, self).exec_()
+
+    def choose_display_profile(self):
+        """选择显示器的ICC配置文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择显示器颜色配置文件", os.path.dirname(self.display_profile),
+            "ICC配置文件 (*.icc *.icm);;查找表 (*.npz);;所有文件 (*)")
         if file_path:
+            self.set_display_profile(file_path)
+
+    def set_display_profile(self, path, quiet=False):
+        """加载配置文件并预编译查找表; path 为空时恢复按sRGB处理"""
+        if not path:
+            self.display_profile, self.display_lut = '', None
+            if not quiet:
+                self.statusBar().showMessage("屏幕颜色按sRGB处理", 2000)
+            return
+        try:
+            from color_profile import DisplayLUT
+            self.display_lut = DisplayLUT.load(path)
+        except Exception as e:
+            if not quiet:
+                QMessageBox.critical(self, "错误", f"无法读取颜色配置文件: {e}")
+            return
+        self.display_profile = path
+        if not quiet:
+            self.statusBar().showMessage(f"已加载显示器配置文件: {os.path.basename(path)}", 3000)
+
+    def record_picked_color(self, r, g, b):
+        """将拾取的颜色累计到拾色轨迹直方图"""
+        if self.pick_histogram is None:
+            # 直方图依赖numpy, 第一次拾色时才创建
+            from color_histogram import ColorHistogram
+            self.pick_histogram = ColorHistogram(bins=32)
+        self.pick_histogram.add_color((r, g, b))
+
+    def load_compiled_palettes(self, quiet=False):
+        """编译后的调色板 (标准色对照表和多语言名称), 失败时返回 None"""
+        if getattr(self, 'compiled_palettes', None) is None:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.favorite_colors, f, ensure_ascii=False, indent=2)
-                QMessageBox.information(self, "成功", f"已导出 {len(self.favorite_colors)} 种颜色!")
+                # 编译结果过期时会重新编译, 只在第一次使用时进行
+                from compiled_palette import CompiledPalettes
+                self.compiled_palettes = CompiledPalettes.load(finder=self.color_finder)
             except Exception as e:
-                QMessageBox.critical(self, "错误", f"导出失败: {str(e)}")
+                if not quiet:
+                    QMessageBox.critical(self, "错误", f"无法加载标准色对照表: {e}")
+                return None
+        return self.compiled_palettes
+
+    def show_cross_reference(self):
+        """显示当前颜色在各颜色标准之间的对照"""
+        if self.load_compiled_palettes() is None:
+            return
+        CrossReferenceDialog(self.compiled_palettes, self.color_finder, getattr(self, 'current_color', None),
+                             self.update_color_display, self).exec_()
+
+    def set_name_locale(self, locale, quiet=False):
+        """切换颜色名称的语言; 各语言的名称表来自编译后的调色板, 切换时不重新读取和合并数据库"""
+        if locale not in LOCALES:
+            return
+        self.locale_actions[locale].setChecked(True)
+        if locale == self.color_finder.locale:
+            return
+        palettes = self.load_compiled_palettes(quiet=True)
+        # 调色板无法加载时由 color_locale 直接合并数据库文件
+        self.color_finder.set_locale(locale, palettes.locale_tables(locale) if palettes is not None else None)
+        if hasattr(self, 'current_color'):
+            self.update_color_display(*self.current_color)
+        self.search_colors(self.search_edit.text())
+        if not quiet:
+            self.statusBar().showMessage(f"颜色名称: {LOCALES[locale]}", 2000)
+
+    def show_palette_generator(self):
+        """以当前颜色为基准生成配色"""
+        if not hasattr(self, 'current_color'):
+            QMessageBox.warning(self, "警告", "请先选择一个颜色!")
+            return
+        if getattr(self, 'palette_generator', None) is None:
+            from palette_generator import PaletteGenerator
+            self.palette_generator = PaletteGenerator(self.color_finder)
+        PaletteGeneratorDialog(self.palette_generator, self.current_color, self.update_color_display,
+                               self.add_color_to_favorites, self).exec_()
+
+    def show_contrast_matrix(self):
+        """显示收藏颜色两两之间的对比度"""
+        if len(self.favorite_colors) < 2:
+            QMessageBox.information(self, "提示", "至少需要两种收藏颜色才能计算对比度。")
+            return
+        if getattr(self, 'contrast_matrix', None) is None:
+            from contrast_matrix import ContrastMatrix
+            self.contrast_matrix = ContrastMatrix()
+        # 收藏未变化时直接复用上次的矩阵
+        ratios = self.contrast_matrix.ratios([fav['rgb'] for fav in self.favorite_colors])
+        ContrastMatrixDialog(self.favorite_colors, ratios, self).exec_()
+
+    def show_pick_statistics(self):
+        """显示拾色轨迹中各命名颜色的占比"""
+        if self.pick_histogram is None or self.pick_histogram.total == 0:
+            QMessageBox.information(self, "拾色统计", "还没有拾色记录, 请先开始拾取颜色。")
+            return
+
+        rollup = self.pick_histogram.rollup(self.color_finder, 'all', 'lab')
+        lines = [f"共 {self.pick_histogram.total} 次采样, {len(rollup)} 种命名颜色:", ""]
+        for name, count, fraction in rollup[:20]:
+            lines.append(f"{name}: {count} 次 ({fraction * 100:.1f}%)")
+        if len(rollup) > 20:
+            lines.append("...")
+
+        box = QMessageBox(self)
+        box.setWindowTitle("拾色统计")
+        box.setText("\n".join(lines))
+        clear_button = box.addButton("清空统计", QMessageBox.ResetRole)
+        box.addButton("关闭", QMessageBox.AcceptRole)
+        box.exec_()
+        if box.clickedButton() == clear_button:
+            self.pick_histogram.clear()
+            self.statusBar().showMessage("拾色统计已清空", 2000)
     
     def zoom_in(self):
         """放大界面"""
@@ -862,6 +1937,17 @@ class ColorPickerWindow(QMainWindow):
                         'hex': fav['hex']
                     })
                 self.update_favorites_list()
+
+            # 显示器配置文件
+            self.set_display_profile(settings.value("display/icc_profile", ""), quiet=True)
+
+            # 匹配空间
+            metric = settings.value("match/metric", "rgb")
+            if metric in METRICS:
+                self.metric_combo.setCurrentIndex(METRICS.index(metric))
+
+            # 颜色名称语言
+            self.set_name_locale(settings.value("names/locale", DEFAULT_LOCALE), quiet=True)
                 
         except:
             pass
@@ -880,6 +1966,15 @@ class ColorPickerWindow(QMainWindow):
             
             # 收藏颜色
             settings.setValue("colors/favorites", self.favorite_colors)
+
+            # 显示器配置文件
+            settings.setValue("display/icc_profile", self.display_profile)
+
+            # 匹配空间
+            settings.setValue("match/metric", self.match_metric)
+
+            # 颜色名称语言
+            settings.setValue("names/locale", self.color_finder.locale)
             
         except:
             pass
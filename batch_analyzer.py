@@ -0,0 +1,285 @@
+"""批量分析文件夹中的图片
+
+遍历目录, 用进程池分析每张图片的平均色和主色, 并在所选数据库中命名。
+各数据库的调色板坐标只在主进程中构建一次, 放入共享内存供所有工作进程直接读取,
+不会随每个任务重复序列化。结果按完成顺序逐条写入JSONL或CSV;
+使用 --resume 时跳过输出文件中已经成功分析过的图片; 合并的直方图 (--histogram)
+与结果一起定期保存, 续跑时在其基础上继续累计。
+
+用法:
+    python batch_analyzer.py swatches/ -o result.jsonl -d ral -d pantone --workers 8
+    python batch_analyzer.py swatches/ -o result.jsonl --resume
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from color_core import DATABASES, METRICS, ColorNameFinder, nearest_palette_indices, rgb_array_to_metric
+from color_histogram import ColorHistogram
+from image_analysis import DEFAULT_MAX_PIXELS, average_color, extract_dominant_colors, load_image_pixels
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp', '.ppm', '.exr', '.hdr', '.npy')
+CSV_FIELDS = ['path', 'width', 'height', 'average_hex', 'average_names', 'dominant', 'seconds', 'error']
+
+
+class SharedPalettes:
+    """放在共享内存中的各数据库调色板坐标
+
+    layout 保存每个数据库在共享数组中的 (起始行, 行数), 与名称列表一起在
+    进程池初始化时传给工作进程一次。
+    """
+    def __init__(self, finder, databases, metric='rgb'):
+        self.metric = metric
+        self.names = {}
+        self.layout = {}
+        arrays = []
+        offset = 0
+        for database in databases:
+            names, points = finder.get_palette_arrays(database, metric)
+            self.names[database] = names
+            self.layout[database] = (offset, len(names))
+            arrays.append(np.asarray(points, dtype=np.float64))
+            offset += len(names)
+        data = np.concatenate(arrays) if arrays else np.empty((0, 3))
+        self.shape = data.shape
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+        np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)[:] = data
+
+    def worker_args(self):
+        return self.shm.name, self.shape, self.layout, self.names, self.metric
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# 工作进程中的全局状态, 由 _init_worker 设置
+_worker = {}
+
+
+def _init_worker(shm_name, shape, layout, names, metric, k, max_pixels, histogram_options):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    points = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker.update(shm=shm, points=points, layout=layout, names=names, metric=metric,
+                   k=k, max_pixels=max_pixels, histogram_options=histogram_options)
+
+
+def _name_colors(rgb):
+    """在共享调色板中为一组RGB颜色命名, 返回 [{数据库: {'name', 'distance'}}]"""
+    rgb = np.asarray(rgb, dtype=np.int32).reshape(-1, 3)
+    metric = _worker['metric']
+    queries = rgb_array_to_metric(rgb.astype(np.float64) if metric == 'rgb' else rgb, metric)
+    results = [{} for _ in range(len(rgb))]
+    for database, (offset, count) in _worker['layout'].items():
+        if not count:
+            continue
+        points = _worker['points'][offset:offset + count]
+        indices, squared = nearest_palette_indices(queries, points)
+        distances = squared if metric == 'rgb' else np.sqrt(squared)
+        for result, index, distance in zip(results, indices, distances):
+            result[database] = {'name': _worker['names'][database][index],
+                                'distance': round(float(distance), 4)}
+    return results
+
+
+def _analyze(path):
+    """工作进程任务: 分析一张图片, 出错时返回带 error 字段的结果"""
+    start = time.perf_counter()
+    result = {'path': path, 'worker': os.getpid()}
+    try:
+        pixels, size = load_image_pixels(path, _worker['max_pixels'])
+        average = average_color(pixels)
+        dominant = extract_dominant_colors(pixels, _worker['k'])
+        names = _name_colors([average] + [rgb for rgb, _ in dominant])
+        result.update({
+            'size': list(size),
+            'average': {'rgb': list(average), 'hex': '#%02X%02X%02X' % average, 'names': names[0]},
+            'dominant': [{'rgb': list(rgb), 'hex': '#%02X%02X%02X' % rgb,
+                          'fraction': round(fraction, 4), 'names': color_names}
+                         for (rgb, fraction), color_names in zip(dominant, names[1:])],
+        })
+        if _worker['histogram_options'] is not None:
+            # 直方图以稀疏形式返回主进程合并, 不写入输出文件
+            histogram = ColorHistogram(*_worker['histogram_options'])
+            histogram.add_pixels(pixels)
+            result['histogram'] = histogram.to_dict()
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def iter_image_files(directory, recursive=True):
+    """按文件名顺序遍历目录中的图片文件"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(root, name)
+        if not recursive:
+            break
+
+
+def load_completed(output_path, output_format):
+    """读取已有输出文件中成功分析过的图片路径"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8', newline='') as f:
+        if output_format == 'csv':
+            for row in csv.DictReader(f):
+                if row.get('path') and not row.get('error'):
+                    completed.add(row['path'])
+        else:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 上次中断时可能留下不完整的最后一行
+                    continue
+                if 'path' in record and 'error' not in record:
+                    completed.add(record['path'])
+    return completed
+
+
+def _csv_row(result):
+    def names_text(names):
+        return '; '.join(f"{db}: {match['name']}" for db, match in names.items())
+
+    average = result.get('average', {})
+    return {
+        'path': result['path'],
+        'width': result.get('size', ['', ''])[0],
+        'height': result.get('size', ['', ''])[1],
+        'average_hex': average.get('hex', ''),
+        'average_names': names_text(average.get('names', {})),
+        'dominant': ' '.join(f"{c['hex']}:{c['fraction']}" for c in result.get('dominant', [])),
+        'seconds': result['seconds'],
+        'error': result.get('error', ''),
+    }
+
+
+class WorkerStats:
+    """按工作进程统计处理数量和耗时"""
+    def __init__(self):
+        self.workers = {}
+
+    def add(self, result):
+        count, busy = self.workers.get(result['worker'], (0, 0.0))
+        self.workers[result['worker']] = (count + 1, busy + result['seconds'])
+
+    def report(self, elapsed, stream=sys.stderr):
+        total = sum(count for count, _ in self.workers.values())
+        print(f"共处理 {total} 张图片, 用时 {elapsed:.2f} 秒, {total / elapsed if elapsed else 0:.1f} 张/秒",
+              file=stream)
+        for pid, (count, busy) in sorted(self.workers.items()):
+            rate = count / busy if busy else 0.0
+            print(f"  进程 {pid}: {count} 张, 忙碌 {busy:.2f} 秒, {rate:.1f} 张/秒, "
+                  f"利用率 {busy / elapsed * 100 if elapsed else 0:.0f}%", file=stream)
+
+
+def run_batch(directory, output_path, databases=('all',), metric='rgb', k=8, workers=None,
+              output_format=None, resume=False, recursive=True, max_pixels=DEFAULT_MAX_PIXELS,
+              progress_every=100, histogram=None, histogram_path=None, checkpoint_every=100):
+    """批量分析目录中的图片, 返回 (成功数, 失败数)
+
+    传入 ColorHistogram 时, 所有本次分析的图片都会合并到该直方图中; 同时给出 histogram_path 时
+    每 checkpoint_every 张图片和结束 (包括中断) 时保存直方图, 使其与已写入的结果一致。
+    """
+    output_format = output_format or ('csv' if output_path.lower().endswith('.csv') else 'jsonl')
+    completed = load_completed(output_path, output_format) if resume else set()
+    paths = [path for path in iter_image_files(directory, recursive) if path not in completed]
+    if completed:
+        print(f"跳过已完成的 {len(completed)} 张图片", file=sys.stderr)
+
+    palettes = SharedPalettes(ColorNameFinder(), databases, metric)
+    append = resume and os.path.exists(output_path)
+    stats = WorkerStats()
+    succeeded = failed = 0
+    start = time.perf_counter()
+    try:
+        with open(output_path, 'a' if append else 'w', encoding='utf-8', newline='') as f:
+            writer = None
+            if output_format == 'csv':
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                if not append or f.tell() == 0:
+                    writer.writeheader()
+            histogram_options = (histogram.bins, histogram.space) if histogram is not None else None
+            initargs = palettes.worker_args() + (k, max_pixels, histogram_options)
+            with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+                for index, result in enumerate(pool.imap_unordered(_analyze, paths, chunksize=4), 1):
+                    image_histogram = result.pop('histogram', None)
+                    if image_histogram is not None:
+                        histogram.merge(ColorHistogram.from_dict(image_histogram))
+                    if writer is not None:
+                        writer.writerow(_csv_row(result))
+                    else:
+                        f.write(json.dumps(result, ensure_ascii=False) + '\n')
+                    # 每条结果立即落盘, 中断后可以从这里继续
+                    f.flush()
+                    if histogram_path and index % checkpoint_every == 0:
+                        histogram.save(histogram_path)
+                    stats.add(result)
+                    if 'error' in result:
+                        failed += 1
+                    else:
+                        succeeded += 1
+                    if progress_every and index % progress_every == 0:
+                        elapsed = time.perf_counter() - start
+                        print(f"已处理 {index}/{len(paths)} 张, {index / elapsed:.1f} 张/秒", file=sys.stderr)
+    finally:
+        palettes.close()
+        if histogram is not None and histogram_path:
+            histogram.save(histogram_path)
+
+    stats.report(time.perf_counter() - start)
+    return succeeded, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量分析文件夹中图片的平均色和主色')
+    parser.add_argument('directory', help='图片所在目录')
+    parser.add_argument('-o', '--output', required=True, help='输出文件 (.jsonl 或 .csv)')
+    parser.add_argument('-d', '--database', action='append', choices=['all'] + list(DATABASES),
+                        help='用于命名的数据库, 可重复指定 (默认: all)')
+    parser.add_argument('-m', '--metric', default='rgb', choices=METRICS, help='颜色距离度量 (默认: rgb)')
+    parser.add_argument('-k', '--colors', type=int, default=5, help='每张图片提取的主色数量 (默认: 5)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='工作进程数 (默认: CPU核心数)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='输出格式 (默认按扩展名判断)')
+    parser.add_argument('--resume', action='store_true', help='跳过输出文件中已完成的图片并追加结果')
+    parser.add_argument('--no-recursive', action='store_true', help='不遍历子目录')
+    parser.add_argument('--max-pixels', type=int, default=DEFAULT_MAX_PIXELS, help='分析前缩小到的最大像素数')
+    parser.add_argument('--histogram', help='将所有图片的颜色直方图合并后保存到此JSON文件')
+    parser.add_argument('--histogram-bins', type=int, default=16, help='直方图每通道分箱数 (默认: 16)')
+    parser.add_argument('--histogram-space', default='rgb', choices=['rgb', 'lab'], help='直方图颜色空间')
+    args = parser.parse_args(argv)
+
+    histogram = None
+    if args.histogram:
+        histogram = ColorHistogram(args.histogram_bins, args.histogram_space)
+        if args.resume and os.path.exists(args.histogram):
+            # 续跑时在上次保存的直方图基础上继续累计
+            histogram.merge(ColorHistogram.load(args.histogram))
+            if os.path.exists(args.output) and os.path.getmtime(args.output) > os.path.getmtime(args.histogram):
+                print(f"警告: {args.output} 比 {args.histogram} 新, 上次运行可能在保存直方图前被强制结束, "
+                      f"跳过的图片中有一部分不在直方图中", file=sys.stderr)
+        elif args.resume and os.path.exists(args.output):
+            print(f"警告: 没有找到 {args.histogram}, 直方图只包含本次分析的图片", file=sys.stderr)
+
+    succeeded, failed = run_batch(args.directory, args.output, args.database or ['all'], args.metric,
+                                  args.colors, args.workers, args.format, args.resume,
+                                  not args.no_recursive, args.max_pixels, histogram=histogram,
+                                  histogram_path=args.histogram)
+    if failed:
+        print(f"{failed} 张图片分析失败, 详见输出文件中的 error 字段", file=sys.stderr)
+    return 1 if failed and not succeeded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
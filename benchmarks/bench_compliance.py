@@ -0,0 +1,48 @@
+"""色板合规检查的耗时测试
+
+随机生成候选颜色和目标色板, 测量 check_compliance 的耗时 (含Lab转换和最近色查找):
+
+    python benchmarks/bench_compliance.py --candidates 100000 --palette 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from palette_compliance import check_compliance  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='色板合规检查耗时测试')
+    parser.add_argument('--candidates', type=int, default=100000, help='候选颜色数 (默认: 100000)')
+    parser.add_argument('--palette', type=int, default=2000, help='目标色板颜色数 (默认: 2000)')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数, 取最快一次 (默认: 5)')
+    parser.add_argument('--budget', type=float, default=1.0, help='耗时上限 (秒), 超出时返回非零 (默认: 1)')
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    candidates = rng.integers(0, 256, (args.candidates, 3), dtype=np.int32)
+    palette = rng.integers(0, 256, (args.palette, 3), dtype=np.int32)
+
+    for metric in ('lab', 'rgb'):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = check_compliance(candidates, palette, metric=metric)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{metric}: {args.candidates} 个候选颜色 ({result['unique']} 种) × {args.palette} 色, "
+              f"最快 {best * 1000:.1f} ms, 中位 {sorted(timings)[len(timings) // 2] * 1000:.1f} ms, "
+              f"不合规 {int((~result['passed']).sum())}")
+        if metric == 'lab' and best > args.budget:
+            print(f"超出耗时上限 {args.budget:g} 秒", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
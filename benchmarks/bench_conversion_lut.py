@@ -0,0 +1,65 @@
+"""单次颜色转换的微基准测试
+
+测量每次转换的纳秒数:
+1. rgb_to_lab 查表线性化 与 按公式逐通道计算;
+2. get_color_formats 无缓存、缓存命中;
+3. 批量 rgb_array_to_lab 查表 与 幂运算。
+查表与公式结果逐位相同、转换缓存的正确性见 tests/test_conversion_cache.py。
+
+    python benchmarks/bench_conversion_lut.py --number 200000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_core import ColorNameFinder, rgb_array_to_lab, rgb_to_lab  # noqa: E402
+
+
+def report(name, seconds, number):
+    print(f"  {name:<32} {seconds * 1e9 / number:9.1f} ns/次")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='单次颜色转换的微基准测试')
+    parser.add_argument('--number', type=int, default=200000, help='标量转换的测量次数 (默认: 200000)')
+    parser.add_argument('--count', type=int, default=1000000, help='批量转换的颜色数 (默认: 1000000)')
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    colors = [tuple(c) for c in rng.integers(0, 256, (1024, 3)).tolist()]
+    float_colors = [tuple(float(v) for v in c) for c in colors]
+
+    number = args.number
+    print(f"标量转换 ({number} 次):")
+    report('rgb_to_lab (查表)', timeit.timeit(lambda: [rgb_to_lab(c) for c in colors],
+                                               number=number // len(colors)), number)
+    report('rgb_to_lab (公式)', timeit.timeit(lambda: [rgb_to_lab(c) for c in float_colors],
+                                             number=number // len(colors)), number)
+
+    plain = ColorNameFinder()
+    cached = ColorNameFinder(conversion_cache_size=len(colors))
+    for r, g, b in colors:
+        cached.get_color_formats(r, g, b)
+        cached.query_lab((r, g, b))
+    report('get_color_formats (无缓存)', timeit.timeit(lambda: [plain.get_color_formats(*c) for c in colors],
+                                                    number=number // len(colors)), number)
+    report('get_color_formats (缓存命中)', timeit.timeit(lambda: [cached.get_color_formats(*c) for c in colors],
+                                                     number=number // len(colors)), number)
+    report('query_lab (缓存命中)', timeit.timeit(lambda: [cached.query_lab(c) for c in colors],
+                                             number=number // len(colors)), number)
+
+    rgb = rng.integers(0, 256, (args.count, 3), dtype=np.uint8)
+    print(f"批量转换 ({args.count} 个颜色):")
+    report('rgb_array_to_lab (uint8 查表)', timeit.timeit(lambda: rgb_array_to_lab(rgb), number=1), args.count)
+    report('rgb_array_to_lab (float 公式)', timeit.timeit(lambda: rgb_array_to_lab(rgb.astype(np.float64)),
+                                                        number=1), args.count)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
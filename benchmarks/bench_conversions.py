@@ -0,0 +1,57 @@
+"""批量颜色转换的吞吐量测试
+
+测量每种转换每秒处理的颜色数, 以及标量 get_color_formats 的速度。
+与标量版本逐字一致 (包括取整) 和往返误差的检查见 tests/test_color_convert.py。
+
+    python benchmarks/bench_conversions.py --count 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import color_convert as cc  # noqa: E402
+from color_core import ColorNameFinder, rgb_array_to_lab  # noqa: E402
+
+CONVERSIONS = [
+    ('CMYK', cc.rgb_array_to_cmyk),
+    ('HSV', cc.rgb_array_to_hsv),
+    ('HSL', cc.rgb_array_to_hsl),
+    ('XYZ', cc.rgb_array_to_xyz),
+    ('Lab', rgb_array_to_lab),
+    ('LCh', cc.rgb_array_to_lch),
+    ('OKLab', cc.rgb_array_to_oklab),
+    ('CAM16', cc.rgb_array_to_cam16ucs),
+    ('packed', cc.rgb_array_to_packed),
+    ('formats', cc.color_format_arrays),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量颜色转换的吞吐量测试')
+    parser.add_argument('--count', type=int, default=1000000, help='测试的颜色数 (默认: 1000000)')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder()
+    rgb = np.random.default_rng(0).integers(0, 256, (args.count, 3), dtype=np.uint8)
+    print(f"吞吐量 ({args.count} 个颜色):")
+    for name, forward in CONVERSIONS:
+        start = time.perf_counter()
+        forward(rgb)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:>8}: {args.count / elapsed / 1e6:6.1f} M/秒 ({elapsed * 1e9 / args.count:6.1f} ns/色)")
+
+    start = time.perf_counter()
+    for r, g, b in rgb[:20000].tolist():
+        finder.get_color_formats(r, g, b)
+    elapsed = time.perf_counter() - start
+    print(f"  标量 get_color_formats: {20000 / elapsed / 1e6:6.2f} M/秒")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""显示器配置文件查找表的速度测试
+
+生成 sRGB 和 Display P3 的矩阵/曲线型ICC文件 (参数曲线和采样曲线两种写法), 测量建表、
+单个像素和整张截图的转换耗时, 并列出查找表和 LittleCMS 生成的后备查找表与 Pillow (LittleCMS)
+逐像素转换的差 (后备查找表在色域边界附近较大)。最多相差1级和 sRGB 恒等映射的检查见
+tests/test_display_lut.py。
+
+需要安装Pillow。
+
+    python benchmarks/bench_display_lut.py --pixels 1000000
+"""
+import argparse
+import io
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image, ImageCms
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import color_profile as cp  # noqa: E402
+from color_convert import D65_WHITE, RGB_TO_XYZ  # noqa: E402
+
+# sRGB 的参数曲线 (类型3)
+SRGB_CURVE = (2.4, 1 / 1.055, 0.055 / 1.055, 1 / 12.92, 0.04045)
+
+
+def primaries_matrix(primaries, white):
+    """由三原色和白点的xy色度计算线性RGB到XYZ的矩阵"""
+    xyz = np.array([[x / y, 1.0, (1 - x - y) / y] for x, y in primaries]).T
+    scale = np.linalg.solve(xyz, white)
+    return xyz * scale
+
+
+def fixed(values):
+    return b''.join(struct.pack('>i', int(round(v * 65536))) for v in values)
+
+
+def build_profile(matrix, sampled_curve=False):
+    """写出一个最小的 v4 显示器ICC文件, matrix 为线性RGB到D65 XYZ的矩阵"""
+    pcs_matrix = cp._bradford_adaptation(D65_WHITE, cp.D50_WHITE) @ matrix
+    if sampled_curve:
+        x = np.linspace(0, 1, 1024)
+        y = np.where(x <= 0.04045, x / 12.92, ((x + 0.055) / 1.055) ** 2.4)
+        curve = b'curv' + b'\0' * 4 + struct.pack('>I', len(y)) + struct.pack(f'>{len(y)}H', *np.rint(y * 65535).astype(int))
+    else:
+        curve = b'para' + b'\0' * 4 + struct.pack('>H', 3) + b'\0\0' + fixed(SRGB_CURVE)
+    curve += b'\0' * (-len(curve) % 4)
+    tags = [(b'wtpt', b'XYZ ' + b'\0' * 4 + fixed(cp.D50_WHITE))]
+    tags += [(name, b'XYZ ' + b'\0' * 4 + fixed(pcs_matrix[:, c])) for c, name in enumerate((b'rXYZ', b'gXYZ', b'bXYZ'))]
+    tags += [(name, curve) for name in (b'rTRC', b'gTRC', b'bTRC')]
+
+    offset = 128 + 4 + 12 * len(tags)
+    table, body = [], b''
+    for name, data in tags:
+        table.append(struct.pack('>4sII', name, offset + len(body), len(data)))
+        body += data
+    size = offset + len(body)
+    header = bytearray(128)
+    struct.pack_into('>I', header, 0, size)
+    header[8:12] = bytes([4, 0x30, 0, 0])
+    header[12:24] = b'mntrRGB XYZ '
+    header[36:40] = b'acsp'
+    header[68:80] = fixed(cp.D50_WHITE)
+    return bytes(header) + struct.pack('>I', len(tags)) + b''.join(table) + body
+
+
+def littlecms_convert(data, rgb):
+    """LittleCMS 逐像素转换到sRGB, 作为参考结果"""
+    transform = ImageCms.buildTransform(ImageCms.ImageCmsProfile(io.BytesIO(data)), ImageCms.createProfile('sRGB'),
+                                        'RGB', 'RGB')
+    image = Image.fromarray(rgb.reshape(1, -1, 3))
+    return np.asarray(ImageCms.applyTransform(image, transform), dtype=np.int32).reshape(-1, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='显示器配置文件查找表的速度测试')
+    parser.add_argument('--pixels', type=int, default=1000000, help='批量转换的像素数 (默认: 1000000)')
+    args = parser.parse_args(argv)
+
+    p3 = primaries_matrix([(0.680, 0.320), (0.265, 0.690), (0.150, 0.060)], D65_WHITE)
+    rgb = np.random.default_rng(0).integers(0, 256, (args.pixels, 3), dtype=np.uint8)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, matrix, sampled in [('sRGB', RGB_TO_XYZ, False), ('sRGB 采样曲线', RGB_TO_XYZ, True),
+                                      ('Display P3', p3, False), ('Display P3 采样曲线', p3, True)]:
+            path = os.path.join(directory, 'profile.icc')
+            data = build_profile(matrix, sampled)
+            with open(path, 'wb') as f:
+                f.write(data)
+
+            start = time.perf_counter()
+            lut = cp.DisplayLUT.from_icc(path)
+            build_time = time.perf_counter() - start
+            fallback = cp.DisplayLUT(*cp._littlecms_lut(data, lut.size))
+            reference = littlecms_convert(data, rgb)
+
+            start = time.perf_counter()
+            converted = lut.apply(rgb)
+            batch_time = time.perf_counter() - start
+            versus_cms = np.abs(converted.astype(np.int32) - reference).max()
+            fallback_error = np.abs(fallback.apply(rgb).astype(np.int32) - reference)
+
+            start = time.perf_counter()
+            for r, g, b in rgb[:20000].tolist():
+                lut.apply_pixel(r, g, b)
+            pixel_time = (time.perf_counter() - start) / 20000
+
+            print(f"{name}: 建表 {build_time * 1e3:.1f} ms, 与LittleCMS最大差 {versus_cms}, "
+                  f"单像素 {pixel_time * 1e6:.1f} us, "
+                  f"批量 {batch_time / args.pixels * 1e9:.0f} ns/像素")
+            print(f"  后备查找表: 最大差 {fallback_error.max()}, 99% 分位 {np.percentile(fallback_error, 99):.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""各输入数据类型的耗时和内存测试
+
+同一组8位颜色分别以 uint8、uint16 (v*257)、float32 和 float64 (0-255 标度) 输入,
+对每种类型测量线性化、Lab转换、最近色匹配、直方图和量化的耗时, 以及 tracemalloc
+记录的峰值临时内存。各类型的结果与 uint8 一致的检查见 tests/test_dtypes.py。
+
+    python benchmarks/bench_dtypes.py --count 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_core import ColorNameFinder, rgb_array_to_lab, srgb_array_to_linear  # noqa: E402
+from color_histogram import ColorHistogram  # noqa: E402
+from image_analysis import quantize_pixels  # noqa: E402
+
+
+def as_dtype(rgb, dtype):
+    if dtype == np.uint16:
+        return rgb.astype(np.uint16) * 257
+    return rgb.astype(dtype)
+
+
+def measure(function, *args):
+    """返回 (结果, 秒数, 峰值内存MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='各输入数据类型的耗时和内存测试')
+    parser.add_argument('--count', type=int, default=1000000, help='测试的颜色数 (默认: 1000000)')
+    parser.add_argument('-d', '--database', default='all', help='匹配使用的数据库 (默认: all)')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder()
+    rgb8 = np.random.default_rng(0).integers(0, 256, (args.count, 3), dtype=np.uint8)
+    for metric in ('rgb', 'lab'):
+        finder.get_palette_arrays(args.database, metric)
+
+    tasks = [
+        ('线性化', srgb_array_to_linear),
+        ('Lab', rgb_array_to_lab),
+        ('匹配 rgb', lambda rgb: finder.find_closest_indices(rgb, args.database, 'rgb')),
+        ('匹配 lab', lambda rgb: finder.find_closest_indices(rgb, args.database, 'lab')),
+        ('直方图 rgb', lambda rgb: ColorHistogram(16).bin_indices(rgb)),
+        ('直方图 lab', lambda rgb: ColorHistogram(16, 'lab').bin_indices(rgb)),
+        ('量化', quantize_pixels),
+    ]
+    print(f"{args.count} 个颜色, 输入数组: uint8 {rgb8.nbytes / 1e6:.0f} MB")
+    print(f"{'':>10} " + ' '.join(f"{name:>18}" for name in ('uint8', 'uint16', 'float32', 'float64')))
+    results = {name: [] for name, _ in tasks}
+    for dtype in (np.uint8, np.uint16, np.float32, np.float64):
+        rgb = as_dtype(rgb8, dtype)
+        for name, function in tasks:
+            _, elapsed, peak = measure(function, rgb)
+            results[name].append(f"{elapsed * 1e3:7.1f} ms {peak:5.0f} MB")
+    for name, _ in tasks:
+        print(f"{name:>10} " + ' '.join(f"{cell:>18}" for cell in results[name]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
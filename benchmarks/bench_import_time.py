@@ -0,0 +1,71 @@
+"""检查 color_core 的导入耗时
+
+使用 python -X importtime 在新进程中导入模块, 统计总耗时和最慢的子模块,
+并确认没有导入图形界面或其他较重的依赖。超过预算时返回非零退出码,
+可以在提交前或持续集成中运行:
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --module color_cli --budget-ms 60
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 核心模块不允许导入的模块
+FORBIDDEN_MODULES = ('PyQt5', 'PIL', 'pyperclip', 'numpy')
+
+
+def measure_import(module, python=sys.executable):
+    """在新进程中导入模块, 返回 {模块名: (自身耗时, 累计耗时)} (微秒)"""
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, encoding='utf-8', errors='replace')
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        timings[name] = (int(parts[0]), int(parts[1]))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='检查模块导入耗时')
+    parser.add_argument('--module', default='color_core', help='要检查的模块 (默认: color_core)')
+    parser.add_argument('--budget-ms', type=float, default=30.0, help='累计导入耗时预算, 毫秒 (默认: 30)')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数, 取最小值 (默认: 5)')
+    parser.add_argument('--top', type=int, default=10, help='显示最慢的模块数量')
+    args = parser.parse_args(argv)
+
+    runs = [measure_import(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda timings: timings[args.module][1])
+    total_ms = best[args.module][1] / 1000
+
+    print(f"{args.module} 导入耗时: {total_ms:.2f} ms (预算 {args.budget_ms:.2f} ms, {args.repeat} 次取最小值)")
+    print("最慢的模块 (自身耗时):")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000:8.2f} ms  {cumulative_us / 1000:8.2f} ms  {name}")
+
+    failed = False
+    forbidden = sorted({name for name in best
+                        if name.split('.')[0] in FORBIDDEN_MODULES})
+    if forbidden:
+        print(f"错误: 导入了不允许的模块: {', '.join(forbidden)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"错误: 导入耗时超出预算 {total_ms - args.budget_ms:.2f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""多语言名称表的切换耗时测试
+
+测量第一次切换 (读取表) 和再次切换 (使用缓存的表和索引) 的耗时, 以及切换后批量匹配的耗时。
+合并结果、英文名称查找和切换前后匹配结果一致的检查见 tests/test_color_locale.py。
+
+    python benchmarks/bench_locale.py --count 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_core import DATABASES, LOCALES, ColorNameFinder  # noqa: E402
+from compiled_palette import CompiledPalettes  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='多语言名称表的切换耗时测试')
+    parser.add_argument('--count', type=int, default=100000, help='批量匹配的颜色数 (默认: 100000)')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder(preload=True)
+    palettes = CompiledPalettes.load(finder=finder)
+
+    rgb = np.random.default_rng(0).integers(0, 256, (args.count, 3), dtype=np.uint8)
+    for locale in list(LOCALES)[1:]:
+        start = time.perf_counter()
+        finder.set_locale(locale, palettes.locale_tables(locale))
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        names, _ = finder.get_palette_arrays('all', 'lab')
+        indices, _ = finder.find_closest_indices(rgb, 'all', 'lab')
+        match_time = time.perf_counter() - start
+        print(f"切换到 {LOCALES[locale]}: {first * 1e3:.2f} ms, 之后第一次批量匹配 (建立索引) "
+              f"{match_time * 1e3:.0f} ms, 例: {names[indices[0]]}")
+        start = time.perf_counter()
+        finder.set_locale('zh')
+        finder.set_locale(locale)
+        finder.set_locale('zh')
+        print(f"再次来回切换: {(time.perf_counter() - start) / 3 * 1e6:.1f} us/次")
+    print("英文表: " + ', '.join(f"{database} {len(table)}" for database, table in palettes.locale_tables('en').items())
+          + f" (共 {len(DATABASES)} 个数据库, 其余与中文相同)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
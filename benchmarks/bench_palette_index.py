@@ -0,0 +1,64 @@
+"""单个颜色最近色查询的基准测试
+
+对每种距离度量比较 find_closest_color 的k-d树查询与逐个比较的线性扫描每次查询的微秒数。
+两者结果完全相同的检查见 tests/test_palette_index.py。
+
+    python benchmarks/bench_palette_index.py --count 2000 -d all
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_core import DATABASES, METRICS, ColorNameFinder  # noqa: E402
+
+
+def linear_scan(finder, rgb, database, metric):
+    """不使用索引的参考实现"""
+    names, index = finder.get_palette_index(database, metric)
+    q0, q1, q2 = finder.query_point(rgb, metric)
+    best, best_d = -1, float('inf')
+    for i, (p0, p1, p2) in enumerate(index.points):
+        d = (p0 - q0) ** 2 + (p1 - q1) ** 2 + (p2 - q2) ** 2
+        if d < best_d:
+            best, best_d = i, d
+    return names[best], best_d if metric == 'rgb' else best_d ** 0.5
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='单个颜色最近色查询的基准测试')
+    parser.add_argument('--count', type=int, default=2000, help='查询的颜色数 (默认: 2000)')
+    parser.add_argument('-d', '--database', default='all', choices=['all'] + list(DATABASES),
+                        help='数据库 (默认: all)')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder()
+    table = finder.get_color_table(args.database)
+    colors = [tuple(c) for c in np.random.default_rng(0).integers(0, 256, (args.count, 3)).tolist()]
+    colors = [c for c in colors if c not in table]
+    print(f"数据库 {args.database}: {len(table)} 色, {len(colors)} 次查询")
+
+    for metric in METRICS:
+        start = time.perf_counter()
+        finder.get_palette_index(args.database, metric)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for c in colors:
+            finder.find_closest_color(c, args.database, metric)
+        indexed_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for c in colors:
+            linear_scan(finder, c, args.database, metric)
+        scan_time = time.perf_counter() - start
+        print(f"  {metric:>8}: 建立索引 {build * 1e3:6.1f} ms, k-d树 {indexed_time / len(colors) * 1e6:7.1f} us/次, "
+              f"线性扫描 {scan_time / len(colors) * 1e6:7.1f} us/次")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""颜色记法批量解析的速度测试
+
+生成混合各种记法的文本 (十六进制、rgb/hsl/hsv/cmyk、色卡编号、颜色名称),
+其中插入一定比例的错误行, 测量不重复文本和重复文本 (命中解析缓存) 的每秒行数。
+各记法、格式往返和错误报告的检查见 tests/test_color_parser.py。
+
+    python benchmarks/bench_parser.py --lines 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_core import ColorNameFinder  # noqa: E402
+from color_parser import ColorParser  # noqa: E402
+
+MALFORMED = ['#GGHHII', 'rgb(300, 0, 0)', 'hsl(10, 200%, 50%)', 'cmyk(1, 2, 3)', 'RAL 99999',
+             '不存在的颜色', '1, 2', 'rgb(1, 2, x)', '#12345', 'hsv()']
+
+
+def generate_lines(finder, count, error_rate, seed=0):
+    """返回 (文本行列表, 错误行的行号集合)"""
+    rng = random.Random(seed)
+    names = [name for database in ('gb', 'ral', 'pantone', 'ncs', 'chinese', 'japanese', 'css')
+             for _, name, _ in finder.iter_color_entries(database)]
+    codes = [code for database in ('ral', 'pantone', 'ncs', 'gb')
+             for code, _, _ in finder.iter_color_entries(database) if code]
+    lines, malformed = [], set()
+    for i in range(count):
+        if rng.random() < error_rate:
+            lines.append(rng.choice(MALFORMED))
+            malformed.add(i + 1)
+            continue
+        r, g, b = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+        kind = rng.randrange(8)
+        if kind == 0:
+            lines.append(f"#{r:02X}{g:02X}{b:02X}")
+        elif kind == 1:
+            lines.append(f"{r}, {g}, {b}")
+        elif kind == 2:
+            lines.append(f"rgb({r} {g} {b})")
+        elif kind == 3:
+            lines.append(f"hsl({rng.randrange(360)}, {rng.randrange(101)}%, {rng.randrange(101)}%)")
+        elif kind == 4:
+            lines.append(f"HSV({rng.randrange(360)}°, {rng.randrange(101)}%, {rng.randrange(101)}%)")
+        elif kind == 5:
+            lines.append(f"cmyk({rng.randrange(101)}%, {rng.randrange(101)}%, {rng.randrange(101)}%, {rng.randrange(101)}%)")
+        elif kind == 6:
+            lines.append(rng.choice(codes).lower() if rng.random() < 0.5 else rng.choice(codes))
+        else:
+            lines.append(rng.choice(names))
+    return lines, malformed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='颜色记法批量解析的速度测试')
+    parser.add_argument('--lines', type=int, default=1000000, help='生成的行数 (默认: 1000000)')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='错误行的比例 (默认: 0.01)')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder()
+    lines, malformed = generate_lines(finder, args.lines, args.error_rate)
+    color_parser = ColorParser(finder)
+    start = time.perf_counter()
+    color_parser.name_index()
+    print(f"名称索引: {len(color_parser.name_index())} 个键, {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    errors = []
+    start = time.perf_counter()
+    parsed = sum(1 for _, _, result in color_parser.parse_lines(lines, errors) if result is not None)
+    elapsed = time.perf_counter() - start
+    print(f"{args.lines} 行: {elapsed:.2f} 秒 ({args.lines / elapsed:,.0f} 行/秒), "
+          f"解析 {parsed}, 报告错误 {len(errors)}, 实际错误 {len(malformed)}")
+
+    # 只有1万种不同文本的输入, 大部分行命中解析缓存
+    repeated = lines[:10000] * (args.lines // 10000)
+    start = time.perf_counter()
+    for _ in color_parser.parse_lines(repeated):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"重复文本: {elapsed:.2f} 秒 ({len(repeated) / elapsed:,.0f} 行/秒)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
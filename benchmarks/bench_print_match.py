@@ -0,0 +1,152 @@
+"""印刷色匹配的速度测试
+
+用一个简单的油墨模型 (网点扩大 + 各油墨对RGB的吸收) 生成规则网格的CGATS测量数据
+和等价的 lut16 型CMYK配置文件 (tests/test_print_match.py 也使用这一模型), 测量读取、
+名称网格的建立、再次载入 (细分网格并读取磁盘缓存)、批量查询和单个查询的耗时。
+网格、ICC配置文件和查询结果的检查见 tests/test_print_match.py。
+
+需要安装Pillow才能读取ICC配置文件。
+
+    python benchmarks/bench_print_match.py --steps 17 --count 200000
+"""
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import print_match as pm  # noqa: E402
+from color_convert import RGB_TO_XYZ, xyz_array_to_lab  # noqa: E402
+from color_core import ColorNameFinder  # noqa: E402
+from color_profile import D50_WHITE  # noqa: E402
+
+# 每种油墨 (C, M, Y, K) 对线性R、G、B反射的吸收率
+INK_ABSORPTION = np.array([[0.92, 0.30, 0.06], [0.12, 0.88, 0.25], [0.02, 0.10, 0.90], [0.88, 0.88, 0.86]])
+PAPER = np.array([0.93, 0.94, 0.90])
+
+
+def print_model(cmyk):
+    """CMYK (0-100) -> D65 Lab 的模拟印刷条件"""
+    t = np.asarray(cmyk, dtype=np.float64) / 100
+    t = t + 0.6 * t * (1 - t)
+    reflectance = PAPER * np.prod(1 - t[..., :, None] * INK_ABSORPTION, axis=-2)
+    return xyz_array_to_lab(reflectance @ RGB_TO_XYZ.T)
+
+
+def write_cgats(path, cmyk, lab):
+    with open(path, 'w', encoding='ascii') as f:
+        f.write('CGATS.17\nNUMBER_OF_FIELDS 8\nBEGIN_DATA_FORMAT\n'
+                'SAMPLE_ID CMYK_C CMYK_M CMYK_Y CMYK_K LAB_L LAB_A LAB_B\nEND_DATA_FORMAT\n')
+        f.write(f'NUMBER_OF_SETS {len(cmyk)}\nBEGIN_DATA\n')
+        for i, (c, l) in enumerate(zip(cmyk.tolist(), lab.tolist())):
+            f.write(f"{i + 1} {c[0]:.4f} {c[1]:.4f} {c[2]:.4f} {c[3]:.4f} {l[0]:.4f} {l[1]:.4f} {l[2]:.4f}\n")
+        f.write('END_DATA\n')
+
+
+def fixed(values):
+    return b''.join(struct.pack('>i', int(round(v * 65536))) for v in values)
+
+
+def build_cmyk_profile(lab_d50, steps):
+    """写出只含 A2B0 (lut16) 和白点的最小CMYK输出配置文件, lab_d50 为 (steps^4, 3)"""
+    # lut16 使用旧版16位Lab编码: L 0-0xFF00 对应 0-100, a/b 为 v/256 - 128
+    encoded = np.empty(lab_d50.shape)
+    encoded[:, 0] = lab_d50[:, 0] * 0xFF00 / 100
+    encoded[:, 1:] = (lab_d50[:, 1:] + 128) * 256
+    clut = np.clip(np.rint(encoded), 0, 65535).astype('>u2').tobytes()
+    ramp = struct.pack('>2H', 0, 65535)
+    a2b0 = (b'mft2' + b'\0' * 4 + struct.pack('>4B', 4, 3, steps, 0) + fixed([1, 0, 0, 0, 1, 0, 0, 0, 1])
+            + struct.pack('>2H', 2, 2) + ramp * 4 + clut + ramp * 3)
+    a2b0 += b'\0' * (-len(a2b0) % 4)
+    tags = [(b'wtpt', b'XYZ ' + b'\0' * 4 + fixed(D50_WHITE)), (b'A2B0', a2b0)]
+    offset = 128 + 4 + 12 * len(tags)
+    table, body = [], b''
+    for name, data in tags:
+        table.append(struct.pack('>4sII', name, offset + len(body), len(data)))
+        body += data
+    header = bytearray(128)
+    struct.pack_into('>I', header, 0, offset + len(body))
+    header[8:12] = bytes([2, 0x10, 0, 0])
+    header[12:24] = b'prtrCMYKLab '
+    header[36:40] = b'acsp'
+    header[68:80] = fixed(D50_WHITE)
+    return bytes(header) + struct.pack('>I', len(tags)) + b''.join(table) + body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='印刷色匹配的速度测试')
+    parser.add_argument('--steps', type=int, default=17, help='模拟特性化数据每个通道的节点数 (默认: 17)')
+    parser.add_argument('--count', type=int, default=200000, help='批量查询的CMYK数 (默认: 200000)')
+    args = parser.parse_args(argv)
+
+    nodes = np.linspace(0, 100, args.steps)
+    cmyk_nodes = np.stack(np.meshgrid(nodes, nodes, nodes, nodes, indexing='ij'), axis=-1).reshape(-1, 4)
+    model_lab = print_model(cmyk_nodes)
+    finder = ColorNameFinder()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'characterization.txt')
+        write_cgats(path, cmyk_nodes[::-1], pm.d65_lab_to_d50(model_lab)[::-1])
+        start = time.perf_counter()
+        characterization = pm.CMYKCharacterization.load(path)
+        print(f"读取CGATS ({len(cmyk_nodes)} 个色块): {time.perf_counter() - start:.2f} 秒")
+
+        try:
+            icc_path = os.path.join(directory, 'printer.icc')
+            with open(icc_path, 'wb') as f:
+                f.write(build_cmyk_profile(pm.d65_lab_to_d50(model_lab), args.steps))
+            start = time.perf_counter()
+            pm.CMYKCharacterization.load(icc_path, args.steps)
+            print(f"读取ICC配置文件 (LittleCMS): {time.perf_counter() - start:.2f} 秒")
+        except (ImportError, ValueError, OSError) as e:
+            print(f"跳过ICC配置文件: {e}")
+
+        rng = np.random.default_rng(0)
+        queries = rng.uniform(0, 100, (args.count, 4))
+        # 一部分查询取整到整数百分比, 模拟实际输入
+        queries[::2] = np.rint(queries[::2])
+        cache_dir = os.path.join(directory, 'cache')
+        for database in ('pantone', 'ral', 'all'):
+            names, _ = finder.get_palette_arrays(database, 'lab')
+            for subdivide in (1, 2):
+                matcher = pm.PrintMatcher(characterization, finder, cache_dir, subdivide)
+                start = time.perf_counter()
+                labels = matcher.cell_labels(database)
+                build_time = time.perf_counter() - start
+                start = time.perf_counter()
+                pm.PrintMatcher(characterization, finder, cache_dir, subdivide).cell_labels(database)
+                load_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                matcher.match_array(queries, database)
+                batch_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                for cmyk in queries[:2000].tolist():
+                    matcher.match(cmyk, database)
+                first_time = (time.perf_counter() - start) / 2000
+                start = time.perf_counter()
+                for cmyk in queries[:2000].tolist():
+                    matcher.match(cmyk, database)
+                repeat_time = (time.perf_counter() - start) / 2000
+
+                print(f"{database:>8} ×{subdivide}: {len(names)} 色, 网格 {'×'.join(map(str, matcher.grid.shape))}, "
+                      f"确定单元 {(labels >= 0).mean():.0%}, 建立 {build_time * 1e3:.0f} ms, "
+                      f"再次载入 {load_time * 1e3:.1f} ms, 批量 {batch_time / args.count * 1e9:.0f} ns/色, "
+                      f"单个 {first_time * 1e6:.0f} us, 重复 {repeat_time * 1e6:.2f} us")
+
+        start = time.perf_counter()
+        name, lab = pm.find_entry(finder, 'ral', 'RAL 3020')
+        cmyk, delta_e = pm.PrintMatcher(characterization, finder, subdivide=2).recipe(lab)
+        print(f"{name} 的印刷配方: CMYK {tuple(round(v, 1) for v in cmyk)}, ΔE {delta_e:.2f} "
+              f"({(time.perf_counter() - start) * 1e3:.0f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
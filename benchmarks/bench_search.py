@@ -0,0 +1,48 @@
+"""颜色搜索索引的速度测试
+
+模拟逐字输入每个颜色名称、编号和拼音/罗马字, 测量每次按键的查询耗时
+(目标: 最大值小于10毫秒)。精确、前缀、模糊和拼音/罗马字查找的检查见 tests/test_color_search.py。
+
+    python benchmarks/bench_search.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_core import ColorNameFinder  # noqa: E402
+from color_search import ColorSearchIndex  # noqa: E402
+from compiled_palette import CompiledPalettes  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='颜色搜索索引的速度测试')
+    parser.add_argument('-n', '--limit', type=int, default=50, help='每次查询返回的结果数 (默认: 50)')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder(preload=True)
+    palettes = CompiledPalettes.load(finder=finder)
+    transliterated = {(database, name): keys for database in palettes.databases
+                      for name, keys in palettes.transliterations(database).items()}
+    start = time.perf_counter()
+    index = ColorSearchIndex(finder, palettes=palettes)
+    print(f"建立索引: {len(index)} 个颜色, {len(index.keys)} 个查找键, {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    timings = []
+    for database, code, name, _ in index.entries:
+        for text in list(filter(None, (name, code))) + transliterated.get((database, name), [])[:1]:
+            for i in range(1, len(text) + 1):
+                start = time.perf_counter()
+                index.search(text[:i], args.limit)
+                timings.append(time.perf_counter() - start)
+    timings.sort()
+    worst = timings[-1] * 1e3
+    print(f"逐字输入 {len(timings)} 次查询: 中位数 {timings[len(timings) // 2] * 1e3:.3f} ms, "
+          f"99% {timings[len(timings) * 99 // 100] * 1e3:.3f} ms, 最大 {worst:.3f} ms")
+    return 1 if worst >= 10 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
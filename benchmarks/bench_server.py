@@ -0,0 +1,107 @@
+"""颜色命名HTTP服务的吞吐量和延迟测试
+
+在本进程内启动 color_server, 由多个客户端线程通过长连接发送请求,
+统计单条查询和批量查询的吞吐量以及延迟分位数:
+
+    python benchmarks/bench_server.py --clients 8 --requests 2000 --batch-size 256
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_server import ColorNameServer  # noqa: E402
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_client(port, requests, make_request, latencies, errors):
+    """单个客户端线程: 复用一个连接依次发送请求"""
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    try:
+        for _ in range(requests):
+            method, path, body = make_request()
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            start = time.perf_counter()
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            if response.status != 200:
+                errors.append(response.status)
+    finally:
+        connection.close()
+
+
+def run_scenario(name, port, clients, requests, make_request, items_per_request=1):
+    latencies = []
+    errors = []
+    threads = [threading.Thread(target=run_client,
+                                args=(port, requests, make_request, latencies, errors))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{name}:")
+    print(f"  请求数 {total}, 错误 {len(errors)}, 用时 {elapsed:.2f} s")
+    print(f"  吞吐量 {total / elapsed:,.0f} 请求/秒, {total * items_per_request / elapsed:,.0f} 颜色/秒")
+    print("  延迟 p50 {:.2f} ms, p95 {:.2f} ms, p99 {:.2f} ms".format(
+        *(percentile(latencies, f) * 1000 for f in (0.5, 0.95, 0.99))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='颜色命名服务压测')
+    parser.add_argument('--clients', type=int, default=8, help='并发客户端数 (默认: 8)')
+    parser.add_argument('--requests', type=int, default=1000, help='每个客户端的请求数 (默认: 1000)')
+    parser.add_argument('--batch-size', type=int, default=256, help='批量接口每次的颜色数 (默认: 256)')
+    parser.add_argument('--distinct', type=int, default=4096, help='随机颜色的种类数, 决定缓存命中率')
+    parser.add_argument('--database', default='all', help='查询的数据库 (默认: all)')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    colors = ['#%06X' % rng.randrange(0x1000000) for _ in range(args.distinct)]
+
+    server = ColorNameServer(('127.0.0.1', 0))
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def single_request():
+        color = rng.choice(colors).replace('#', '%23')
+        return 'GET', f'/name?color={color}&database={args.database}', None
+
+    def batch_request():
+        body = json.dumps({'colors': rng.sample(colors, min(args.batch_size, len(colors))),
+                           'database': args.database})
+        return 'POST', '/name/batch', body
+
+    try:
+        run_scenario("单条查询 GET /name", port, args.clients, args.requests, single_request)
+        run_scenario(f"批量查询 POST /name/batch ({args.batch_size} 种颜色)", port, args.clients,
+                     max(1, args.requests // 10), batch_request, args.batch_size)
+        print(f"缓存: {server.cache.stats()}")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+@python "%~dp0color_cli.py" %*
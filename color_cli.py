@@ -0,0 +1,155 @@
+"""颜色名称批量查询命令行工具
+
+不导入PyQt5, 可在脚本和管道中使用。颜色可以来自命令行参数、文件或标准输入,
+每行一个颜色, 支持 color_parser 中的所有记法 (十六进制、rgb/hsl/hsv/cmyk、
+色卡编号和颜色名称) 以及CSV行。
+
+用法示例:
+    python color_cli.py "#FF0000" "0, 128, 255"
+    python color_cli.py -f colors.csv -d ral --format csv > result.csv
+    python color_cli.py -f messy.txt --errors malformed.tsv
+    type colors.txt | python color_cli.py --metric lab
+"""
+import argparse
+import csv
+import json
+import sys
+
+from color_core import DATABASES, METRICS, ColorNameFinder
+from color_parser import ColorParser
+
+OUTPUT_FORMATS = ('jsonl', 'csv', 'tsv')
+FIELDS = ['input', 'r', 'g', 'b', 'hex', 'name', 'distance', 'database', 'notation']
+
+_parser = None
+
+
+def parse_color_line(line):
+    """从一行文本中解析出RGB颜色, 无法解析时返回None
+
+    先尝试整行, 再尝试CSV中的单个字段, 最后尝试连续的三个数值字段。
+    """
+    global _parser
+    if _parser is None:
+        _parser = ColorParser()
+    result = _parser.parse_line(line)
+    return result[0] if result is not None else None
+
+
+def iter_input_lines(args):
+    """依次产出命令行参数、文件和标准输入中的每一行"""
+    for color in args.colors:
+        yield color
+    for path in args.file:
+        if path == '-':
+            yield from sys.stdin
+        else:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                yield from f
+    if not args.colors and not args.file:
+        yield from sys.stdin
+
+
+class ResultWriter:
+    """按指定格式逐行写出结果"""
+    def __init__(self, stream, output_format, all_names=False):
+        self.stream = stream
+        self.output_format = output_format
+        self.fields = FIELDS + (['all_names'] if all_names else [])
+        self.writer = None
+        if output_format in ('csv', 'tsv'):
+            delimiter = ',' if output_format == 'csv' else '\t'
+            self.writer = csv.writer(stream, delimiter=delimiter, lineterminator='\n')
+            self.writer.writerow(self.fields)
+
+    def write(self, record):
+        if self.writer is None:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            row = []
+            for field in self.fields:
+                value = record.get(field, '')
+                if isinstance(value, list):
+                    value = '; '.join(value)
+                row.append('' if value is None else value)
+            self.writer.writerow(row)
+
+
+def name_colors(finder, lines, database='all', metric='rgb', all_names=False, errors=None):
+    """逐行查询颜色名称, 产出结果字典; 无法解析的行写入 errors"""
+    cache = {}
+    parser = ColorParser(finder)
+    for line_number, text, parsed in parser.parse_lines(lines, errors):
+        if parsed is None:
+            continue
+        rgb, notation, _ = parsed
+
+        result = cache.get(rgb)
+        if result is None:
+            name, distance = finder.find_closest_color(rgb, database, metric)
+            result = {'name': name, 'distance': round(distance, 4) if isinstance(distance, float) else distance}
+            if all_names:
+                result['all_names'] = finder.get_all_color_names(rgb)
+            if len(cache) < 65536:
+                cache[rgb] = result
+
+        r, g, b = rgb
+        record = {'input': text, 'r': r, 'g': g, 'b': b,
+                  'hex': f"#{r:02x}{g:02x}{b:02x}".upper(), 'database': database, 'notation': notation}
+        record.update(result)
+        yield record
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='color-name-finder',
+        description='批量查询颜色名称 (无需图形界面)')
+    parser.add_argument('colors', nargs='*', help='要查询的颜色, 如 "#FF0000" 或 "255,0,0"')
+    parser.add_argument('-f', '--file', action='append', default=[],
+                        help='从文件读取颜色, 每行一个; "-" 表示标准输入。可重复指定')
+    parser.add_argument('-d', '--database', default='all', choices=['all'] + list(DATABASES),
+                        help='使用的颜色数据库 (默认: all)')
+    parser.add_argument('-m', '--metric', default='rgb', choices=METRICS,
+                        help='颜色距离度量 (默认: rgb)')
+    parser.add_argument('--format', default='jsonl', choices=OUTPUT_FORMATS,
+                        help='输出格式 (默认: jsonl)')
+    parser.add_argument('--all-names', action='store_true', help='同时输出颜色在所有数据库中的名称')
+    parser.add_argument('--strict', action='store_true', help='存在无法解析的行时返回非零退出码')
+    parser.add_argument('--errors', help='把所有无法解析的行 (行号和内容) 写入此TSV文件')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    finder = ColorNameFinder()
+    writer = ResultWriter(sys.stdout, args.format, args.all_names)
+    # 交互式终端逐行刷新, 管道输出则依靠缓冲提高吞吐
+    flush_each = sys.stdout.isatty()
+    errors = []
+
+    try:
+        for record in name_colors(finder, iter_input_lines(args), args.database,
+                                  args.metric, args.all_names, errors):
+            writer.write(record)
+            if flush_each:
+                sys.stdout.flush()
+    except BrokenPipeError:
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    sys.stdout.flush()
+
+    if args.errors:
+        with open(args.errors, 'w', encoding='utf-8', newline='') as f:
+            report = csv.writer(f, delimiter='\t', lineterminator='\n')
+            report.writerow(['line', 'text'])
+            report.writerows(errors)
+    for line_number, text in errors[:20]:
+        print(f"第 {line_number} 行无法解析: {text}", file=sys.stderr)
+    if len(errors) > 20:
+        print(f"... 共 {len(errors)} 行无法解析", file=sys.stderr)
+    return 1 if errors and args.strict else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,362 @@
+"""颜色空间批量转换
+
+所有函数输入输出均为numpy数组, 最后一维为颜色通道, 前面可以是任意形状,
+一次调用可处理数百万个颜色。计算与格式化分开: 转换函数返回不取整的浮点值,
+color_format_arrays 按 ColorNameFinder 的规则取整, format_color_formats
+再生成与 get_color_formats 完全相同的字符串。
+
+取值范围约定:
+    RGB     0-255; 输入也可以是 uint16 (0-65535) 或超过255的浮点HDR值,
+            见 color_core 中的数据类型约定
+    CMYK    0-100
+    HSV/HSL 色相0-360度, 其余0-100
+    XYZ     D65, 白点 Y=1
+    Lab/LCh CIE 1976, D65
+    OKLab   L为0-1
+    CAM16-UCS  J'为0-100, sRGB标准观察条件 (L_A = 64/π/5 cd/m², Y_b = 20, 一般环境)
+
+CMYK、HSV、HSL 的计算步骤与 ColorNameFinder 中对应的标量函数逐项相同,
+因此取整后的结果(包括恰好为 .5 时的银行家舍入)与标量版本完全一致。
+与标量版本的一致性由 tests/test_color_convert.py 检查; 吞吐量由 benchmarks/bench_conversions.py,
+各输入类型的耗时和内存由 benchmarks/bench_dtypes.py 测量。
+"""
+import numpy as np
+
+from color_core import rgb_array_to_255, rgb_array_to_lab, srgb_array_to_linear
+
+# sRGB (D65) 线性值与XYZ之间的转换矩阵
+RGB_TO_XYZ = np.array([[0.4124564, 0.3575761, 0.1804375],
+                       [0.2126729, 0.7151522, 0.0721750],
+                       [0.0193339, 0.1191920, 0.9503041]])
+XYZ_TO_RGB = np.linalg.inv(RGB_TO_XYZ)
+D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+# OKLab (Björn Ottosson, 2020)
+_OKLAB_M1 = np.array([[0.4122214708, 0.5363325363, 0.0514459929],
+                      [0.2119034982, 0.6806995451, 0.1073969566],
+                      [0.0883024619, 0.2817188376, 0.6299787005]])
+_OKLAB_M2 = np.array([[0.2104542553, 0.7936177850, -0.0040720468],
+                      [1.9779984951, -2.4285922050, 0.4505937099],
+                      [0.0259040371, 0.7827717662, -0.8086757660]])
+# 用精确的逆矩阵代替论文中截断到10位小数的逆矩阵, 使往返转换误差在1e-9以内
+_OKLAB_M1_INV = np.linalg.inv(_OKLAB_M1)
+_OKLAB_M2_INV = np.linalg.inv(_OKLAB_M2)
+
+# CAM16 (Li et al., 2017) 的色适应矩阵
+_CAM16_M = np.array([[0.401288, 0.650173, -0.051461],
+                     [-0.250268, 1.204414, 0.045854],
+                     [-0.002079, 0.048952, 0.953127]])
+_CAM16_M_INV = np.linalg.inv(_CAM16_M)
+
+
+def srgb_to_linear(rgb):
+    """sRGB值转换为0-1的线性值, 8位和16位整数输入查表"""
+    return srgb_array_to_linear(rgb)
+
+
+def linear_to_srgb(linear):
+    """0-1 的线性值转换为 0-255 的sRGB浮点值(不截断、不取整)"""
+    linear = np.asarray(linear, dtype=np.float64)
+    encoded = np.where(linear <= 0.0031308, linear * 12.92,
+                       1.055 * np.abs(linear) ** (1 / 2.4) * np.sign(linear) - 0.055)
+    return encoded * 255.0
+
+
+def to_rgb8(rgb):
+    """将浮点或 uint16 的RGB四舍五入并截断为 uint8"""
+    return np.clip(np.rint(rgb_array_to_255(rgb)), 0, 255).astype(np.uint8)
+
+
+def _as_rgb8(rgb):
+    """8位整数输入原样返回, 其他类型 (uint16、浮点) 先取整为 uint8"""
+    rgb = np.asarray(rgb)
+    if rgb.dtype.kind == 'f' or rgb.dtype == np.uint16:
+        return to_rgb8(rgb)
+    return rgb
+
+
+# ---- HEX ----
+
+def rgb_array_to_packed(rgb):
+    """RGB转换为 0xRRGGBB 形式的整数"""
+    rgb = _as_rgb8(rgb).astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def packed_array_to_rgb(packed):
+    packed = np.asarray(packed, dtype=np.uint32)
+    return np.stack([(packed >> 16) & 255, (packed >> 8) & 255, packed & 255], axis=-1).astype(np.uint8)
+
+
+def hex_array_to_rgb(values):
+    """将 "#RRGGBB"、"RRGGBB" 或 "#RGB" 字符串序列解析为 (N, 3) uint8 数组, 无效时抛出 ValueError"""
+    digits = []
+    for value in values:
+        text = value.strip().lstrip('#')
+        if len(text) == 3:
+            text = ''.join(c * 2 for c in text)
+        if len(text) != 6:
+            raise ValueError(f"无效的HEX颜色: {value}")
+        digits.append(text)
+    return packed_array_to_rgb(np.array([int(text, 16) for text in digits], dtype=np.uint32))
+
+
+def rgb_array_to_hex(rgb):
+    """RGB转换为大写的 "#RRGGBB" 字符串列表"""
+    return ['#%06X' % value for value in rgb_array_to_packed(np.asarray(rgb).reshape(-1, 3)).tolist()]
+
+
+# ---- CMYK ----
+
+def rgb_array_to_cmyk(rgb):
+    """RGB转换为CMYK (0-100, 不取整), 纯黑为 (0, 0, 0, 100)"""
+    rgb = np.asarray(rgb_array_to_255(rgb), dtype=np.float64)
+    cmy = 1 - rgb / 255
+    min_cmy = cmy.min(axis=-1)
+    black = min_cmy >= 1
+    scale = np.where(black, 1.0, 1 - min_cmy)
+    cmyk = np.empty(rgb.shape[:-1] + (4,))
+    cmyk[..., :3] = (cmy - min_cmy[..., None]) / scale[..., None] * 100
+    cmyk[..., 3] = min_cmy * 100
+    cmyk[black, :3] = 0
+    return cmyk
+
+
+def cmyk_array_to_rgb(cmyk):
+    cmyk = np.asarray(cmyk, dtype=np.float64) / 100
+    return 255 * (1 - cmyk[..., :3]) * (1 - cmyk[..., 3:4])
+
+
+# ---- HSV / HSL ----
+
+def _hue(r, g, b, max_val, diff):
+    """与标量版本相同的分支顺序计算色相的基础值 (未乘60), 三个通道相等时为0"""
+    safe = np.where(diff > 0, diff, 1)
+    return np.where(max_val == r, (g - b) / safe,
+                    np.where(max_val == g, (b - r) / safe, (r - g) / safe))
+
+
+def rgb_array_to_hsv(rgb):
+    """RGB转换为HSV, 色相单位为度, 饱和度和明度为0-100, 不取整"""
+    c = np.asarray(rgb_array_to_255(rgb), dtype=np.float64) / 255.0
+    r, g, b = c[..., 0], c[..., 1], c[..., 2]
+    max_val = c.max(axis=-1)
+    diff = max_val - c.min(axis=-1)
+    base = _hue(r, g, b, max_val, diff)
+    offset = np.where(max_val == r, 0, np.where(max_val == g, 120, 240))
+    hue = np.where(diff > 0, (60 * base + offset) % 360, 0.0)
+    saturation = np.divide(diff, max_val, out=np.zeros_like(diff), where=max_val > 0) * 100
+    return np.stack([hue, saturation, max_val * 100], axis=-1)
+
+
+def rgb_array_to_hsl(rgb):
+    """RGB转换为HSL, 色相单位为度, 饱和度和亮度为0-100, 不取整"""
+    c = np.asarray(rgb_array_to_255(rgb), dtype=np.float64) / 255.0
+    r, g, b = c[..., 0], c[..., 1], c[..., 2]
+    max_val = c.max(axis=-1)
+    min_val = c.min(axis=-1)
+    diff = max_val - min_val
+    lightness = (max_val + min_val) / 2
+    denominator = np.where(lightness < 0.5, max_val + min_val, 2 - max_val - min_val)
+    saturation = np.divide(diff, denominator, out=np.zeros_like(diff), where=diff > 0)
+    offset = np.where(max_val == r, 0, np.where(max_val == g, 2, 4))
+    hue = (offset + _hue(r, g, b, max_val, diff)) * 60
+    hue = np.where(diff > 0, np.where(hue < 0, hue + 360, hue), 0.0)
+    return np.stack([hue, saturation * 100, lightness * 100], axis=-1)
+
+
+def hsv_array_to_rgb(hsv):
+    """HSV转换为 0-255 的浮点RGB"""
+    hsv = np.asarray(hsv, dtype=np.float64)
+    h = hsv[..., 0] % 360 / 60
+    s = np.clip(hsv[..., 1] / 100, 0, 1)
+    v = np.clip(hsv[..., 2] / 100, 0, 1)
+    # f(n) = v - v*s*max(0, min(k, 4-k, 1)), k = (n + h) mod 6
+    k = (np.array([5.0, 3.0, 1.0]) + h[..., None]) % 6
+    return (v[..., None] - (v * s)[..., None] * np.clip(np.minimum(k, 4 - k), 0, 1)) * 255
+
+
+def hsl_array_to_rgb(hsl):
+    """HSL转换为 0-255 的浮点RGB"""
+    hsl = np.asarray(hsl, dtype=np.float64)
+    h = hsl[..., 0] % 360 / 30
+    s = np.clip(hsl[..., 1] / 100, 0, 1)
+    lightness = np.clip(hsl[..., 2] / 100, 0, 1)
+    # f(n) = l - a*max(-1, min(k-3, 9-k, 1)), k = (n + h/30) mod 12
+    k = (np.array([0.0, 8.0, 4.0]) + h[..., None]) % 12
+    a = (s * np.minimum(lightness, 1 - lightness))[..., None]
+    return (lightness[..., None] - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1)) * 255
+
+
+# ---- XYZ / Lab / LCh ----
+
+def rgb_array_to_xyz(rgb):
+    linear = srgb_to_linear(rgb)
+    # float32 的线性值保持 float32, 不升为 float64
+    return linear @ RGB_TO_XYZ.T.astype(linear.dtype, copy=False)
+
+
+def xyz_array_to_rgb(xyz):
+    return linear_to_srgb(np.asarray(xyz, dtype=np.float64) @ XYZ_TO_RGB.T)
+
+
+def xyz_array_to_lab(xyz):
+    t = np.asarray(xyz, dtype=np.float64) / D65_WHITE
+    f = np.where(t > 216 / 24389, np.cbrt(t), (24389 / 27 * t + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def lab_array_to_xyz(lab):
+    lab = np.asarray(lab, dtype=np.float64)
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack([fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200], axis=-1)
+    t = np.where(f > 6 / 29, f ** 3, (116 * f - 16) * 27 / 24389)
+    return t * D65_WHITE
+
+
+def lab_array_to_rgb(lab):
+    return xyz_array_to_rgb(lab_array_to_xyz(lab))
+
+
+def lab_array_to_lch(lab):
+    lab = np.asarray(lab, dtype=np.float64)
+    chroma = np.hypot(lab[..., 1], lab[..., 2])
+    hue = np.degrees(np.arctan2(lab[..., 2], lab[..., 1])) % 360
+    return np.stack([lab[..., 0], chroma, hue], axis=-1)
+
+
+def lch_array_to_lab(lch):
+    lch = np.asarray(lch, dtype=np.float64)
+    radians = np.radians(lch[..., 2])
+    return np.stack([lch[..., 0], lch[..., 1] * np.cos(radians), lch[..., 1] * np.sin(radians)], axis=-1)
+
+
+def rgb_array_to_lch(rgb):
+    return lab_array_to_lch(rgb_array_to_lab(rgb))
+
+
+def lch_array_to_rgb(lch):
+    return lab_array_to_rgb(lch_array_to_lab(lch))
+
+
+# ---- OKLab ----
+
+def rgb_array_to_oklab(rgb):
+    linear = srgb_to_linear(rgb)
+    lms = np.cbrt(linear @ _OKLAB_M1.T.astype(linear.dtype, copy=False))
+    return lms @ _OKLAB_M2.T.astype(linear.dtype, copy=False)
+
+
+def oklab_array_to_rgb(oklab):
+    lms = (np.asarray(oklab, dtype=np.float64) @ _OKLAB_M2_INV.T) ** 3
+    return linear_to_srgb(lms @ _OKLAB_M1_INV.T)
+
+
+# ---- CAM16-UCS ----
+
+def cam16_conditions(white=D65_WHITE, adapting_luminance=64 / np.pi / 5, background=20, surround=(1.0, 0.69, 1.0)):
+    """计算CAM16观察条件的派生参数; white 为 Y=1 的白点XYZ, surround 为 (F, c, N_c)"""
+    f, c, n_c = surround
+    white = np.asarray(white, dtype=np.float64) * 100
+    rgb_w = _CAM16_M @ white
+    degree = np.clip(f * (1 - np.exp((-adapting_luminance - 42) / 92) / 3.6), 0, 1)
+    d_rgb = degree * white[1] / rgb_w + 1 - degree
+    k4 = (1 / (5 * adapting_luminance + 1)) ** 4
+    f_l = 0.2 * k4 * 5 * adapting_luminance + 0.1 * (1 - k4) ** 2 * np.cbrt(5 * adapting_luminance)
+    n = background / white[1]
+    n_bb = 0.725 * n ** -0.2
+    z = 1.48 + np.sqrt(n)
+    rgb_aw = _cam16_compress(d_rgb * rgb_w, f_l)
+    a_w = (2 * rgb_aw[0] + rgb_aw[1] + 0.05 * rgb_aw[2] - 0.305) * n_bb
+    return {'d_rgb': d_rgb, 'f_l': f_l, 'n': n, 'n_bb': n_bb, 'z': z, 'c': c, 'n_c': n_c, 'a_w': a_w}
+
+
+def _cam16_compress(rgb, f_l):
+    x = (f_l * np.abs(rgb) / 100) ** 0.42
+    return np.sign(rgb) * 400 * x / (x + 27.13) + 0.1
+
+
+def _cam16_expand(rgb_a, f_l):
+    x = rgb_a - 0.1
+    magnitude = np.minimum(np.abs(x), 399.999999)
+    return np.sign(x) * 100 / f_l * (27.13 * magnitude / (400 - magnitude)) ** (1 / 0.42)
+
+
+CAM16_SRGB = cam16_conditions()
+
+
+def xyz_array_to_cam16ucs(xyz, conditions=CAM16_SRGB):
+    """XYZ (Y=1) 转换为CAM16-UCS的 J'a'b', 其欧氏距离即 ΔE'"""
+    cond = conditions
+    rgb_a = _cam16_compress(cond['d_rgb'] * (np.asarray(xyz, dtype=np.float64) * 100 @ _CAM16_M.T), cond['f_l'])
+    r, g, b = rgb_a[..., 0], rgb_a[..., 1], rgb_a[..., 2]
+    a = r - 12 * g / 11 + b / 11
+    b_ = (r + g - 2 * b) / 9
+    hue = np.arctan2(b_, a)
+    achromatic = np.maximum((2 * r + g + 0.05 * b - 0.305) * cond['n_bb'], 0)
+    lightness = 100 * (achromatic / cond['a_w']) ** (cond['c'] * cond['z'])
+    e_t = 0.25 * (np.cos(hue + 2) + 3.8)
+    t = 50000 / 13 * cond['n_c'] * cond['n_bb'] * e_t * np.hypot(a, b_) / (r + g + 21 / 20 * b)
+    chroma = t ** 0.9 * np.sqrt(lightness / 100) * (1.64 - 0.29 ** cond['n']) ** 0.73
+    colorfulness = np.log1p(0.0228 * chroma * cond['f_l'] ** 0.25) / 0.0228
+    return np.stack([1.7 * lightness / (1 + 0.007 * lightness),
+                     colorfulness * np.cos(hue), colorfulness * np.sin(hue)], axis=-1)
+
+
+def cam16ucs_array_to_xyz(ucs, conditions=CAM16_SRGB):
+    cond = conditions
+    ucs = np.asarray(ucs, dtype=np.float64)
+    lightness = ucs[..., 0] / (1.7 - 0.007 * ucs[..., 0])
+    hue = np.arctan2(ucs[..., 2], ucs[..., 1])
+    chroma = np.expm1(0.0228 * np.hypot(ucs[..., 1], ucs[..., 2])) / 0.0228 / cond['f_l'] ** 0.25
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (chroma / (np.sqrt(lightness / 100) * (1.64 - 0.29 ** cond['n']) ** 0.73)) ** (1 / 0.9)
+    t = np.where(lightness > 0, t, 0)
+    e_t = 0.25 * (np.cos(hue + 2) + 3.8)
+    p2 = cond['a_w'] * (lightness / 100) ** (1 / (cond['c'] * cond['z'])) / cond['n_bb'] + 0.305
+    cos, sin = np.cos(hue), np.sin(hue)
+    # R_a+G_a+1.05B_a 对 (p2, a, b) 是线性的, 由 t 的定义可直接解出 √(a²+b²)
+    radius = t * p2 / (50000 / 13 * cond['n_c'] * cond['n_bb'] * e_t + t * (671 * cos + 6588 * sin) / 1403)
+    a, b = radius * cos, radius * sin
+    rgb_a = np.stack([460 * p2 + 451 * a + 288 * b, 460 * p2 - 891 * a - 261 * b,
+                      460 * p2 - 220 * a - 6300 * b], axis=-1) / 1403
+    rgb = _cam16_expand(rgb_a, cond['f_l']) / cond['d_rgb']
+    return rgb @ _CAM16_M_INV.T / 100
+
+
+def rgb_array_to_cam16ucs(rgb):
+    return xyz_array_to_cam16ucs(rgb_array_to_xyz(rgb))
+
+
+def cam16ucs_array_to_rgb(ucs):
+    return xyz_array_to_rgb(cam16ucs_array_to_xyz(ucs))
+
+
+# ---- 取整与格式化 ----
+
+def color_format_arrays(rgb):
+    """按 get_color_formats 的取整规则返回各格式的整数数组 {'CMYK': (N, 4), 'HSV': (N, 3), 'HSL': (N, 3)}"""
+    rgb = _as_rgb8(rgb).reshape(-1, 3)
+    return {
+        'CMYK': np.rint(rgb_array_to_cmyk(rgb)).astype(np.int64),
+        'HSV': np.rint(rgb_array_to_hsv(rgb)).astype(np.int64),
+        'HSL': np.rint(rgb_array_to_hsl(rgb)).astype(np.int64),
+    }
+
+
+def format_color_formats(rgb):
+    """批量生成与 ColorNameFinder.get_color_formats 相同的格式字符串字典列表
+
+    uint16 和浮点输入先取整为8位值, 与界面中显示的颜色一致。
+    """
+    rgb = _as_rgb8(rgb).reshape(-1, 3)
+    arrays = color_format_arrays(rgb)
+    return [{
+        'RGB': f"RGB({r}, {g}, {b})",
+        'HEX': hex_value,
+        'CMYK': f"CMYK({cmyk[0]}%, {cmyk[1]}%, {cmyk[2]}%, {cmyk[3]}%)",
+        'HSV': f"HSV({hsv[0]}°, {hsv[1]}%, {hsv[2]}%)",
+        'HSL': f"HSL({hsl[0]}°, {hsl[1]}%, {hsl[2]}%)",
+    } for (r, g, b), hex_value, cmyk, hsv, hsl in zip(
+        rgb.tolist(), rgb_array_to_hex(rgb), arrays['CMYK'].tolist(), arrays['HSV'].tolist(),
+        arrays['HSL'].tolist())]
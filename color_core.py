@@ -0,0 +1,789 @@
+"""颜色名称查找引擎
+
+不依赖PyQt5、PIL或剪贴板, 可在脚本和命令行中单独使用。
+
+批量接口的RGB数组按数据类型确定标度: uint8 等整数为8位值 (0-255);
+uint16 为16位值 (0-65535, 按 /257 换算); 浮点数组为 0-255 标度的连续值,
+HDR 数据可以超过255。各路径按输入类型选择内部表示, 尽量不做整块的类型转换。
+
+为保证导入速度, 模块顶层只导入标准库中的轻量模块; numpy等较重的依赖
+只在需要批量计算的函数内部导入, 颜色数据库也在第一次使用时才加载。
+导入耗时由 benchmarks/bench_import_time.py 检查。
+"""
+import json
+import numbers
+import os
+import re
+
+
+_RGB_TEXT_PATTERN = re.compile(r'^\s*(?:rgb)?\s*\(?\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*\)?\s*$', re.I)
+_HEX_TEXT_PATTERN = re.compile(r'^\s*#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6})\s*$')
+
+
+def parse_rgb_value(value):
+    """将 [r, g, b] / "(r, g, b)" / "#RRGGBB" 等形式解析为RGB元组, 无效时返回None"""
+    if isinstance(value, (list, tuple)):
+        if len(value) != 3 or any(isinstance(x, bool) for x in value):
+            return None
+        try:
+            rgb = tuple(int(x) for x in value)
+        except (ValueError, TypeError):
+            return None
+    elif isinstance(value, str):
+        match = _HEX_TEXT_PATTERN.match(value)
+        if match and (value.strip().startswith('#') or not value.strip().isdigit()):
+            digits = match.group(1)
+            if len(digits) == 3:
+                digits = ''.join(c * 2 for c in digits)
+            return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+        match = _RGB_TEXT_PATTERN.match(value)
+        if not match:
+            return None
+        rgb = tuple(int(x) for x in match.groups())
+    else:
+        return None
+
+    if not all(0 <= x <= 255 for x in rgb):
+        return None
+    return rgb
+
+
+# 数据库代号 -> (属性名, 显示名称, 文件名)
+DATABASES = {
+    'gb': ('gb_colors', '国标', 'gb_colors.json'),
+    'chinese': ('chinese_traditional_colors', '中国传统', 'chinese_colors.json'),
+    'css': ('css_colors', 'CSS', 'css_colors.json'),
+    'x11': ('x11_colors', 'X11', 'x11_colors.json'),
+    'ral': ('ral_colors', 'RAL', 'ral_colors.json'),
+    'pantone': ('pantone_colors', 'Pantone', 'pantone_colors.json'),
+    'ncs': ('ncs_colors', 'NCS', 'ncs_colors.json'),
+    'japanese': ('japanese_colors', '日本传统', 'japanese_colors.json'),
+}
+_DATABASE_FILES = {attr: filename for attr, _, filename in DATABASES.values()}
+
+# 匹配颜色时可选的距离度量
+METRICS = ('rgb', 'lab', 'oklab', 'cam16ucs')
+METRIC_NAMES = {'rgb': 'RGB', 'lab': 'CIE Lab', 'oklab': 'OKLab', 'cam16ucs': 'CAM16-UCS'}
+# 颜色名称的语言, 'zh' 为数据库文件中的原始名称; 其他语言的表见 color_locale
+LOCALES = {'zh': '中文', 'en': 'English'}
+DEFAULT_LOCALE = 'zh'
+# 批量匹配时每次转换到度量空间的行数, 限制大数组转换的临时内存
+CONVERSION_BLOCK_ROWS = 65536
+
+# 色卡名称开头的编号, 如 "RAL 3020"、"PANTONE 14-1210 TCX"、"NCS S 2060-R80B"
+_COLOR_CODE_PATTERN = re.compile(r'^((?:RAL|PANTONE|NCS)(?:\s+[A-Z0-9][A-Z0-9-]*)+)(?:\s+(.*))?$')
+
+_COMMENT_LINE_PATTERN = re.compile(r'^\s*//.*$', re.M)
+_TRAILING_COMMA_PATTERN = re.compile(r',(\s*[}\]])')
+
+
+def normalize_color_table(data):
+    """将颜色数据库统一为 {(r, g, b): 名称}
+
+    支持 {"(r, g, b)": 名称}、{"r, g, b": 名称} 和 {名称: [r, g, b]} 三种格式,
+    同一RGB出现多次时保留第一个名称。
+    """
+    table = {}
+    for key, value in data.items():
+        rgb = parse_rgb_value(key)
+        if rgb is not None:
+            name = value
+        else:
+            rgb = parse_rgb_value(value)
+            if rgb is None:
+                continue
+            name = key
+        table.setdefault(rgb, name)
+    return table
+
+
+def read_color_json(path, object_pairs_hook=None):
+    """读取颜色数据库JSON文件; 部分文件带有 // 注释, 先去掉注释和多余的逗号
+
+    object_pairs_hook=list 时保留重复的键 (如X11中同一RGB的多个名称)。
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    text = _COMMENT_LINE_PATTERN.sub('', text)
+    text = _TRAILING_COMMA_PATTERN.sub(r'\1', text)
+    return json.loads(text, object_pairs_hook=object_pairs_hook)
+
+
+def split_color_code(name):
+    """将 "RAL 3020 鲑鱼红" 形式的名称拆分为 (编号, 其余名称); 没有编号时返回 (None, name)"""
+    match = _COLOR_CODE_PATTERN.match(name)
+    if match is None:
+        return None, name
+    return match.group(1), match.group(2) or ''
+
+
+def plain_rgb(rgb):
+    """将numpy等标量通道转换为Python的int/float, 避免 uint8 等类型在计算距离时溢出"""
+    return tuple(int(x) if isinstance(x, numbers.Integral) else float(x) for x in rgb)
+
+
+def _linearize(c):
+    """sRGB通道值 (0-255) 转换为线性值"""
+    c = c / 255.0
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# 8位sRGB通道值到线性值的查找表, 与 _linearize 的结果逐位相同
+SRGB_TO_LINEAR = tuple(_linearize(c) for c in range(256))
+_linear_array = None
+_linear_array16 = None
+
+
+def rgb_to_lab(rgb):
+    """sRGB转CIE Lab (D65)
+
+    8位整数输入的线性化只需查表, 之后是一次3×3矩阵乘法和三次开立方。
+    """
+    r, g, b = rgb
+    try:
+        if r < 0 or g < 0 or b < 0:
+            raise IndexError
+        r, g, b = SRGB_TO_LINEAR[r], SRGB_TO_LINEAR[g], SRGB_TO_LINEAR[b]
+    except (IndexError, TypeError):
+        r, g, b = _linearize(r), _linearize(g), _linearize(b)
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047
+    y = (0.2126729 * r + 0.7151522 * g + 0.0721750 * b)
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883
+
+    def f(t):
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def rgb_array_to_255(rgb):
+    """将RGB数组换算到 0-255 标度: uint16 转为 float32, 其他类型原样返回 (不复制)"""
+    import numpy as np
+
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint16:
+        return np.divide(rgb, 257, dtype=np.float32)
+    return rgb
+
+
+def srgb_array_to_linear(rgb):
+    """批量将sRGB值转换为0-1的线性值
+
+    8位整数输入查256项的表 (float64, 与 rgb_to_lab 逐位相同); uint16 查65536项的
+    float32 表; float32 输入以 float32 计算; 其他输入按 0-255 标度以 float64 计算。
+    """
+    import numpy as np
+
+    global _linear_array, _linear_array16
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint8 or (rgb.dtype.kind in 'iu' and rgb.dtype != np.uint16 and rgb.size
+                                 and 0 <= rgb.min() and rgb.max() <= 255):
+        if _linear_array is None:
+            _linear_array = np.array(SRGB_TO_LINEAR)
+        return _linear_array[rgb]
+    if rgb.dtype == np.uint16:
+        if _linear_array16 is None:
+            c = np.arange(65536) / 65535.0
+            _linear_array16 = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4).astype(np.float32)
+        return _linear_array16[rgb]
+    dtype = np.float32 if rgb.dtype in (np.float16, np.float32) else np.float64
+    c = rgb.astype(dtype) / dtype(255.0)
+    # 幂运算的分支先截到阈值以上, 避免负值 (HDR或越界数据) 产生无效值
+    return np.where(c <= 0.04045, c / 12.92, ((np.maximum(c, 0.04045) + 0.055) / 1.055) ** 2.4)
+
+
+def rgb_array_to_lab(rgb):
+    """批量将sRGB数组 (..., 3) 转换为CIE Lab (D65), 与 rgb_to_lab 结果一致"""
+    import numpy as np
+
+    c = srgb_array_to_linear(rgb)
+    matrix = np.array([[0.4124564 / 0.95047, 0.3575761 / 0.95047, 0.1804375 / 0.95047],
+                       [0.2126729, 0.7151522, 0.0721750],
+                       [0.0193339 / 1.08883, 0.1191920 / 1.08883, 0.9503041 / 1.08883]])
+    xyz = c @ matrix.T.astype(c.dtype, copy=False)
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def rgb_array_to_metric(rgb, metric):
+    """将RGB数组转换为度量 metric 下的坐标; rgb 度量只换算到 0-255 标度"""
+    if metric == 'rgb':
+        return rgb_array_to_255(rgb)
+    if metric == 'lab':
+        return rgb_array_to_lab(rgb)
+    import color_convert
+
+    if metric == 'oklab':
+        return color_convert.rgb_array_to_oklab(rgb)
+    if metric == 'cam16ucs':
+        return color_convert.rgb_array_to_cam16ucs(rgb)
+    raise ValueError(f"未知的距离度量: {metric}")
+
+
+def rgb_to_metric(rgb, metric):
+    """单个颜色在度量 metric 下的坐标元组"""
+    if metric == 'rgb':
+        return tuple(rgb)
+    if metric == 'lab':
+        return rgb_to_lab(rgb)
+    import numpy as np
+
+    return tuple(rgb_array_to_metric(np.array(rgb), metric).tolist())
+
+
+class PaletteIndex:
+    """调色板坐标的k-d树, 单个颜色的最近邻查询只需访问 O(log n) 个节点
+
+    纯Python实现: 节点按中位数隐式存放在 order 中, 每个节点在坐标跨度最大的轴上划分。
+    距离的计算顺序与逐个比较时相同, 并列时返回下标最小的点, 因此结果与线性扫描完全一致。
+    """
+    def __init__(self, points):
+        self.points = [tuple(p) for p in points]
+        self.order = list(range(len(self.points)))
+        self.axes = [0] * len(self.points)
+        self._build(0, len(self.order))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, lo, hi):
+        if hi - lo <= 1:
+            return
+        points = self.points
+        segment = self.order[lo:hi]
+        axis = max(range(3), key=lambda c: max(points[i][c] for i in segment) - min(points[i][c] for i in segment))
+        segment.sort(key=lambda i: (points[i][axis], i))
+        self.order[lo:hi] = segment
+        mid = (lo + hi) >> 1
+        self.axes[mid] = axis
+        self._build(lo, mid)
+        self._build(mid + 1, hi)
+
+    def nearest(self, query):
+        """返回 (下标, 距离平方); 空索引时返回 (-1, inf)"""
+        points, order, axes = self.points, self.order, self.axes
+        q0, q1, q2 = query
+        best = [-1, float('inf')]
+
+        def search(lo, hi):
+            while lo < hi:
+                mid = (lo + hi) >> 1
+                i = order[mid]
+                p = points[i]
+                d = (p[0] - q0) ** 2 + (p[1] - q1) ** 2 + (p[2] - q2) ** 2
+                if d < best[1] or (d == best[1] and i < best[0]):
+                    best[0], best[1] = i, d
+                diff = query[axes[mid]] - p[axes[mid]]
+                if diff < 0:
+                    near, far = (lo, mid), (mid + 1, hi)
+                else:
+                    near, far = (mid + 1, hi), (lo, mid)
+                search(*near)
+                # 等于时也要检查另一侧, 以便并列时选出下标最小的点
+                if diff * diff > best[1]:
+                    return
+                lo, hi = far
+
+        search(0, len(order))
+        return best[0], best[1]
+
+
+def nearest_palette_indices(queries, points, chunk_size=4096):
+    """对每个查询点在 points 中查找欧氏距离最近的点, 返回 (下标数组, 距离平方数组)
+
+    按 |q|^2 - 2q·p + |p|^2 展开后用矩阵乘法比较, 每块的距离矩阵控制在约2MB以内。
+    RGB整数坐标在float64中的乘积和求和都是精确的, 结果与逐个比较完全一致;
+    返回的距离平方按选中的点重新直接计算。
+    查询点可以是任意数值类型, 只在每块内转换为 float64, 不复制整个数组。
+    """
+    import numpy as np
+
+    queries = np.asarray(queries)
+    integer = queries.dtype.kind in 'iub'
+    points = np.asarray(points, dtype=np.float64)
+    # |q|^2 对同一查询点是常数, 不影响最近点的选择
+    transposed = np.ascontiguousarray(points.T) * -2.0
+    point_norms = np.einsum('ij,ij->i', points, points)
+    rows = max(64, min(chunk_size, (1 << 18) // max(1, len(points))))
+    indices = np.empty(len(queries), dtype=np.intp)
+    squared = np.empty(len(queries), dtype=np.int64 if integer else np.float64)
+    for start in range(0, len(queries), rows):
+        chunk = queries[start:start + rows].astype(np.float64, copy=False)
+        distances = chunk @ transposed
+        distances += point_norms
+        nearest = indices[start:start + rows] = distances.argmin(axis=1)
+        diff = chunk - points[nearest]
+        exact = np.einsum('ij,ij->i', diff, diff)
+        squared[start:start + rows] = np.rint(exact) if integer else exact
+    return indices, squared
+
+
+def nearest_palette_k(queries, points, k, chunk_size=4096):
+    """对每个查询点在 points 中查找最近的 k 个点, 返回按距离从近到远排列的 (下标, 距离平方), 形状均为 (N, k)"""
+    import numpy as np
+
+    queries = np.asarray(queries)
+    points = np.asarray(points, dtype=np.float64)
+    k = min(k, len(points))
+    transposed = np.ascontiguousarray(points.T) * -2.0
+    point_norms = np.einsum('ij,ij->i', points, points)
+    rows = max(64, min(chunk_size, (1 << 18) // max(1, len(points))))
+    indices = np.empty((len(queries), k), dtype=np.intp)
+    squared = np.empty((len(queries), k))
+    for start in range(0, len(queries), rows):
+        chunk = queries[start:start + rows].astype(np.float64, copy=False)
+        distances = chunk @ transposed
+        distances += point_norms
+        if k < len(points):
+            nearest = indices[start:start + rows] = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            nearest = indices[start:start + rows] = np.arange(k)
+        diff = chunk[:, None, :] - points[nearest]
+        squared[start:start + rows] = np.einsum('ijk,ijk->ij', diff, diff)
+    # 按精确距离排序, 距离相同时下标小的在前
+    order = np.lexsort((indices, squared), axis=1)
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(squared, order, axis=1)
+
+
+class ColorNameFinder:
+    def __init__(self, preload=False, conversion_cache_size=0):
+        # 合并后的 {(r, g, b): 名称} 表和Lab坐标缓存, 按数据库代号保存
+        self._table_cache = {}
+        self._lab_cache = {}
+        self._array_cache = {}
+        # 查询颜色的转换结果缓存, 以 r<<16|g<<8|b 为键, 0 表示不缓存
+        self.conversion_cache_size = conversion_cache_size
+        self._format_cache = {}
+        self._query_caches = {}
+        # 各数据库、各度量下的 (名称列表, PaletteIndex)
+        self._index_cache = {}
+        # 当前名称语言, 非默认语言时的 {数据库: {(r, g, b): 名称}}, 以及切换前各语言的表和缓存
+        self.locale = DEFAULT_LOCALE
+        self._locale_tables = {}
+        self._locale_caches = {}
+        # 默认延迟加载, 只读取实际用到的数据库
+        if preload:
+            self.load_color_databases()
+
+    def __getattr__(self, name):
+        """第一次访问数据库属性时加载对应文件"""
+        filename = _DATABASE_FILES.get(name)
+        if filename is None:
+            raise AttributeError(name)
+        value = self.load_color_file(filename)
+        setattr(self, name, value)
+        return value
+        
+    def is_valid_rgb(self, rgb):
+        """验证RGB值是否有效"""
+        if not isinstance(rgb, (tuple, list)) or len(rgb) != 3:
+            return False
+        return all(isinstance(x, numbers.Real) and 0 <= x <= 255 for x in rgb)
+
+    def get_gb_color_name(self, rgb):
+        """获取GB标准颜色名称"""
+        if not self.is_valid_rgb(rgb):
+            return None
+            
+        r, g, b = rgb
+        
+        # 首先检查是否有精确匹配
+        for color_id, color_data in self.gb_colors.items():
+            if isinstance(color_data, dict) and 'rgb' in color_data:
+                if tuple(color_data['rgb']) == (r, g, b):
+                    return color_data.get('name', color_id)
+        
+        return None
+
+
+
+    def load_color_databases(self):
+        """加载各种颜色数据库"""
+        # 国标颜色名称 (GSB05-1426-2001)
+        self.gb_colors = self.load_color_file('gb_colors.json')
+        
+        # 中国传统颜色
+        self.chinese_traditional_colors = self.load_color_file('chinese_colors.json')
+        
+        # CSS颜色名称
+        self.css_colors = self.load_color_file('css_colors.json')
+        
+        # X11颜色名称
+        self.x11_colors = self.load_color_file('x11_colors.json')
+        
+        # RAL经典色卡
+        self.ral_colors = self.load_color_file('ral_colors.json')
+        
+        # Pantone色卡
+        self.pantone_colors = self.load_color_file('pantone_colors.json')
+        
+        # NCS自然色彩系统
+        self.ncs_colors = self.load_color_file('ncs_colors.json')
+        
+        # 日本传统色
+        self.japanese_colors = self.load_color_file('japanese_colors.json')
+        
+    def load_color_file(self, filename):
+        """尝试加载颜色数据库文件"""
+        try:
+            # 首先尝试从当前目录加载
+            filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+            if os.path.exists(filepath):
+                data = read_color_json(filepath)
+                if filename.startswith('gb_'):
+                    return data
+                return normalize_color_table(data)
+            
+            # 如果不存在，使用内置的默认值
+            return getattr(self, f'default_{filename.replace(".json", "")}', {})
+        except:
+            return {}
+
+    def get_database(self, database, original=False):
+        """获取指定数据库的 {(r, g, b): 名称} 表, 'all' 表示合并所有数据库(GB标准优先)
+
+        名称为当前语言 (见 set_locale); original=True 时为数据库文件中的原始名称。
+        """
+        if database == 'all':
+            color_db = self.get_database('gb', original)
+            for key in DATABASES:
+                if key != 'gb':
+                    for rgb, name in self.get_database(key, original).items():
+                        color_db.setdefault(rgb, name)
+            return color_db
+        if not original and database in self._locale_tables:
+            return dict(self._locale_tables[database])
+        if database == 'gb':
+            color_db = {}
+            for color_id, color_data in self.gb_colors.items():
+                if isinstance(color_data, dict) and 'rgb' in color_data:
+                    color_db.setdefault(tuple(color_data['rgb']), color_data.get('name', color_id))
+            return color_db
+        attr = DATABASES[database][0] if database in DATABASES else f'{database}_colors'
+        return dict(getattr(self, attr, {}))
+
+    def set_locale(self, locale, tables=None):
+        """切换颜色名称的语言
+
+        tables 为 {数据库: {(r, g, b): 名称}}, 通常来自编译后调色板的 locale_tables();
+        省略时由 color_locale 合并数据库文件得到。各语言的表和索引分别缓存,
+        切换回已用过的语言时不重新建立。
+        """
+        if locale == self.locale:
+            return
+        self._locale_caches[self.locale] = (self._locale_tables, self._table_cache, self._lab_cache,
+                                            self._array_cache, self._index_cache)
+        cached = self._locale_caches.get(locale)
+        if cached is None:
+            if tables is None and locale != DEFAULT_LOCALE:
+                from color_locale import locale_tables
+                tables = locale_tables(self, locale)
+            cached = (dict(tables or {}), {}, {}, {}, {})
+        (self._locale_tables, self._table_cache, self._lab_cache,
+         self._array_cache, self._index_cache) = cached
+        self.locale = locale
+
+    def iter_color_entries(self, database, original=False):
+        """依次产出数据库中每个颜色的 (编号, 名称, (r, g, b)), 没有编号时编号为 None
+
+        GB标准的编号为 "GB-01-01" 形式的键; RAL/Pantone/NCS 的编号从名称开头拆分得到。
+        与 get_color_table 不同, GB标准中RGB相同的颜色都会产出。名称为当前语言,
+        original 为 True 时为数据库文件中的原始名称。
+        """
+        if database == 'gb' and (original or 'gb' not in self._locale_tables):
+            for color_id, color_data in self.gb_colors.items():
+                if isinstance(color_data, dict) and 'rgb' in color_data:
+                    yield color_id, color_data.get('name', color_id), tuple(color_data['rgb'])
+            return
+        table = self.get_database(database, original=True) if original else self.get_color_table(database)
+        for rgb, name in table.items():
+            yield split_color_code(name)[0], name, rgb
+
+    def get_color_table(self, database):
+        """获取缓存的 {(r, g, b): 名称} 表, 调用方不应修改返回值"""
+        table = self._table_cache.get(database)
+        if table is None:
+            table = self._table_cache[database] = self.get_database(database)
+        return table
+
+    def get_lab_table(self, database):
+        """获取缓存的 [((r, g, b), (L, a, b))] 列表"""
+        entries = self._lab_cache.get(database)
+        if entries is None:
+            entries = [(rgb, rgb_to_lab(rgb)) for rgb in self.get_color_table(database)]
+            self._lab_cache[database] = entries
+        return entries
+
+    def _cached_conversion(self, cache, r, g, b, convert):
+        """按打包后的RGB值缓存转换结果, 超出容量时丢弃最早加入的项"""
+        size = self.conversion_cache_size
+        if size <= 0:
+            return convert()
+        if not all(isinstance(c, numbers.Integral) and 0 <= c <= 255 for c in (r, g, b)):
+            # 浮点颜色和超出范围的值不缓存, 后者打包后会与其他颜色冲突
+            return convert()
+        # numpy整数标量移位会溢出, 先转换为int
+        key = (int(r) << 16) | (int(g) << 8) | int(b)
+        value = cache.get(key)
+        if value is None:
+            if len(cache) >= size:
+                # 导入颜色的线程和界面共用同一个查找器, 另一线程可能同时插入或丢弃了最早的项
+                try:
+                    cache.pop(next(iter(cache), None), None)
+                except RuntimeError:
+                    pass
+            value = cache[key] = convert()
+        return value
+
+    def query_point(self, rgb, metric='lab'):
+        """查询颜色在度量 metric 下的坐标, 启用转换缓存时重复的颜色只计算一次"""
+        rgb = plain_rgb(rgb)
+        r, g, b = rgb
+        cache = self._query_caches.setdefault(metric, {})
+        return self._cached_conversion(cache, r, g, b, lambda: rgb_to_metric(rgb, metric))
+
+    def query_lab(self, rgb):
+        return self.query_point(rgb, 'lab')
+
+    def get_palette_index(self, database, metric='rgb'):
+        """获取数据库在度量 metric 下的 (名称列表, PaletteIndex), 首次使用时建立
+
+        rgb 和 lab 度量不需要numpy; 切换度量只会新建索引, 不会重新读取数据库。
+        """
+        key = (database, metric)
+        cached = self._index_cache.get(key)
+        if cached is None:
+            table = self.get_color_table(database)
+            if metric == 'rgb':
+                points = list(table)
+            elif metric == 'lab':
+                points = [lab for _, lab in self.get_lab_table(database)]
+            else:
+                points = self.get_palette_arrays(database, metric)[1].tolist()
+            cached = self._index_cache[key] = (list(table.values()), PaletteIndex(points))
+        return cached
+
+    def get_palette_arrays(self, database, metric='rgb'):
+        """获取数据库的 (名称列表, 坐标数组), 供批量查询使用
+
+        metric 为 'rgb' 时坐标为 int32 的RGB值, 其余为该颜色空间中 float64 的坐标。
+        顺序与 get_color_table 一致, 因此并列最近时与 find_closest_color 选择相同的颜色。
+        """
+        key = (database, metric)
+        arrays = self._array_cache.get(key)
+        if arrays is None:
+            import numpy as np
+
+            table = self.get_color_table(database)
+            names = list(table.values())
+            rgb = np.array(list(table.keys()), dtype=np.int32).reshape(-1, 3)
+            points = rgb_array_to_metric(rgb, metric)
+            arrays = self._array_cache[key] = (names, points)
+        return arrays
+
+    def find_closest_indices(self, colors, database='all', metric='rgb', chunk_size=4096):
+        """批量查找最接近的颜色在 get_palette_arrays 中的下标
+
+        colors 为形如 (N, 3) 的RGB数组或序列, 返回 (下标数组, 距离数组),
+        距离的含义与 find_closest_color 相同。按块计算以限制内存占用。
+        数据库为空时下标为 -1、距离为无穷大。
+        colors 可以是 uint8、uint16 或浮点数组; 非 rgb 度量按块转换颜色空间,
+        不为整个输入分配转换后的数组。
+        """
+        import numpy as np
+
+        colors = np.asarray(colors).reshape(-1, 3)
+        names, points = self.get_palette_arrays(database, metric)
+        if not names:
+            return np.full(len(colors), -1, dtype=np.intp), np.full(len(colors), np.inf)
+
+        if metric == 'rgb':
+            return nearest_palette_indices(rgb_array_to_255(colors), points, chunk_size)
+        indices = np.empty(len(colors), dtype=np.intp)
+        distances = np.empty(len(colors))
+        for start in range(0, len(colors), CONVERSION_BLOCK_ROWS):
+            block = slice(start, start + CONVERSION_BLOCK_ROWS)
+            indices[block], squared = nearest_palette_indices(rgb_array_to_metric(colors[block], metric),
+                                                              points, chunk_size)
+            distances[block] = np.sqrt(squared)
+        return indices, distances
+
+    def find_closest_colors(self, colors, database='all', metric='rgb', chunk_size=4096):
+        """批量查找最接近的颜色名称, 返回 (名称列表, 距离数组)"""
+        names = self.get_palette_arrays(database, metric)[0]
+        indices, distances = self.find_closest_indices(colors, database, metric, chunk_size)
+        if not names:
+            return ["未知颜色"] * len(indices), distances
+        return [names[i] for i in indices], distances
+
+    # 默认颜色数据库（如果文件不存在）
+    @property
+    def default_gb_colors(self):
+        return {
+            (255, 255, 255): "白色",
+            (0, 0, 0): "黑色",
+            (255, 0, 0): "红色",
+            # 更多颜色...
+        }
+    
+    @property
+    def default_chinese_colors(self):
+        return {
+            (238, 221, 187): "杏仁黄",
+            (240, 223, 187): "麦秆黄",
+            # 更多颜色...
+        }
+    
+    # 其他默认颜色数据库...
+
+    def find_closest_color(self, rgb, database='all', metric='rgb'):
+        """查找最接近的颜色名称
+
+        metric 为 'rgb' 时返回RGB距离的平方, 其余返回该颜色空间中的欧氏距离:
+        'lab' 为CIE76色差ΔE, 'oklab' 为 ΔEok (L为0-1), 'cam16ucs' 为 ΔE'。
+        最近色由 get_palette_index 的k-d树查找。
+        """
+        if not self.is_valid_rgb(rgb):
+            return "无效颜色", float('inf')
+        
+        rgb = plain_rgb(rgb)
+        r, g, b = rgb
+        
+        # 获取指定数据库
+        color_db = self.get_color_table(database)
+        
+        # 首先检查是否有精确匹配
+        if (r, g, b) in color_db:
+            return color_db[(r, g, b)], 0
+        
+        # 如果没有精确匹配，则查找最接近的颜色
+        names, index = self.get_palette_index(database, metric)
+        if not names:  # 空数据库时
+            return "未知颜色", float('inf')
+        closest, squared = index.nearest(self.query_point(rgb, metric))
+        return names[closest], squared if metric == 'rgb' else squared ** 0.5
+
+
+    def get_all_color_names(self, rgb, metric='rgb'):
+        """获取颜色的所有名称, 没有精确匹配时按 metric 查找近似色"""
+        r, g, b = rgb
+        names = []
+        
+        # 特殊处理GB标准(嵌套字典结构), RGB相同的颜色都列出
+        for _, name, color in self.iter_color_entries('gb'):
+            if color == (r, g, b):
+                names.append(f"国标: {name}")
+        
+        # 检查其他数据库(当前语言的 {(r, g, b): 名称} 表)
+        for key, (_, db_name, _) in DATABASES.items():
+            if key != 'gb':
+                name = self.get_color_table(key).get((r, g, b))
+                if name is not None:
+                    names.append(f"{db_name}: {name}")
+        
+        # 如果没有找到精确匹配，查找最接近的颜色
+        if not names:
+            closest_name, distance = self.find_closest_color(rgb, metric=metric)
+            names.append(f"近似: {closest_name} (Δ={distance:g})")
+        
+        return names
+
+
+    
+    def get_color_formats(self, r, g, b):
+        """获取不同格式的颜色值"""
+        formats = self._cached_conversion(self._format_cache, r, g, b,
+                                          lambda: self._compute_color_formats(r, g, b))
+        return dict(formats)
+
+    def _compute_color_formats(self, r, g, b):
+        hex_color = f"#{r:02x}{g:02x}{b:02x}".upper()
+        cmyk = self.rgb_to_cmyk(r, g, b)
+        hsv = self.rgb_to_hsv(r, g, b)
+        hsl = self.rgb_to_hsl(r, g, b)
+        
+        return {
+            'RGB': f"RGB({r}, {g}, {b})",
+            'HEX': hex_color,
+            'CMYK': f"CMYK({cmyk[0]}%, {cmyk[1]}%, {cmyk[2]}%, {cmyk[3]}%)",
+            'HSV': f"HSV({hsv[0]}°, {hsv[1]}%, {hsv[2]}%)",
+            'HSL': f"HSL({hsl[0]}°, {hsl[1]}%, {hsl[2]}%)"
+        }
+    
+    def rgb_to_cmyk(self, r, g, b):
+        """RGB转CMYK"""
+        if (r, g, b) == (0, 0, 0):
+            return 0, 0, 0, 100
+            
+        c = 1 - r / 255
+        m = 1 - g / 255
+        y = 1 - b / 255
+        
+        min_cmy = min(c, m, y)
+        c = (c - min_cmy) / (1 - min_cmy) * 100
+        m = (m - min_cmy) / (1 - min_cmy) * 100
+        y = (y - min_cmy) / (1 - min_cmy) * 100
+        k = min_cmy * 100
+        
+        return round(c), round(m), round(y), round(k)
+    
+    def rgb_to_hsv(self, r, g, b):
+        """RGB转HSV"""
+        r, g, b = r/255.0, g/255.0, b/255.0
+        max_val = max(r, g, b)
+        min_val = min(r, g, b)
+        diff = max_val - min_val
+        
+        if max_val == min_val:
+            h = 0
+        elif max_val == r:
+            h = (60 * ((g - b)/diff)) % 360
+        elif max_val == g:
+            h = (60 * ((b - r)/diff) + 120) % 360
+        elif max_val == b:
+            h = (60 * ((r - g)/diff) + 240) % 360
+        
+        if max_val == 0:
+            s = 0
+        else:
+            s = (diff / max_val) * 100
+            
+        v = max_val * 100
+        
+        return round(h), round(s), round(v)
+    
+    def rgb_to_hsl(self, r, g, b):
+        """RGB转HSL"""
+        r, g, b = r/255.0, g/255.0, b/255.0
+        max_val = max(r, g, b)
+        min_val = min(r, g, b)
+        diff = max_val - min_val
+        
+        l = (max_val + min_val) / 2
+        
+        if diff == 0:
+            h = s = 0
+        else:
+            if l < 0.5:
+                s = diff / (max_val + min_val)
+            else:
+                s = diff / (2 - max_val - min_val)
+                
+            if max_val == r:
+                h = (g - b) / diff
+            elif max_val == g:
+                h = 2 + (b - r) / diff
+            else:
+                h = 4 + (r - g) / diff
+                
+            h *= 60
+            if h < 0:
+                h += 360
+                
+        return round(h), round(s*100), round(l*100)
+
@@ -0,0 +1,170 @@
+"""颜色直方图
+
+在可配置的RGB或Lab三维网格中累计颜色数量。像素先换算为网格坐标并打包成
+一维下标, 再用 np.bincount 一次性计数。直方图可以跨图片、跨进程合并,
+可以保存为JSON, 也可以按最近的标准色汇总为"命名颜色"统计。
+
+用法:
+    hist = ColorHistogram(bins=16)
+    hist.add_pixels(pixels)
+    hist.rollup(finder, 'ral')[:10]
+"""
+import json
+import os
+
+import numpy as np
+
+from color_core import nearest_palette_indices, rgb_array_to_lab, rgb_array_to_metric
+
+# Lab各通道参与分箱的取值范围
+LAB_RANGES = ((0.0, 100.0), (-128.0, 128.0), (-128.0, 128.0))
+
+
+class ColorHistogram:
+    """RGB或Lab三维颜色直方图"""
+    def __init__(self, bins=16, space='rgb'):
+        if space not in ('rgb', 'lab'):
+            raise ValueError(f"不支持的颜色空间: {space}")
+        self.bins = tuple(int(b) for b in (bins if isinstance(bins, (tuple, list)) else (bins,) * 3))
+        if len(self.bins) != 3 or not all(1 <= b <= 256 for b in self.bins):
+            raise ValueError("每个通道的分箱数必须在1到256之间")
+        self.space = space
+        self.counts = np.zeros(self.bins[0] * self.bins[1] * self.bins[2], dtype=np.int64)
+        # 分箱到标准色的映射只与分箱有关, 计数变化时无需清除
+        self._rollup_cache = {}
+        self._tables = None
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def bin_indices(self, pixels):
+        """将 (..., 3) 的RGB像素换算为打包后的一维分箱下标
+
+        像素可以是 uint8、uint16 或 0-255 标度的浮点数, 超出范围的值归入边缘分箱。
+        """
+        pixels = np.asarray(pixels).reshape(-1, 3)
+        if self.space == 'rgb' and pixels.dtype == np.uint8:
+            # 8位输入: 每个通道查一次256项的表, 表中已乘好打包所需的步长
+            tables = self._channel_tables()
+            return tables[0][pixels[:, 0]] + tables[1][pixels[:, 1]] + tables[2][pixels[:, 2]]
+        if self.space == 'rgb' and pixels.dtype == np.uint16:
+            # 16位输入: 整数除法 (u/257 * b/256), 与8位输入按 v*257 对应的分箱相同
+            coords = pixels.astype(np.int64) * np.array(self.bins) // (257 * 256)
+        elif self.space == 'rgb':
+            # 浮点输入按 0-255 标度分箱; float32 不升为 float64
+            dtype = np.float32 if pixels.dtype == np.float32 else np.float64
+            coords = np.floor(pixels.astype(dtype, copy=False) * np.array(self.bins, dtype=dtype) / dtype(256)).astype(np.int64)
+        else:
+            lab = rgb_array_to_lab(pixels)
+            coords = np.empty(lab.shape, dtype=np.int64)
+            for c, (low, high) in enumerate(LAB_RANGES):
+                coords[:, c] = np.floor((lab[:, c] - low) * self.bins[c] / (high - low))
+        for c in range(3):
+            np.clip(coords[:, c], 0, self.bins[c] - 1, out=coords[:, c])
+        return (coords[:, 0] * self.bins[1] + coords[:, 1]) * self.bins[2] + coords[:, 2]
+
+    def _channel_tables(self):
+        tables = self._tables
+        if tables is None:
+            strides = (self.bins[1] * self.bins[2], self.bins[2], 1)
+            values = np.arange(256, dtype=np.int32)
+            tables = self._tables = [(values * b >> 8) * stride for b, stride in zip(self.bins, strides)]
+        return tables
+
+    def add_pixels(self, pixels, weights=None):
+        """累计一批像素, weights 为每个像素的权重(可选, 需为整数)"""
+        indices = self.bin_indices(pixels)
+        if weights is not None:
+            weights = np.asarray(weights).reshape(-1)
+        self.counts += np.bincount(indices, weights=weights, minlength=len(self.counts)).astype(np.int64, copy=False)
+
+    def add_color(self, rgb, count=1):
+        """累计单个颜色, 用于拾色轨迹"""
+        self.counts[self.bin_indices(np.array([rgb], dtype=np.uint8))[0]] += count
+
+    def is_compatible(self, other):
+        return self.bins == other.bins and self.space == other.space
+
+    def merge(self, other):
+        """将另一个直方图累加到当前直方图"""
+        if not self.is_compatible(other):
+            raise ValueError("只能合并分箱数和颜色空间相同的直方图")
+        self.counts += other.counts
+        return self
+
+    __iadd__ = merge
+
+    def __add__(self, other):
+        result = self.copy()
+        return result.merge(other)
+
+    def copy(self):
+        result = ColorHistogram(self.bins, self.space)
+        result.counts[:] = self.counts
+        return result
+
+    def clear(self):
+        self.counts[:] = 0
+
+    def bin_centers(self):
+        """每个分箱中心在当前颜色空间中的坐标, 形状为 (分箱总数, 3)"""
+        axes = []
+        for c, b in enumerate(self.bins):
+            low, high = (0.0, 256.0) if self.space == 'rgb' else LAB_RANGES[c]
+            axes.append(low + (np.arange(b) + 0.5) * (high - low) / b)
+        grid = np.meshgrid(*axes, indexing='ij')
+        return np.stack([g.ravel() for g in grid], axis=1)
+
+    def rollup(self, finder, database='all', metric='lab'):
+        """按最近的标准色汇总, 返回按数量从多到少排列的 [(名称, 数量, 占比)]
+
+        每个分箱按分箱中心映射到一个名称; 映射表对相同的数据库、度量和名称语言只计算一次。
+        """
+        key = (database, metric, finder.locale)
+        names, points = finder.get_palette_arrays(database, metric)
+        if not names:
+            return []
+        occupied = np.nonzero(self.counts)[0]
+        mapping = self._rollup_cache.get(key)
+        if mapping is None:
+            mapping = np.full(len(self.counts), -1, dtype=np.intp)
+            self._rollup_cache[key] = mapping
+        missing = occupied[mapping[occupied] < 0]
+        if len(missing):
+            centers = self.bin_centers()[missing]
+            if self.space == 'rgb' and metric != 'rgb':
+                centers = rgb_array_to_metric(np.clip(centers, 0, 255), metric)
+            elif self.space == 'lab' and metric != 'lab':
+                raise ValueError("Lab直方图只能按lab度量汇总")
+            mapping[missing] = nearest_palette_indices(centers, points)[0]
+
+        totals = np.bincount(mapping[occupied], weights=self.counts[occupied], minlength=len(names))
+        grand_total = totals.sum()
+        order = np.argsort(-totals, kind='stable')
+        return [(names[i], int(totals[i]), float(totals[i] / grand_total))
+                for i in order if totals[i] > 0]
+
+    def to_dict(self):
+        """稀疏形式的可序列化字典, 只保存非零分箱"""
+        occupied = np.nonzero(self.counts)[0]
+        return {'space': self.space, 'bins': list(self.bins), 'total': self.total,
+                'indices': occupied.tolist(), 'counts': self.counts[occupied].tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['bins'], data.get('space', 'rgb'))
+        histogram.counts[np.asarray(data['indices'], dtype=np.intp)] = np.asarray(data['counts'], dtype=np.int64)
+        return histogram
+
+    def save(self, path):
+        """保存为JSON; 先写临时文件再替换, 中断时不会留下不完整的文件"""
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
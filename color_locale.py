@@ -0,0 +1,165 @@
+"""颜色名称的多语言合并
+
+英文/ 下的英文数据库与中文数据库合并为多语言记录 (RGB, {语言: 名称}):
+    Pantone/NCS  按编号对应
+    CSS/X11      按RGB对应, 同一RGB有多个英文名称时取第一个
+带编号的颜色在英文数据库中没有对应时, 名称中编号以外的部分是中文则英文名称为编号本身
+("RAL 3020 鲑鱼红" -> "RAL 3020"), 否则沿用原名称。
+只出现在英文数据库中的颜色也作为记录保留, 排在中文颜色之后, 中文名称为空; 这些记录只用于
+查看和对照, 不进入任何语言的名称表, 因此切换语言只改变名称, 不改变匹配到的颜色。
+
+每种语言的 {(r, g, b): 名称} 表由记录得到:
+    zh  数据库文件中的原始名称, 与 ColorNameFinder 默认的表相同
+    en  英文名称, 没有时使用中文名称
+合并结果保存在编译后的调色板中 (见 compiled_palette), 切换语言时直接读取。
+
+用法:
+    finder.set_locale('en', palettes.locale_tables('en'))
+    python color_locale.py "#F0F8FF" -d css
+"""
+import argparse
+import os
+import sys
+
+from color_core import (DATABASES, DEFAULT_LOCALE, LOCALES, ColorNameFinder, normalize_color_table,
+                        parse_rgb_value, read_color_json, split_color_code)
+
+ENGLISH_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '英文')
+# 数据库代号 -> 英文数据库文件名
+ENGLISH_FILES = {
+    'css': 'css_colors_eng.json',
+    'x11': 'x11_colors_eng.json',
+    'pantone': 'pantone_colors_eng.json',
+    'ncs': 'ncs_colors_eng.json',
+}
+
+
+def read_english_table(database, directory=ENGLISH_DIRECTORY):
+    """读取英文数据库, 返回 [((r, g, b), 名称)], 保留同一RGB的所有名称; 没有文件时返回空列表"""
+    filename = ENGLISH_FILES.get(database)
+    if filename is None:
+        return []
+    try:
+        pairs = read_color_json(os.path.join(directory, filename), object_pairs_hook=list)
+    except (OSError, ValueError):
+        return []
+    return [item for key, value in pairs for item in normalize_color_table({key: value}).items()]
+
+
+def merge_records(finder, database, directory=ENGLISH_DIRECTORY):
+    """合并数据库的中英文名称, 返回 [((r, g, b), {语言: 名称})], 缺少的名称为空字符串
+
+    中文颜色按 get_color_table 的顺序在前, 只有英文的颜色在后。
+    """
+    english = read_english_table(database, directory)
+    by_code, by_rgb = {}, {}
+    for i, (rgb, name) in enumerate(english):
+        code = split_color_code(name)[0]
+        if code:
+            by_code.setdefault(code, i)
+        by_rgb.setdefault(rgb, i)
+
+    records = []
+    used = set()
+    for rgb, name in finder.get_database(database, original=True).items():
+        code, remainder = split_color_code(name)
+        if code:
+            match = by_code.get(code)
+        else:
+            match = by_rgb.get(rgb)
+        if match is not None:
+            used.add(match)
+            english_name = english[match][1]
+        elif code:
+            english_name = name if remainder.isascii() else code
+        else:
+            english_name = ''
+        records.append((rgb, {'zh': name, 'en': english_name}))
+
+    seen = {rgb for rgb, _ in records}
+    for i, (rgb, name) in enumerate(english):
+        if i not in used and rgb not in seen:
+            seen.add(rgb)
+            records.append((rgb, {'zh': '', 'en': name}))
+    return records
+
+
+def display_names(records, locale):
+    """记录在 locale 中显示的名称列表, 不在该语言的表中的记录为空字符串"""
+    if locale == DEFAULT_LOCALE:
+        return [names[DEFAULT_LOCALE] for _, names in records]
+    return [names.get(locale) or names[DEFAULT_LOCALE] for _, names in records]
+
+
+def locale_table(records, locale):
+    """由记录得到 locale 的 {(r, g, b): 名称} 表, 同一RGB保留第一个名称
+
+    只有英文的记录不在表中, 各语言的表包含同一组颜色。
+    """
+    table = {}
+    for (rgb, names), name in zip(records, display_names(records, locale)):
+        if names[DEFAULT_LOCALE] and name:
+            table.setdefault(tuple(rgb), name)
+    return table
+
+
+def locale_tables(finder, locale, directory=ENGLISH_DIRECTORY):
+    """{数据库: {(r, g, b): 名称}}, 只包含名称与原始表不同的数据库"""
+    tables = {}
+    for database in DATABASES:
+        table = locale_table(merge_records(finder, database, directory), locale)
+        if table != finder.get_database(database, original=True):
+            tables[database] = table
+    return tables
+
+
+def alias_names(finder, database, palettes=None):
+    """数据库中每个颜色在其他语言中的名称 {(r, g, b): [名称]}, 用于按任一语言的名称查找
+
+    palettes 为 CompiledPalettes 时使用其中保存的合并结果, 否则读取英文数据库合并。
+    """
+    if palettes is not None and database in palettes.databases:
+        records = palettes.locale_records(database)
+    else:
+        records = merge_records(finder, database)
+    aliases = {}
+    for rgb, names in records:
+        for locale, name in names.items():
+            if locale != finder.locale and name:
+                aliases.setdefault(tuple(rgb), []).append(name)
+    return aliases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='查看颜色的多语言名称')
+    parser.add_argument('color', nargs='*', help='RGB/HEX颜色值; 省略时列出各数据库的合并统计')
+    parser.add_argument('-d', '--database', action='append', choices=list(DATABASES),
+                        help='只查看指定数据库, 可重复指定')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder()
+    databases = args.database or list(DATABASES)
+    merged = {database: merge_records(finder, database) for database in databases}
+    if not args.color:
+        for database, records in merged.items():
+            english = sum(1 for _, names in records if names['en'])
+            only = sum(1 for _, names in records if not names['zh'])
+            print(f"{database:>8}: {len(records)} 条记录, 有英文名称 {english}, 只有英文 {only}")
+        return 0
+    status = 0
+    for text in args.color:
+        rgb = parse_rgb_value(text)
+        if rgb is None:
+            print(f"无法解析颜色: {text}", file=sys.stderr)
+            status = 1
+            continue
+        for database, records in merged.items():
+            for color, names in records:
+                if color == rgb:
+                    print(f"{text}  {database}: " + '  '.join(f"{LOCALES[locale]}: {names[locale] or '-'}"
+                                                             for locale in LOCALES))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""颜色记法解析
+
+把各种写法的颜色文本解析为RGB:
+    #RGB、#RRGGBB、RGB、RRGGBB        十六进制
+    r, g, b、(r, g, b)、rgb(r, g, b)、rgba(...)   RGB, 也可以写百分比
+    hsl(h, s%, l%)、HSV(h°, s%, v%)    色相为度, 其余为百分比; hsb 等同于 hsv
+    CMYK(c%, m%, y%, k%)              按 get_color_formats 的简单公式反算
+    RAL 3020、PANTONE 14-1210 TCX、NCS S 2060-R80B、GB-01-01   色卡编号
+    杏仁黄、桜色、爱丽丝蓝、aliceblue  各数据库中的颜色名称, 包括其他语言的名称 (见 color_locale)
+get_color_formats 输出的每一种格式都能解析; HSV/HSL/CMYK 已取整, 反算结果可能相差几级。
+
+按首字符和括号前的函数名分派到预编译的正则表达式; 编号和名称忽略大小写、空格和
+连字符后查字典, 字典在第一次需要时由各数据库建立 (GB标准优先, 顺序同 'all')。
+相同的文本只解析一次。
+
+用法:
+    parser = ColorParser(finder)
+    parser.parse('hsl(120, 50%, 50%)')     # ((64, 191, 64), 'hsl', None)
+    parser.parse('RAL 3020')              # ((216, 27, 96), 'code', ('ral', 'RAL 3020 鲑鱼红'))
+    for line_number, text, parsed in parser.parse_lines(lines):
+        ...
+"""
+import colorsys
+import csv
+import re
+
+from color_core import DATABASES, ColorNameFinder, parse_rgb_value, split_color_code
+from color_locale import alias_names
+
+_HEX_PATTERN = re.compile(r'^#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})$')
+_FUNCTION_PATTERN = re.compile(r'^([a-zA-Z]+)\s*\((.*)\)$')
+_NUMBER = r'([+-]?(?:\d+(?:\.\d*)?|\.\d+))\s*(%|°|deg)?'
+# 参数之间用逗号、空格或 "/" (CSS的透明度写法) 分隔
+_ARGUMENTS_PATTERN = re.compile(rf'^\s*{_NUMBER}(?:\s*[,/]?\s*{_NUMBER})*\s*$')
+_ARGUMENT_PATTERN = re.compile(_NUMBER)
+_KEY_PATTERN = re.compile(r'[\s\-_]+')
+# 解析结果缓存的最大条目数
+PARSE_CACHE_SIZE = 65536
+
+
+def _rgb_function(values):
+    if len(values) not in (3, 4):
+        return None
+    rgb = tuple(round(v * 2.55) if unit == '%' else round(v) for v, unit in values[:3])
+    return rgb if all(0 <= x <= 255 for x in rgb) else None
+
+
+def _hue_function(convert):
+    def parse(values):
+        if len(values) not in (3, 4):
+            return None
+        (hue, _), (a, _), (b, _) = values[:3]
+        if not (0 <= a <= 100 and 0 <= b <= 100):
+            return None
+        return tuple(round(c * 255) for c in convert(hue / 360 % 1, a / 100, b / 100))
+    return parse
+
+
+def _cmyk_function(values):
+    if len(values) != 4 or not all(0 <= v <= 100 for v, _ in values):
+        return None
+    c, m, y, k = (v / 100 for v, _ in values)
+    return tuple(round(255 * (1 - x) * (1 - k)) for x in (c, m, y))
+
+
+# 函数名 -> (记法, 参数转换函数)
+_FUNCTIONS = {
+    'rgb': ('rgb', _rgb_function), 'rgba': ('rgb', _rgb_function),
+    'hsl': ('hsl', _hue_function(lambda h, s, l: colorsys.hls_to_rgb(h, l, s))),
+    'hsla': ('hsl', _hue_function(lambda h, s, l: colorsys.hls_to_rgb(h, l, s))),
+    'hsv': ('hsv', _hue_function(colorsys.hsv_to_rgb)),
+    'hsb': ('hsv', _hue_function(colorsys.hsv_to_rgb)),
+    'cmyk': ('cmyk', _cmyk_function),
+}
+
+
+def normalize_key(text):
+    """编号和名称的查找键: 忽略大小写、空白、连字符和下划线"""
+    return _KEY_PATTERN.sub('', text).casefold()
+
+
+def entry_keys(code, name):
+    """一个数据库颜色的查找文本, 返回 [(文本, 'code' 或 'name')]
+
+    带编号的颜色包括编号、完整名称、编号后的名称部分、不带体系前缀的编号
+    ("3020"、"14-1210 TCX"、"S 2060-R80B") 和不带后缀的 Pantone 编号。
+    """
+    if not code:
+        return [(name, 'name')]
+    keys = [(code, 'code'), (name, 'code')]
+    parts = code.split()
+    if len(parts) > 1:
+        keys.append((' '.join(parts[1:]), 'code'))
+        if len(parts) > 2 and parts[-1].isalpha():
+            keys.append((' '.join(parts[:-1]), 'code'))
+    remainder = name[len(code):].strip() if name.startswith(code) else name
+    if remainder:
+        keys.append((remainder, 'name'))
+    return keys
+
+
+class ColorParser:
+    """颜色记法解析器, 结果为 ((r, g, b), 记法, 来源) 或 None
+
+    记法为 'hex'、'rgb'、'hsl'、'hsv'、'cmyk'、'code' 或 'name';
+    编号和名称的来源为 (数据库代号, 数据库中的完整名称), 其他记法为 None。
+    """
+    def __init__(self, finder=None, databases=None):
+        self._finder = finder
+        self.databases = list(databases or DATABASES)
+        self._names = None
+        self._cache = {}
+
+    @property
+    def finder(self):
+        if self._finder is None:
+            self._finder = ColorNameFinder()
+        return self._finder
+
+    def name_index(self):
+        """{查找键: ((r, g, b), 记法, (数据库, 名称))}, 第一次调用时建立"""
+        index = self._names
+        if index is not None:
+            return index
+        index = {}
+        for database in self.databases:
+            aliases = alias_names(self.finder, database)
+            for code, name, rgb in self.finder.iter_color_entries(database):
+                entry = (database, name)
+                keys = entry_keys(code, name)
+                for alias in aliases.get(rgb, ()):
+                    keys += entry_keys(split_color_code(alias)[0], alias)
+                for key, kind in keys:
+                    key = normalize_key(key)
+                    # 纯数字的键容易和数值混淆, 不加入
+                    if key and not key.isdigit():
+                        index.setdefault(key, (rgb, kind, entry))
+        self._names = index
+        return index
+
+    def parse(self, text):
+        """解析一段颜色文本, 无法解析时返回 None"""
+        text = text.strip()
+        result = self._cache.get(text)
+        if result is None and text not in self._cache:
+            result = self._parse(text)
+            if len(self._cache) >= PARSE_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[text] = result
+        return result
+
+    def _parse(self, text):
+        if not text:
+            return None
+        head = text[0]
+        if head == '#':
+            match = _HEX_PATTERN.match(text)
+            if match is None:
+                return None
+            return parse_rgb_value(text), 'hex', None
+        if head.isdigit():
+            rgb = parse_rgb_value(text)
+            if rgb is not None:
+                return rgb, ('hex' if _HEX_PATTERN.match(text) else 'rgb'), None
+        elif text[-1] == ')':
+            match = _FUNCTION_PATTERN.match(text)
+            function = _FUNCTIONS.get(match.group(1).lower()) if match else None
+            if function is not None:
+                arguments = match.group(2)
+                if not _ARGUMENTS_PATTERN.match(arguments):
+                    return None
+                values = [(float(number), unit) for number, unit in _ARGUMENT_PATTERN.findall(arguments)]
+                rgb = function[1](values)
+                return (rgb, function[0], None) if rgb is not None else None
+
+        found = self.name_index().get(normalize_key(text))
+        if found is not None:
+            return found
+        # parse_rgb_value 接受的其他写法 (不带 "#" 的十六进制、"(1, 2, 3)" 等) 放在名称之后, 避免与名称冲突
+        rgb = parse_rgb_value(text)
+        if rgb is not None:
+            return rgb, ('hex' if _HEX_PATTERN.match(text) else 'rgb'), None
+        return None
+
+    def parse_line(self, line):
+        """解析一行文本: 先尝试整行, 再尝试CSV中的单个字段, 最后尝试连续的三个数值字段"""
+        line = line.strip()
+        result = self.parse(line)
+        if result is not None or not line or (',' not in line and '\t' not in line):
+            return result
+        delimiter = '\t' if '\t' in line else ','
+        fields = [field.strip() for field in next(csv.reader([line], delimiter=delimiter), [])]
+        for field in fields:
+            if field and not field.isdigit():
+                result = self.parse(field)
+                if result is not None:
+                    return result
+        for i in range(len(fields) - 2):
+            if all(field.isdigit() for field in fields[i:i + 3]):
+                rgb = parse_rgb_value(fields[i:i + 3])
+                if rgb is not None:
+                    return rgb, 'rgb', None
+        return None
+
+    def parse_lines(self, lines, errors=None):
+        """逐行解析, 产出 (行号, 文本, 结果); 跳过空行, 无法解析的行同时写入 errors"""
+        for line_number, line in enumerate(lines, 1):
+            text = line.strip()
+            if not text:
+                continue
+            result = self.parse_line(text)
+            if result is None and errors is not None:
+                errors.append((line_number, text))
+            yield line_number, text, result
@@ -0,0 +1,298 @@
+"""显示器颜色配置文件 (ICC) 到 sRGB 的转换
+
+屏幕截取到的像素值是显示器设备空间中的RGB, 在广色域显示器上并不等于sRGB,
+直接用来查颜色名称会偏。本模块读取显示器的ICC配置文件, 预先把
+"设备RGB -> sRGB" 的映射计算到一个 33×33×33 的三维查找表中, 之后每个像素
+只需查一次各通道的整形曲线、做一次三线性插值, 可以对整块截图批量进行。
+
+- 矩阵/曲线型配置文件 (显示器最常见的类型) 直接用numpy解析 rXYZ/gXYZ/bXYZ
+  和 rTRC/gTRC/bTRC 标签, 不依赖系统的色彩管理服务;
+- 其他类型 (如基于 A2B0 查找表的配置文件) 通过 Pillow 自带的 LittleCMS 生成查找表。
+
+查找表可以保存为 .npz, 之后直接读入使用。
+
+用法:
+    python color_profile.py build display.icc -o display_lut.npz
+    python color_profile.py convert display.icc "#3366CC" "200, 30, 40"
+"""
+import argparse
+import hashlib
+import json
+import struct
+import sys
+
+import numpy as np
+
+from color_convert import XYZ_TO_RGB, D65_WHITE, linear_to_srgb
+from color_core import parse_rgb_value
+
+DEFAULT_LUT_SIZE = 33
+# ICC 连接空间 (PCS) 的白点 D50
+D50_WHITE = np.array([0.9642, 1.0, 0.8249])
+_BRADFORD = np.array([[0.8951, 0.2664, -0.1614],
+                      [-0.7502, 1.7135, 0.0367],
+                      [0.0389, -0.0685, 1.0296]])
+
+
+def _bradford_adaptation(source_white, target_white):
+    cone_ratio = (_BRADFORD @ target_white) / (_BRADFORD @ source_white)
+    return np.linalg.inv(_BRADFORD) @ np.diag(cone_ratio) @ _BRADFORD
+
+
+# PCS (D50) 的XYZ到线性sRGB
+PCS_TO_LINEAR_SRGB = XYZ_TO_RGB @ _bradford_adaptation(D50_WHITE, D65_WHITE)
+
+
+def _s15fixed16(data, offset, count):
+    return np.array(struct.unpack_from(f'>{count}i', data, offset), dtype=np.float64) / 65536.0
+
+
+def read_icc_tags(data):
+    """解析ICC文件的头部和标签表, 返回 (头部信息, {标签签名: 原始字节})"""
+    if len(data) < 132 or data[36:40] != b'acsp':
+        raise ValueError("不是有效的ICC配置文件")
+    header = {
+        'version': data[8],
+        'class': data[12:16].decode('ascii', 'replace'),
+        'color_space': data[16:20].decode('ascii', 'replace').strip(),
+        'pcs': data[20:24].decode('ascii', 'replace').strip(),
+    }
+    count, = struct.unpack_from('>I', data, 128)
+    tags = {}
+    for i in range(count):
+        signature, offset, size = struct.unpack_from('>4sII', data, 132 + 12 * i)
+        if offset + size > len(data):
+            raise ValueError(f"ICC标签超出文件范围: {signature!r}")
+        tags[signature.decode('ascii', 'replace')] = data[offset:offset + size]
+    return header, tags
+
+
+def parse_xyz_tag(data):
+    if data[:4] != b'XYZ ':
+        raise ValueError("不是XYZ类型的标签")
+    return _s15fixed16(data, 8, 3)
+
+
+def parse_curve_tag(data):
+    """将 curv/para 类型的色调曲线解析为函数: 0-1 的设备值数组 -> 0-1 的线性值数组"""
+    kind = data[:4]
+    if kind == b'curv':
+        count, = struct.unpack_from('>I', data, 8)
+        if count == 0:
+            return lambda x: x
+        if count == 1:
+            gamma = struct.unpack_from('>H', data, 12)[0] / 256.0
+            return lambda x: np.power(x, gamma)
+        table = np.array(struct.unpack_from(f'>{count}H', data, 12), dtype=np.float64) / 65535.0
+        positions = np.linspace(0.0, 1.0, count)
+        return lambda x: np.interp(x, positions, table)
+    if kind == b'para':
+        function, = struct.unpack_from('>H', data, 8)
+        counts = {0: 1, 1: 3, 2: 4, 3: 5, 4: 7}
+        if function not in counts:
+            raise ValueError(f"不支持的参数曲线类型: {function}")
+        g, a, b, c, d, e, f = list(_s15fixed16(data, 12, counts[function])) + [0.0] * (7 - counts[function])
+        if function == 0:
+            return lambda x: np.power(x, g)
+        if function in (1, 2):
+            # 类型1、2在 x < -b/a 时为常数 (类型1为0)
+            d = -b / a
+            c, e, f = 0.0, (c if function == 2 else 0.0), (c if function == 2 else 0.0)
+        elif function == 3:
+            e = f = 0.0
+        return lambda x: np.where(x >= d, np.power(np.maximum(a * x + b, 0.0), g) + e, c * x + f)
+    raise ValueError(f"不支持的曲线类型: {kind!r}")
+
+
+# 输入整形曲线的采样: 每个8位级别之间再细分16份, 整数设备值正好落在采样点上
+SHAPER_STEPS = 16
+_SHAPER_SAMPLES = np.arange(255 * SHAPER_STEPS + 1) / SHAPER_STEPS
+
+
+def _matrix_shaper_lut(tags, size):
+    """矩阵/曲线型配置文件: 以各通道的色调曲线作为输入整形曲线, 网格建在设备的线性值上
+
+    整形后设备线性值到线性sRGB是一个3×3矩阵, 三线性插值对线性映射是精确的,
+    查找表的误差只来自整形曲线的采样。
+    """
+    matrix = np.stack([parse_xyz_tag(tags[name]) for name in ('rXYZ', 'gXYZ', 'bXYZ')], axis=1)
+    curves = [parse_curve_tag(tags[name]) for name in ('rTRC', 'gTRC', 'bTRC')]
+    shaper = np.stack([curve(_SHAPER_SAMPLES / 255.0) for curve in curves])
+    nodes = np.linspace(0.0, 1.0, size)
+    grid = np.stack(np.meshgrid(nodes, nodes, nodes, indexing='ij'), axis=-1)
+    return grid @ (PCS_TO_LINEAR_SRGB @ matrix).T, nodes, shaper
+
+
+def _littlecms_lut(data, size):
+    """用 Pillow 的 LittleCMS 生成查找表
+
+    Pillow 只支持8位输入输出, 网格节点取整到整数设备值, 整形曲线为恒等映射。
+    LittleCMS 在网格节点上已把色域外的颜色截断, 色域边界附近的插值误差较大。
+    """
+    import io
+
+    from color_convert import srgb_to_linear
+
+    try:
+        from PIL import Image, ImageCms
+    except ImportError:
+        raise ValueError("该配置文件不是矩阵/曲线型, 需要安装Pillow才能转换")
+    nodes = np.rint(np.linspace(0.0, 255.0, size))
+    grid = np.stack(np.meshgrid(nodes, nodes, nodes, indexing='ij'), axis=-1).astype(np.uint8)
+    image = Image.fromarray(grid.reshape(size * size, size, 3), 'RGB')
+    source = ImageCms.ImageCmsProfile(io.BytesIO(data))
+    transform = ImageCms.buildTransform(source, ImageCms.createProfile('sRGB'), 'RGB', 'RGB')
+    result = np.asarray(ImageCms.applyTransform(image, transform), dtype=np.uint8)
+    shaper = np.repeat(_SHAPER_SAMPLES[None, :], 3, axis=0)
+    return srgb_to_linear(result.reshape(size, size, size, 3)), nodes, shaper
+
+
+class DisplayLUT:
+    """设备RGB -> sRGB 的三维查找表
+
+    shaper 为 (3, 255*16+1) 的各通道输入整形曲线, 在设备值 0-255 上按 1/16 的间隔采样;
+    nodes 为整形后坐标上的网格节点 (递增); lut 为 (n, n, n, 3) 的线性sRGB值, 不截断,
+    插值后再编码为sRGB并截断, 避免色域外颜色的截断折线破坏插值精度。
+    """
+    def __init__(self, lut, nodes, shaper, source=None):
+        self.lut = np.ascontiguousarray(lut, dtype=np.float32)
+        self.size = self.lut.shape[0]
+        self.nodes = np.asarray(nodes, dtype=np.float64)
+        self.shaper = np.asarray(shaper, dtype=np.float64)
+        self.source = source or {}
+        self._flat = self.lut.reshape(-1, 3)
+        # 8位输入每个取值在各通道所在的网格区间和插值权重, 形状为 (256, 3)
+        self._cell, self._weight = self._locate(self.shaper[:, ::SHAPER_STEPS].T)
+        self._scalar = None
+
+    @classmethod
+    def from_icc(cls, path, size=DEFAULT_LUT_SIZE):
+        """读取ICC配置文件并预先计算查找表"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        header, tags = read_icc_tags(data)
+        if header['color_space'] != 'RGB':
+            raise ValueError(f"显示器配置文件应为RGB颜色空间, 实际为 {header['color_space']}")
+        source = {'path': path, 'sha1': hashlib.sha1(data).hexdigest(), 'size': size}
+        if all(name in tags for name in ('rXYZ', 'gXYZ', 'bXYZ', 'rTRC', 'gTRC', 'bTRC')):
+            lut, nodes, shaper = _matrix_shaper_lut(tags, size)
+            source['method'] = 'matrix-shaper'
+        else:
+            lut, nodes, shaper = _littlecms_lut(data, size)
+            source['method'] = 'littlecms'
+        return cls(lut, nodes, shaper, source)
+
+    @classmethod
+    def load(cls, path, size=DEFAULT_LUT_SIZE):
+        """读取保存的查找表 (.npz) 或ICC配置文件"""
+        if path.lower().endswith('.npz'):
+            with np.load(path) as data:
+                return cls(data['lut'], data['nodes'], data['shaper'],
+                           json.loads(bytes(data['source']).decode('utf-8')))
+        return cls.from_icc(path, size)
+
+    def save(self, path):
+        source = np.frombuffer(json.dumps(self.source).encode('utf-8'), dtype=np.uint8)
+        np.savez(path, lut=self.lut, nodes=self.nodes, shaper=self.shaper, source=source)
+
+    def _locate(self, shaped):
+        cell = np.clip(np.searchsorted(self.nodes, shaped, side='right') - 1, 0, self.size - 2)
+        low = self.nodes[cell]
+        weight = (shaped - low) / (self.nodes[cell + 1] - low)
+        return cell, weight.astype(np.float32)
+
+    def apply(self, rgb, dtype=np.uint8):
+        """批量转换 (..., 3) 的设备RGB数组 (0-255), 返回sRGB
+
+        dtype 为 np.uint8 时四舍五入为8位整数, 为 None 时返回截断到 0-255 的浮点值。
+        """
+        rgb = np.asarray(rgb)
+        shape = rgb.shape
+        rgb = rgb.reshape(-1, 3)
+        if rgb.dtype == np.uint8:
+            channels = np.arange(3)
+            cell, weight = self._cell[rgb, channels], self._weight[rgb, channels]
+        else:
+            values = np.clip(rgb.astype(np.float64), 0.0, 255.0)
+            shaped = np.stack([np.interp(values[:, c], _SHAPER_SAMPLES, self.shaper[c]) for c in range(3)], axis=1)
+            cell, weight = self._locate(shaped)
+        size = self.size
+        base = (cell[:, 0] * size + cell[:, 1]) * size + cell[:, 2]
+        wr, wg, wb = weight[:, 0:1], weight[:, 1:2], weight[:, 2:3]
+        flat = self._flat
+        # 依次沿 b、g、r 轴插值
+        c00 = flat[base] + (flat[base + 1] - flat[base]) * wb
+        c01 = flat[base + size] + (flat[base + size + 1] - flat[base + size]) * wb
+        c10 = flat[base + size * size] + (flat[base + size * size + 1] - flat[base + size * size]) * wb
+        c11 = flat[base + size * size + size] + (flat[base + size * size + size + 1]
+                                                 - flat[base + size * size + size]) * wb
+        c0 = c00 + (c01 - c00) * wg
+        c1 = c10 + (c11 - c10) * wg
+        result = np.clip(linear_to_srgb(c0 + (c1 - c0) * wr), 0.0, 255.0).reshape(shape)
+        if dtype is None:
+            return result
+        return np.rint(result).astype(dtype)
+
+    def apply_pixel(self, r, g, b):
+        """转换单个8位像素, 返回 (r, g, b) 整数元组
+
+        拾色时每次只有一个像素, numpy调用的固定开销比插值本身大得多,
+        因此用纯Python按与 apply 相同的顺序插值。
+        """
+        if self._scalar is None:
+            self._scalar = (self._cell.tolist(), self._weight.tolist(), [tuple(v) for v in self._flat.tolist()])
+        cells, weights, flat = self._scalar
+        size = self.size
+        base = (cells[r][0] * size + cells[g][1]) * size + cells[b][2]
+        wr, wg, wb = weights[r][0], weights[g][1], weights[b][2]
+        result = []
+        for c in range(3):
+            def lerp_b(index):
+                low = flat[index][c]
+                return low + (flat[index + 1][c] - low) * wb
+            c00, c01 = lerp_b(base), lerp_b(base + size)
+            c10, c11 = lerp_b(base + size * size), lerp_b(base + size * size + size)
+            c0 = c00 + (c01 - c00) * wg
+            c1 = c10 + (c11 - c10) * wg
+            linear = c0 + (c1 - c0) * wr
+            encoded = linear * 12.92 if linear <= 0.0031308 else 1.055 * linear ** (1 / 2.4) - 0.055
+            result.append(min(255, max(0, round(encoded * 255.0))))
+        return tuple(result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='将显示器ICC配置文件预编译为到sRGB的三维查找表')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='生成查找表文件')
+    build.add_argument('profile', help='显示器ICC配置文件')
+    build.add_argument('-o', '--output', required=True, help='输出的 .npz 文件')
+    build.add_argument('-n', '--size', type=int, default=DEFAULT_LUT_SIZE, help='每个轴的网格节点数 (默认: 33)')
+    convert = subparsers.add_parser('convert', help='把设备RGB颜色转换为sRGB')
+    convert.add_argument('profile', help='显示器ICC配置文件或查找表文件')
+    convert.add_argument('colors', nargs='+', help='颜色值, 如 "#3366CC" 或 "51, 102, 204"')
+    args = parser.parse_args(argv)
+
+    try:
+        lut = DisplayLUT.load(args.profile, getattr(args, 'size', DEFAULT_LUT_SIZE))
+    except (OSError, ValueError) as e:
+        print(f"无法读取配置文件: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == 'build':
+        lut.save(args.output)
+        print(f"已生成 {lut.size}³ 查找表 ({lut.source.get('method')}): {args.output}", file=sys.stderr)
+        return 0
+
+    for text in args.colors:
+        rgb = parse_rgb_value(text)
+        if rgb is None:
+            print(f"无法解析颜色: {text}", file=sys.stderr)
+            return 1
+        converted = lut.apply_pixel(*rgb)
+        print(json.dumps({'input': text, 'device': list(rgb), 'srgb': list(converted),
+                          'hex': '#%02X%02X%02X' % converted}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
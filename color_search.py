@@ -0,0 +1,202 @@
+"""按名称和编号搜索颜色
+
+从各数据库的颜色建立三种索引, 每次查询依次使用:
+    精确    规范化后的编号、名称或拼音/罗马字完全相同 ("RAL 3020"、"ral3020"、"GB-01-01"、
+            "朱红"、"zhuhong"、"zh")
+    前缀    字典树, 每个节点保存经过它的颜色 (按匹配文本的长度排序), 输入几个字即可补全
+    模糊    以字符二元组 (单字查询为单字) 建立倒排索引, 按 Jaccard 相似度排序,
+            允许错字、漏字和中间的片段 ("alicebleu"、"红" 找到 "朱红")
+规范化规则与 color_parser 相同: 忽略大小写、空格、连字符和下划线。拼音和罗马字键
+(见 transliteration) 和其他语言的名称 (见 color_locale, 如 "aliceblue") 与名称一样进入三种索引,
+优先使用编译后调色板中预先生成的键和合并结果。
+
+用法:
+    index = ColorSearchIndex(finder)
+    index.search('朱红', limit=10)   # [{'database', 'code', 'name', 'rgb', 'hex', 'match', 'score'}, ...]
+
+    python color_search.py 朱红 -n 10
+    python color_search.py 3020 -d ral
+"""
+import argparse
+import json
+import sys
+import time
+
+from color_core import DATABASES, ColorNameFinder, split_color_code
+from color_locale import alias_names
+from color_parser import entry_keys, normalize_key
+from transliteration import transliteration_keys
+
+# 模糊匹配的最低 Jaccard 相似度
+FUZZY_THRESHOLD = 0.3
+# 二元组的首尾标记, 使开头和结尾相同的文本得分更高
+_START, _END = '\x02', '\x03'
+
+
+def key_grams(key):
+    """文本的字符二元组集合, 带首尾标记; 单字文本只有它本身"""
+    if len(key) == 1:
+        return {key}
+    padded = _START + key + _END
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class ColorSearchIndex:
+    """所有数据库颜色的搜索索引, 建立后只读
+
+    palettes 为 CompiledPalettes 时从中读取拼音/罗马字键和其他语言的名称, 否则由读音表逐个生成、
+    读取英文数据库合并。结果中的名称为 finder 当前语言的名称。
+    """
+    def __init__(self, finder=None, databases=None, palettes=None):
+        finder = finder or ColorNameFinder()
+        # 每个颜色为 (数据库, 编号, 名称, (r, g, b)), 顺序同 DATABASES
+        self.entries = []
+        self._exact = {}
+        for database in databases or DATABASES:
+            transliterated = {}
+            if palettes is not None and database in palettes.databases:
+                transliterated = palettes.transliterations(database)
+            aliases = alias_names(finder, database, palettes)
+            for code, name, rgb in finder.iter_color_entries(database):
+                entry_id = len(self.entries)
+                self.entries.append((database, code, name, rgb))
+                texts = transliterated.get(name)
+                if texts is None:
+                    texts = transliteration_keys(database, name)
+                texts = [text for text, _ in entry_keys(code, name)] + texts
+                for alias in aliases.get(rgb, ()):
+                    texts += [text for text, _ in entry_keys(split_color_code(alias)[0], alias)]
+                    texts += transliterated.get(alias, [])
+                for text in texts:
+                    key = normalize_key(text)
+                    if key:
+                        ids = self._exact.setdefault(key, [])
+                        if entry_id not in ids:
+                            ids.append(entry_id)
+        self.keys = list(self._exact)
+        self._build_trie()
+        self._build_grams()
+
+    def _build_trie(self):
+        # 节点为 [子节点字典, [(最短匹配文本长度, 颜色下标)]]; 建立时先记录 {颜色: 最短匹配文本长度}
+        self._trie = root = [{}, {}]
+        nodes = [root]
+        for key in self.keys:
+            ids = self._exact[key]
+            node = root
+            for char in key:
+                child = node[0].get(char)
+                if child is None:
+                    child = node[0][char] = [{}, {}]
+                    nodes.append(child)
+                node = child
+                for entry_id in ids:
+                    if len(key) < node[1].get(entry_id, len(key) + 1):
+                        node[1][entry_id] = len(key)
+        for node in nodes:
+            node[1] = sorted((length, entry_id) for entry_id, length in node[1].items())
+
+    def _build_grams(self):
+        self._gram_counts = []
+        self._grams = {}
+        for key_id, key in enumerate(self.keys):
+            grams = key_grams(key)
+            self._gram_counts.append(len(grams))
+            # 单字查询需要找到包含该字的所有文本
+            grams = grams | set(key)
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(key_id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def prefix(self, key):
+        """以规范化文本 key 开头的 [(最短匹配文本长度, 颜色下标)], 按长度排序"""
+        node = self._trie
+        for char in key:
+            node = node[0].get(char)
+            if node is None:
+                return []
+        return node[1]
+
+    def fuzzy(self, key):
+        """与规范化文本 key 相似的 [(相似度, 颜色下标)], 按相似度从高到低排序"""
+        grams = key_grams(key)
+        counts = {}
+        for gram in grams:
+            for key_id in self._grams.get(gram, ()):
+                counts[key_id] = counts.get(key_id, 0) + 1
+        scored = []
+        for key_id, shared in counts.items():
+            if len(key) == 1:
+                # 单字查询: 包含该字的文本越短越相似
+                score = 1 / len(self.keys[key_id])
+            else:
+                score = shared / (len(grams) + self._gram_counts[key_id] - shared)
+                if score < FUZZY_THRESHOLD:
+                    continue
+            scored.append((-score, len(self.keys[key_id]), key_id))
+        scored.sort()
+        return [(-score, entry_id) for score, _, key_id in scored for entry_id in self._exact[self.keys[key_id]]]
+
+    def search(self, query, limit=20, databases=None):
+        """搜索颜色, 返回最多 limit 个结果
+
+        依次为精确匹配、前缀匹配和模糊匹配, 同一颜色只出现一次。每个结果为
+        {'database', 'code', 'name', 'rgb', 'hex', 'match', 'score'}, match 为
+        'exact'、'prefix' 或 'fuzzy'。databases 限定搜索的数据库。
+        """
+        key = normalize_key(query)
+        if not key or limit <= 0:
+            return []
+        results = []
+        seen = set()
+
+        def add(entry_id, match, score):
+            if entry_id in seen or (databases and self.entries[entry_id][0] not in databases):
+                return False
+            seen.add(entry_id)
+            results.append(self.entry(entry_id, match, score))
+            return len(results) >= limit
+
+        for entry_id in self._exact.get(key, ()):
+            if add(entry_id, 'exact', 1.0):
+                return results
+        for length, entry_id in self.prefix(key):
+            if add(entry_id, 'prefix', len(key) / length):
+                return results
+        for score, entry_id in self.fuzzy(key):
+            if add(entry_id, 'fuzzy', score):
+                return results
+        return results
+
+    def entry(self, entry_id, match=None, score=None):
+        """颜色的结果字典; 不是搜索结果时 match 和 score 为 None"""
+        database, code, name, rgb = self.entries[entry_id]
+        return {'database': database, 'code': code, 'name': name, 'rgb': list(rgb),
+                'hex': '#%02X%02X%02X' % rgb, 'match': match,
+                'score': round(score, 3) if score is not None else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按名称或编号搜索颜色')
+    parser.add_argument('query', help='颜色名称、编号或其中一部分')
+    parser.add_argument('-d', '--database', action='append', choices=list(DATABASES),
+                        help='只搜索指定数据库, 可重复指定')
+    parser.add_argument('-n', '--limit', type=int, default=20, help='最多返回的结果数 (默认: 20)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = ColorSearchIndex()
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    results = index.search(args.query, args.limit, args.database)
+    print(f"索引 {len(index)} 个颜色 ({build_time * 1e3:.0f} ms), 查询 {(time.perf_counter() - start) * 1e3:.2f} ms",
+          file=sys.stderr)
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""本地颜色命名HTTP服务
+
+基于标准库 http.server, 使用HTTP/1.1长连接。颜色数据库在启动时加载一次,
+所有请求线程共享同一个 ColorNameFinder, 查询结果带LRU缓存。
+
+接口:
+    GET  /health                       服务状态
+    GET  /databases                    可用数据库和距离度量
+    GET  /name?color=%23FF0000&database=all&metric=rgb
+    POST /name/batch  {"colors": ["#FF0000", [0, 128, 255]], "database": "ral", "metric": "lab"}
+    GET  /stats                        请求计数和缓存命中情况
+
+用法:
+    python color_server.py --port 8765
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from color_core import DATABASES, METRICS, ColorNameFinder, parse_rgb_value
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_SIZE = 100000
+
+
+class LookupCache:
+    """线程安全的LRU缓存, 键为 (rgb, 数据库, 度量)"""
+    def __init__(self, finder, max_size=65536):
+        self.finder = finder
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, rgb, database, metric):
+        key = (rgb, database, metric)
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        name, distance = self.finder.find_closest_color(rgb, database, metric)
+        r, g, b = rgb
+        result = {'rgb': [r, g, b], 'hex': f"#{r:02x}{g:02x}{b:02x}".upper(),
+                  'name': name, 'distance': round(distance, 4) if isinstance(distance, float) else distance}
+        with self.lock:
+            self.entries[key] = result
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        with self.lock:
+            return {'size': len(self.entries), 'max_size': self.max_size,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+class RequestError(Exception):
+    """请求参数错误, 返回给客户端的HTTP状态码保存在 status 中"""
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class ColorRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 默认保持连接, 每个响应都必须带 Content-Length
+    protocol_version = 'HTTP/1.1'
+    # 响应头和响应体分两次写出, 关闭Nagle算法避免长连接上约40ms的延迟确认等待
+    disable_nagle_algorithm = True
+    server_version = 'ColorNameFinder/2.0.6'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        routes = {
+            '/health': self.handle_health,
+            '/databases': self.handle_databases,
+            '/stats': self.handle_stats,
+            '/name': self.handle_name,
+        }
+        self.dispatch(routes.get(url.path), query)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        routes = {
+            '/name': self.handle_name,
+            '/name/batch': self.handle_batch,
+        }
+        handler = routes.get(url.path)
+        if handler is None:
+            # 未读取的请求体会破坏长连接, 直接关闭
+            self.close_connection = True
+        self.dispatch(handler, None)
+
+    def dispatch(self, handler, query):
+        self.server.count_request()
+        try:
+            if handler is None:
+                raise RequestError("未知接口", 404)
+            if query is None:
+                query = self.read_json_body()
+            self.send_json(200, handler(query))
+        except RequestError as e:
+            self.send_json(e.status, {'error': str(e)})
+        except Exception as e:
+            self.send_json(500, {'error': f"服务器内部错误: {e}"})
+
+    def read_json_body(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise RequestError("请求体长度无效", 413 if length > 0 else 400)
+        body = self.rfile.read(length) if length else b''
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise RequestError("请求体不是有效的JSON")
+        if not isinstance(data, dict):
+            raise RequestError("请求体必须是JSON对象")
+        return data
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def lookup_options(self, query):
+        database = query.get('database', 'all')
+        metric = query.get('metric', 'rgb')
+        if database != 'all' and database not in DATABASES:
+            raise RequestError(f"未知数据库: {database}")
+        if metric not in METRICS:
+            raise RequestError(f"未知距离度量: {metric}")
+        return database, metric
+
+    def handle_health(self, query):
+        return {'status': 'ok', 'uptime': round(time.time() - self.server.started, 3)}
+
+    def handle_databases(self, query):
+        return {'databases': ['all'] + list(DATABASES), 'metrics': list(METRICS)}
+
+    def handle_stats(self, query):
+        return {'requests': self.server.request_count, 'cache': self.server.cache.stats()}
+
+    def handle_name(self, query):
+        database, metric = self.lookup_options(query)
+        rgb = parse_rgb_value(query.get('color'))
+        if rgb is None:
+            raise RequestError(f"无法解析颜色: {query.get('color')}")
+        result = dict(self.server.cache.lookup(rgb, database, metric))
+        result['database'] = database
+        return result
+
+    def handle_batch(self, query):
+        database, metric = self.lookup_options(query)
+        colors = query.get('colors')
+        if not isinstance(colors, list):
+            raise RequestError("colors 必须是数组")
+        if len(colors) > MAX_BATCH_SIZE:
+            raise RequestError(f"单次最多查询 {MAX_BATCH_SIZE} 种颜色", 413)
+
+        results = []
+        lookup = self.server.cache.lookup
+        for color in colors:
+            rgb = parse_rgb_value(color)
+            if rgb is None:
+                results.append({'input': color, 'error': "无法解析颜色"})
+            else:
+                results.append(lookup(rgb, database, metric))
+        return {'database': database, 'metric': metric, 'results': results}
+
+
+class ColorNameServer(ThreadingHTTPServer):
+    """共享一个 ColorNameFinder 和查询缓存的多线程HTTP服务"""
+    daemon_threads = True
+
+    def __init__(self, address, finder=None, cache_size=65536, verbose=False):
+        super().__init__(address, ColorRequestHandler)
+        self.finder = finder or ColorNameFinder(preload=True)
+        self.cache = LookupCache(self.finder, cache_size)
+        self.verbose = verbose
+        self.started = time.time()
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        # 预先为所有数据库和度量建立最近色索引, 避免第一个请求承担建立k-d树的开销
+        for database in ['all'] + list(DATABASES):
+            for metric in METRICS:
+                self.finder.get_palette_index(database, metric)
+
+    def count_request(self):
+        with self._count_lock:
+            self.request_count += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='本地颜色命名HTTP服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口 (默认: 8765)')
+    parser.add_argument('--cache-size', type=int, default=65536, help='查询缓存条目数 (默认: 65536)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='输出每个请求的日志')
+    args = parser.parse_args(argv)
+
+    server = ColorNameServer((args.host, args.port), cache_size=args.cache_size, verbose=args.verbose)
+    print(f"颜色命名服务已启动: http://{args.host}:{server.server_address[1]}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""颜色时间线分析
+
+逐帧读取视频、图片序列或屏幕画面, 统计若干固定区域的平均色并命名,
+只在区域的颜色名称发生变化时输出一条事件, 得到压缩后的颜色时间线,
+用于播出画面质检等场景。
+
+- 图片序列: 目录或通配符, 按文件名排序逐帧读取 (只需PIL);
+- 视频文件: 通过系统中的 ffmpeg 解码为原始RGB数据流, 帧缓冲区重复使用;
+- 屏幕画面: 输入写 screen, 按 --fps 定时截取包含所有区域的屏幕范围;
+  指定 --display-profile 时先按显示器ICC配置文件转换到sRGB。
+
+各帧的区域平均色先写入预先分配的批次缓冲区, 每凑满一批统一做一次最近色查询。
+
+用法:
+    python color_timeline.py frames/ -r logo:20,20,64,32 -r sky:0,0,1920,200 -d ral --fps 25
+    python color_timeline.py clip.mp4 -r bug:1800,40,80,80 --min-frames 5 -o events.jsonl
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from color_core import DATABASES, METRICS, ColorNameFinder
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp', '.ppm')
+DEFAULT_BATCH_SIZE = 64
+
+
+def parse_region(text):
+    """解析 "名称:x,y,宽,高" 格式的区域, 名称可省略"""
+    name, _, geometry = text.rpartition(':')
+    try:
+        x, y, width, height = (int(v) for v in geometry.split(','))
+    except ValueError:
+        raise ValueError(f"无法解析区域: {text}")
+    if width <= 0 or height <= 0 or x < 0 or y < 0:
+        raise ValueError(f"区域尺寸无效: {text}")
+    return name or f"{x},{y},{width},{height}", (x, y, width, height)
+
+
+def iter_image_sequence(source):
+    """按文件名顺序逐帧读取图片序列, source 为目录或通配符"""
+    from PIL import Image
+
+    if os.path.isdir(source):
+        paths = sorted(os.path.join(source, name) for name in os.listdir(source)
+                       if name.lower().endswith(IMAGE_EXTENSIONS))
+    else:
+        paths = sorted(glob.glob(source))
+    if not paths:
+        raise ValueError(f"没有找到图片: {source}")
+    for path in paths:
+        with Image.open(path) as image:
+            yield np.asarray(image.convert('RGB'), dtype=np.uint8)
+
+
+def missing_video_tools():
+    """读取视频文件所需但系统中没有安装的程序列表"""
+    return [tool for tool in ('ffprobe', 'ffmpeg') if shutil.which(tool) is None]
+
+
+def probe_video(path):
+    """用 ffprobe 读取视频的 (宽, 高, 帧率)"""
+    if shutil.which('ffprobe') is None:
+        raise RuntimeError("读取视频文件需要系统中安装 ffmpeg (包括 ffprobe), 也可以先导出为图片序列")
+    output = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-of', 'json',
+         '-show_entries', 'stream=width,height,avg_frame_rate', path],
+        check=True, capture_output=True).stdout
+    stream = json.loads(output)['streams'][0]
+    numerator, _, denominator = stream.get('avg_frame_rate', '0/1').partition('/')
+    fps = float(numerator) / float(denominator or 1) if float(denominator or 1) else 0.0
+    return int(stream['width']), int(stream['height']), fps
+
+
+def iter_video_frames(path, width, height):
+    """通过 ffmpeg 逐帧解码视频
+
+    所有帧共用同一个缓冲区, 产出的数组在取下一帧后即被覆盖, 调用方不应保留。
+    """
+    if shutil.which('ffmpeg') is None:
+        raise RuntimeError("读取视频文件需要系统中安装 ffmpeg, 也可以先导出为图片序列")
+    process = subprocess.Popen(
+        ['ffmpeg', '-v', 'error', '-i', path, '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'],
+        stdout=subprocess.PIPE)
+    buffer = bytearray(width * height * 3)
+    view = memoryview(buffer)
+    frame = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+    try:
+        while True:
+            filled = 0
+            while filled < len(buffer):
+                count = process.stdout.readinto(view[filled:])
+                if not count:
+                    return
+                filled += count
+            yield frame
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+
+
+def iter_screen_frames(bbox, fps, duration=None):
+    """按固定帧率截取屏幕范围 bbox=(左, 上, 右, 下), duration 为秒数, None 表示一直截取"""
+    from PIL import ImageGrab
+
+    interval = 1.0 / fps
+    start = time.perf_counter()
+    next_time = start
+    while duration is None or next_time - start < duration:
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        yield np.asarray(ImageGrab.grab(bbox).convert('RGB'), dtype=np.uint8)
+        next_time += interval
+
+
+class TimelineAnalyzer:
+    """统计各区域逐帧的平均色, 在颜色名称变化时产生事件
+
+    min_frames 大于1时, 新颜色需要连续保持这么多帧才算一次变化, 用于过滤闪烁和转场。
+    区域坐标相对于送入的帧; 屏幕截取时需先减去截取范围的左上角。
+    """
+    def __init__(self, regions, finder=None, database='all', metric='rgb', fps=25.0,
+                 batch_size=DEFAULT_BATCH_SIZE, min_frames=1):
+        self.finder = finder or ColorNameFinder()
+        self.regions = list(regions)
+        self.database = database
+        self.metric = metric
+        self.fps = fps
+        self.min_frames = max(1, min_frames)
+        self.names, _ = self.finder.get_palette_arrays(database, metric)
+        if not self.names:
+            raise ValueError(f"数据库为空: {database}")
+        # 每批各区域平均色的缓冲区, 整个分析过程中重复使用
+        self.means = np.empty((batch_size, len(self.regions), 3), dtype=np.float64)
+        self.pending = 0
+        self.frame_count = 0
+        self.current = [None] * len(self.regions)      # 各区域当前颜色下标
+        self.candidate = [None] * len(self.regions)    # (候选下标, 起始帧, 已持续帧数, RGB)
+        self.segments = [0] * len(self.regions)
+
+    def feed(self, frame):
+        """送入一帧, 返回因批次已满而产生的事件列表"""
+        height, width = frame.shape[:2]
+        row = self.means[self.pending]
+        for i, (_, (x, y, w, h)) in enumerate(self.regions):
+            if x + w > width or y + h > height:
+                raise ValueError(f"区域 {self.regions[i][0]} 超出画面范围 {width}×{height}")
+            np.mean(frame[y:y + h, x:x + w], axis=(0, 1), out=row[i])
+        self.pending += 1
+        if self.pending == len(self.means):
+            return self.flush()
+        return []
+
+    def flush(self):
+        """为缓冲区中的所有帧批量命名, 返回其中的变化事件"""
+        count = self.pending
+        if not count:
+            return []
+        rgb = np.rint(self.means[:count]).astype(np.int32).reshape(-1, 3)
+        indices, _ = self.finder.find_closest_indices(rgb, self.database, self.metric)
+        indices = indices.reshape(count, len(self.regions))
+        rgb = rgb.reshape(count, len(self.regions), 3)
+
+        events = []
+        for offset in range(count):
+            frame_index = self.frame_count + offset
+            for region, index in enumerate(indices[offset].tolist()):
+                event = self._update(region, int(index), frame_index, rgb[offset, region])
+                if event is not None:
+                    events.append(event)
+        self.frame_count += count
+        self.pending = 0
+        return events
+
+    def _update(self, region, index, frame_index, rgb):
+        if index == self.current[region]:
+            self.candidate[region] = None
+            return None
+        candidate = self.candidate[region]
+        if candidate is None or candidate[0] != index:
+            candidate = (index, frame_index, 1, tuple(int(v) for v in rgb))
+        else:
+            candidate = (index, candidate[1], candidate[2] + 1, candidate[3])
+        self.candidate[region] = candidate
+        if candidate[2] < self.min_frames:
+            return None
+
+        previous = self.current[region]
+        self.current[region] = index
+        self.candidate[region] = None
+        self.segments[region] += 1
+        start_frame, color = candidate[1], candidate[3]
+        return {
+            'region': self.regions[region][0],
+            'frame': start_frame,
+            'time': round(start_frame / self.fps, 3) if self.fps else None,
+            'name': self.names[index],
+            'previous': self.names[previous] if previous is not None else None,
+            'rgb': list(color),
+            'hex': '#%02X%02X%02X' % color,
+        }
+
+    def finish(self):
+        """处理剩余帧, 返回 (事件列表, 各区域的统计)"""
+        events = self.flush()
+        summary = [{'region': name, 'frames': self.frame_count, 'segments': segments,
+                    'final': self.names[current] if current is not None else None}
+                   for (name, _), segments, current in zip(self.regions, self.segments, self.current)]
+        return events, summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='统计视频或图片序列中固定区域的颜色变化')
+    parser.add_argument('source', help='图片目录、通配符、视频文件, 或 screen 表示截取屏幕')
+    parser.add_argument('-r', '--region', action='append', required=True,
+                        help='区域, 格式为 名称:x,y,宽,高, 可重复指定')
+    parser.add_argument('-d', '--database', default='all', choices=['all'] + list(DATABASES),
+                        help='标准色数据库 (默认: all)')
+    parser.add_argument('-m', '--metric', default='rgb', choices=METRICS, help='颜色距离度量 (默认: rgb)')
+    parser.add_argument('--fps', type=float, default=None,
+                        help='帧率, 用于计算事件时间 (视频默认读取文件帧率, 其他默认25)')
+    parser.add_argument('--duration', type=float, default=None, help='截取屏幕的秒数 (默认一直截取)')
+    parser.add_argument('--min-frames', type=int, default=1, help='新颜色至少持续的帧数 (默认: 1)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='每批命名的帧数')
+    parser.add_argument('--display-profile', help='截取屏幕时使用的显示器ICC配置文件或查找表 (.npz)')
+    parser.add_argument('-o', '--output', help='事件输出文件 (JSONL, 默认输出到标准输出)')
+    args = parser.parse_args(argv)
+
+    try:
+        regions = [parse_region(text) for text in args.region]
+    except ValueError as e:
+        parser.error(str(e))
+
+    fps = args.fps
+    if args.source == 'screen':
+        fps = fps or 25.0
+        left = min(x for _, (x, _, _, _) in regions)
+        top = min(y for _, (_, y, _, _) in regions)
+        right = max(x + w for _, (x, _, w, _) in regions)
+        bottom = max(y + h for _, (_, y, _, h) in regions)
+        regions = [(name, (x - left, y - top, w, h)) for name, (x, y, w, h) in regions]
+        frames = iter_screen_frames((left, top, right, bottom), fps, args.duration)
+        if args.display_profile:
+            from color_profile import DisplayLUT
+
+            try:
+                lut = DisplayLUT.load(args.display_profile)
+            except (OSError, ValueError) as e:
+                parser.error(f"无法读取颜色配置文件: {e}")
+            frames = (lut.apply(frame) for frame in frames)
+    elif os.path.isfile(args.source) and not args.source.lower().endswith(IMAGE_EXTENSIONS):
+        missing = missing_video_tools()
+        if missing:
+            parser.error(f"读取视频文件需要系统中安装 ffmpeg (缺少 {', '.join(missing)}), 也可以先导出为图片序列")
+        try:
+            width, height, video_fps = probe_video(args.source)
+        except (subprocess.CalledProcessError, ValueError, KeyError, IndexError) as e:
+            parser.error(f"无法读取视频 {args.source}: {e}")
+        fps = fps or video_fps or 25.0
+        frames = iter_video_frames(args.source, width, height)
+    else:
+        fps = fps or 25.0
+        frames = iter_image_sequence(args.source)
+
+    analyzer = TimelineAnalyzer(regions, database=args.database, metric=args.metric, fps=fps,
+                                batch_size=args.batch_size, min_frames=args.min_frames)
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        for frame in frames:
+            for event in analyzer.feed(frame):
+                output.write(json.dumps(event, ensure_ascii=False) + '\n')
+        events, summary = analyzer.finish()
+        for event in events:
+            output.write(json.dumps(event, ensure_ascii=False) + '\n')
+    except KeyboardInterrupt:
+        events, summary = analyzer.finish()
+        for event in events:
+            output.write(json.dumps(event, ensure_ascii=False) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"共 {analyzer.frame_count} 帧, 用时 {elapsed:.2f} 秒 "
+          f"({analyzer.frame_count / elapsed if elapsed else 0:.1f} 帧/秒)", file=sys.stderr)
+    for item in summary:
+        print(f"  {item['region']}: {item['segments']} 段, 最终 {item['final']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""编译后的调色板文件
+
+将各颜色数据库和由它们派生的数据预先计算好, 保存在一个 .npz 文件中,
+之后只需读入数组即可查询, 不必再解析JSON或逐条计算距离。
+
+文件内容:
+    meta                            JSON: 格式版本、源文件摘要、对照表的k值
+    {db}_rgb                        (n, 3) uint8, 顺序与 get_color_table 一致
+    {db}_names, {db}_names_offsets  UTF-8 编码的名称及每个名称的结束偏移
+    {db}_translit, {db}_translit_offsets  每个名称的拼音/罗马字查找键, 以空格分隔 (见 transliteration);
+                                    先是 {db}_names 中的名称, 之后是 {db}_translit_extra 中的名称
+    {db}_translit_extra, ..._offsets  不在名称表中的其他名称 (GB标准中RGB相同的颜色)
+    {db}_locale_rgb                 (m, 3) uint8, 中英文合并后的记录 (见 color_locale)
+    {db}_locale_{语言}, ..._offsets  每条记录在该语言中的名称, 没有时为空字符串
+    xref_{src}_{dst}_index          (n_src, k) uint16, dst 中最接近的k个颜色的下标
+    xref_{src}_{dst}_delta_e        (n_src, k) uint16, 对应的 ΔE76 × 100
+
+源数据库文件、英文数据库或读音表变化后摘要不再匹配, load() 会自动重新编译。
+
+用法:
+    python compiled_palette.py build
+    python compiled_palette.py lookup -d pantone "PANTONE 18-1664 Scarlet (2019)" -t ral -t ncs
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from color_core import (DATABASES, DEFAULT_LOCALE, LOCALES, ColorNameFinder, nearest_palette_k, parse_rgb_value,
+                        rgb_array_to_lab)
+from color_locale import ENGLISH_DIRECTORY, ENGLISH_FILES, locale_table, merge_records
+from transliteration import TABLE_PATH, transliteration_keys
+
+FORMAT_VERSION = 4
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'compiled_palettes.npz')
+CROSS_REFERENCE_K = 5
+# ΔE 以 0.01 为单位保存为 uint16
+DELTA_E_SCALE = 100
+
+
+def source_digest():
+    """所有数据库源文件、英文数据库和读音表内容的摘要, 用于判断编译结果是否过期"""
+    digest = hashlib.sha1(str(FORMAT_VERSION).encode('ascii'))
+    directory = os.path.dirname(os.path.abspath(__file__))
+    sources = [(key, os.path.join(directory, filename)) for key, (_, _, filename) in DATABASES.items()]
+    sources += [(f'{key}_eng', os.path.join(ENGLISH_DIRECTORY, filename)) for key, filename in ENGLISH_FILES.items()]
+    for key, path in sources + [('transliteration', TABLE_PATH)]:
+        digest.update(key.encode('ascii'))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def pack_strings(strings):
+    """将字符串列表编码为 (uint8 数据, uint32 结束偏移)"""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.cumsum([len(b) for b in encoded], dtype=np.uint32) if encoded else np.zeros(0, np.uint32)
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def unpack_strings(data, offsets):
+    raw = data.tobytes()
+    starts = [0] + offsets[:-1].tolist()
+    return [raw[start:end].decode('utf-8') for start, end in zip(starts, offsets.tolist())]
+
+
+def compile_palettes(finder=None, path=DEFAULT_PATH, k=CROSS_REFERENCE_K):
+    """编译所有数据库并写入 path, 返回 CompiledPalettes"""
+    finder = finder or ColorNameFinder()
+    arrays = {}
+    labs = {}
+    databases = []
+    for database in DATABASES:
+        # 始终编译数据库文件中的原始名称, 与 finder 当前的语言无关
+        table = finder.get_database(database, original=True)
+        if not table:
+            continue
+        if len(table) > np.iinfo(np.uint16).max:
+            raise ValueError(f"数据库 {database} 颜色过多, 无法使用16位下标")
+        databases.append(database)
+        rgb = np.array(list(table.keys()), dtype=np.uint8)
+        arrays[f'{database}_rgb'] = rgb
+        arrays[f'{database}_names'], arrays[f'{database}_names_offsets'] = pack_strings(list(table.values()))
+        names = set(table.values())
+        extra = list(dict.fromkeys(name for _, name, _ in finder.iter_color_entries(database, original=True)
+                                   if name not in names))
+        arrays[f'{database}_translit_extra'], arrays[f'{database}_translit_extra_offsets'] = pack_strings(extra)
+        arrays[f'{database}_translit'], arrays[f'{database}_translit_offsets'] = pack_strings(
+            [' '.join(transliteration_keys(database, name)) for name in list(table.values()) + extra])
+        records = merge_records(finder, database)
+        arrays[f'{database}_locale_rgb'] = np.array([rgb for rgb, _ in records], dtype=np.uint8).reshape(-1, 3)
+        for locale in LOCALES:
+            arrays[f'{database}_locale_{locale}'], arrays[f'{database}_locale_{locale}_offsets'] = pack_strings(
+                [names[locale] for _, names in records])
+        labs[database] = rgb_array_to_lab(rgb.astype(np.int32))
+
+    for source in databases:
+        for target in databases:
+            if source == target:
+                continue
+            indices, squared = nearest_palette_k(labs[source], labs[target], k)
+            delta_e = np.rint(np.sqrt(squared) * DELTA_E_SCALE)
+            arrays[f'xref_{source}_{target}_index'] = indices.astype(np.uint16)
+            arrays[f'xref_{source}_{target}_delta_e'] = np.minimum(delta_e, np.iinfo(np.uint16).max).astype(np.uint16)
+
+    meta = {'version': FORMAT_VERSION, 'digest': source_digest(), 'databases': databases, 'k': k,
+            'locales': list(LOCALES)}
+    arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+    # 先写临时文件再替换, 避免其他进程读到写了一半的文件
+    temp_path = path + '.part.npz'
+    np.savez(temp_path, **arrays)
+    os.replace(temp_path, path)
+    return CompiledPalettes(arrays)
+
+
+class CompiledPalettes:
+    """读入内存的编译结果, 提供标准色之间的即时对照查询"""
+    def __init__(self, arrays):
+        self.meta = json.loads(bytes(arrays['meta']).decode('utf-8'))
+        self.databases = list(self.meta['databases'])
+        self.k = self.meta['k']
+        self.arrays = arrays
+        self._names = {}
+        self._index = {}
+        self._locale_tables = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, finder=None, rebuild=True):
+        """读取编译结果; 文件不存在或已过期时重新编译 (rebuild=False 时抛出 ValueError)"""
+        if os.path.exists(path):
+            with np.load(path) as data:
+                arrays = {key: data[key] for key in data.files}
+            palettes = cls(arrays)
+            if palettes.meta.get('version') == FORMAT_VERSION and palettes.meta.get('digest') == source_digest():
+                return palettes
+        if not rebuild:
+            raise ValueError(f"编译后的调色板不存在或已过期: {path}")
+        return compile_palettes(finder, path)
+
+    def names(self, database):
+        names = self._names.get(database)
+        if names is None:
+            names = self._names[database] = unpack_strings(self.arrays[f'{database}_names'],
+                                                           self.arrays[f'{database}_names_offsets'])
+        return names
+
+    def transliterations(self, database):
+        """{名称: 拼音/罗马字查找键列表}, 包括 iter_color_entries 产出的所有原始名称"""
+        keys = unpack_strings(self.arrays[f'{database}_translit'], self.arrays[f'{database}_translit_offsets'])
+        extra = unpack_strings(self.arrays[f'{database}_translit_extra'],
+                               self.arrays[f'{database}_translit_extra_offsets'])
+        return {name: text.split() for name, text in zip(self.names(database) + extra, keys)}
+
+    def locale_records(self, database):
+        """中英文合并后的 [((r, g, b), {语言: 名称})], 见 color_locale.merge_records"""
+        rgb = [tuple(color) for color in self.arrays[f'{database}_locale_rgb'].tolist()]
+        names = {locale: unpack_strings(self.arrays[f'{database}_locale_{locale}'],
+                                        self.arrays[f'{database}_locale_{locale}_offsets'])
+                 for locale in self.meta['locales']}
+        return [(color, {locale: names[locale][i] for locale in names}) for i, color in enumerate(rgb)]
+
+    def locale_tables(self, locale):
+        """{数据库: {(r, g, b): 名称}}, 用于 ColorNameFinder.set_locale; 只包含名称与原始表不同的数据库"""
+        tables = self._locale_tables.get(locale)
+        if tables is None:
+            tables = {}
+            if locale != DEFAULT_LOCALE:
+                for database in self.databases:
+                    table = locale_table(self.locale_records(database), locale)
+                    if table != dict(zip(map(tuple, self.rgb(database).tolist()), self.names(database))):
+                        tables[database] = table
+            self._locale_tables[locale] = tables
+        return tables
+
+    def rgb(self, database):
+        return self.arrays[f'{database}_rgb']
+
+    def index_of(self, database, entry):
+        """按名称或RGB值查找颜色在数据库中的下标, 找不到时返回 None"""
+        if database not in self.databases:
+            return None
+        index = self._index.get(database)
+        if index is None:
+            index = {}
+            for i, (name, rgb) in enumerate(zip(self.names(database), self.rgb(database).tolist())):
+                index.setdefault(name, i)
+                index.setdefault(tuple(rgb), i)
+            self._index[database] = index
+        if isinstance(entry, str):
+            found = index.get(entry)
+            if found is not None:
+                return found
+            entry = parse_rgb_value(entry)
+        return index.get(tuple(entry)) if entry is not None else None
+
+    def entry(self, database, index):
+        rgb = tuple(self.rgb(database)[index].tolist())
+        return {'database': database, 'name': self.names(database)[index], 'rgb': list(rgb),
+                'hex': '#%02X%02X%02X' % rgb}
+
+    def equivalents(self, database, entry, targets=None, k=None):
+        """查找数据库中某个颜色在其他数据库中最接近的k个颜色
+
+        entry 为名称、RGB元组或颜色字符串。返回 {目标数据库: [{'name', 'rgb', 'hex', 'delta_e'}]},
+        找不到 entry 时返回 None。
+        """
+        index = self.index_of(database, entry)
+        if index is None:
+            return None
+        k = min(k or self.k, self.k)
+        result = {}
+        for target in targets or self.databases:
+            if target == database or target not in self.databases:
+                continue
+            indices = self.arrays[f'xref_{database}_{target}_index'][index, :k].tolist()
+            delta_e = self.arrays[f'xref_{database}_{target}_delta_e'][index, :k].tolist()
+            result[target] = [dict(self.entry(target, i), delta_e=d / DELTA_E_SCALE)
+                              for i, d in zip(indices, delta_e)]
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='编译颜色数据库并查询标准色对照')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='重新编译调色板文件')
+    build.add_argument('-k', type=int, default=CROSS_REFERENCE_K, help='每个颜色保存的对照数量')
+    build.add_argument('-o', '--output', default=DEFAULT_PATH, help='输出文件')
+    lookup = subparsers.add_parser('lookup', help='查询某个颜色在其他标准中的对应颜色')
+    lookup.add_argument('entry', help='颜色名称或RGB/HEX值')
+    lookup.add_argument('-d', '--database', required=True, choices=list(DATABASES), help='颜色所在的数据库')
+    lookup.add_argument('-t', '--target', action='append', choices=list(DATABASES), help='目标数据库, 可重复指定')
+    lookup.add_argument('-k', type=int, default=None, help='每个目标数据库返回的数量')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        palettes = compile_palettes(path=args.output, k=args.k)
+        print(f"已编译 {len(palettes.databases)} 个数据库到 {args.output}, "
+              f"{os.path.getsize(args.output) / 1024:.0f} KB, 用时 {time.perf_counter() - start:.2f} 秒",
+              file=sys.stderr)
+        return 0
+
+    palettes = CompiledPalettes.load()
+    result = palettes.equivalents(args.database, args.entry, args.target, args.k)
+    if result is None:
+        print(f"数据库 {args.database} 中没有找到: {args.entry}", file=sys.stderr)
+        return 1
+    index = palettes.index_of(args.database, args.entry)
+    print(json.dumps({'source': palettes.entry(args.database, index), 'equivalents': result},
+                     ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
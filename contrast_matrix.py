@@ -0,0 +1,103 @@
+"""WCAG对比度矩阵
+
+对一组颜色(如收藏夹)计算两两之间的WCAG 2.x对比度。每个颜色的相对亮度只计算一次,
+完整的 n×n 矩阵通过numpy广播得到。ContrastMatrix 在颜色列表不变时复用上次的结果。
+
+线性化阈值使用sRGB标准的0.04045 (WCAG 2.2 的更正值), 与0.03928的旧值在8位输入上结果相同。
+
+用法:
+    python contrast_matrix.py "#FFFFFF" "#767676" "#000000" -o contrast.csv
+"""
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+from color_core import parse_rgb_value
+
+# WCAG 2.x 的对比度门槛
+AA_LARGE = 3.0
+AA = 4.5
+AAA = 7.0
+# 热力图中各等级的颜色: 不合格、仅大字号AA、AA、AAA
+LEVEL_COLORS = np.array([(215, 48, 39), (252, 141, 89), (145, 207, 96), (26, 152, 80)], dtype=np.uint8)
+LEVEL_NAMES = ('不合格', 'AA大字', 'AA', 'AAA')
+
+
+def relative_luminance(rgb):
+    """批量计算 (..., 3) RGB数组的WCAG相对亮度"""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return c @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratios(rgb):
+    """返回 (n, n) 的对比度矩阵, 矩阵对称, 对角线为1"""
+    luminance = relative_luminance(np.asarray(rgb).reshape(-1, 3)) + 0.05
+    return np.maximum(luminance[:, None], luminance[None, :]) / np.minimum(luminance[:, None], luminance[None, :])
+
+
+def contrast_levels(ratios):
+    """对比度对应的等级下标: 0 不合格, 1 仅大字号AA, 2 AA, 3 AAA"""
+    return np.searchsorted(np.array([AA_LARGE, AA, AAA]), ratios, side='right')
+
+
+def heatmap_pixels(ratios, cell_size=1):
+    """将对比度矩阵渲染为 (n*cell, n*cell, 3) 的RGB热力图, 对角线为灰色"""
+    pixels = LEVEL_COLORS[contrast_levels(ratios)]
+    np.einsum('iic->ic', pixels)[:] = 128
+    if cell_size > 1:
+        pixels = np.repeat(np.repeat(pixels, cell_size, axis=0), cell_size, axis=1)
+    return np.ascontiguousarray(pixels)
+
+
+def write_contrast_csv(output, labels, ratios):
+    """以矩阵形式将对比度写入打开的文件, 首行和首列为颜色标签"""
+    writer = csv.writer(output)
+    writer.writerow([''] + list(labels))
+    for label, row in zip(labels, ratios.tolist()):
+        writer.writerow([label] + [f"{ratio:.2f}" for ratio in row])
+
+
+class ContrastMatrix:
+    """缓存最近一次计算的对比度矩阵, 颜色列表变化时才重新计算"""
+    def __init__(self):
+        self._key = None
+        self._ratios = None
+
+    def ratios(self, colors):
+        key = tuple(tuple(int(v) for v in rgb) for rgb in colors)
+        if key != self._key:
+            self._ratios = contrast_ratios(np.array(key, dtype=np.int32).reshape(-1, 3))
+            self._key = key
+        return self._ratios
+
+    def invalidate(self):
+        self._key = self._ratios = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='计算颜色两两之间的WCAG对比度')
+    parser.add_argument('colors', nargs='+', help='颜色值, 如 "#FFFFFF" 或 "255, 255, 255"')
+    parser.add_argument('-o', '--output', help='输出CSV文件 (默认打印到标准输出)')
+    args = parser.parse_args(argv)
+
+    colors = []
+    for text in args.colors:
+        rgb = parse_rgb_value(text)
+        if rgb is None:
+            parser.error(f"无法解析颜色: {text}")
+        colors.append(rgb)
+    labels = ['#%02X%02X%02X' % rgb for rgb in colors]
+    ratios = contrast_ratios(colors)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8-sig', newline='') as f:
+            write_contrast_csv(f, labels, ratios)
+    else:
+        write_contrast_csv(sys.stdout, labels, ratios)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
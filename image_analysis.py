@@ -0,0 +1,354 @@
+"""图片主色提取
+
+读取图片后先缩小、再按每通道5位量化为最多32768个颜色桶, 在加权的颜色桶上
+运行向量化的k-means(或中位切分), 最后将各聚类中心一次性批量交给
+ColorNameFinder 在各个颜色标准中命名。
+
+除8位图片外也可以读取16位PNG/TIFF (返回 uint16)、EXR/HDR 和 .npy 浮点数据
+(返回 0-255 标度的 float32); 读取16位RGB和EXR/HDR需要安装 imageio。后续的
+量化、命名和直方图都直接接受这些类型, 不先截断为8位。
+
+用法:
+    python image_analysis.py photo.jpg -k 8 -d all -d ral -d pantone
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from color_core import DATABASES, METRICS, ColorNameFinder, rgb_array_to_255
+
+# 分析前图片缩小到的最大像素数, 对主色的影响可以忽略
+DEFAULT_MAX_PIXELS = 250000
+QUANTIZE_BITS = 5
+# 屏幕区域分析时参与计算的最大像素数, 超过时按步长抽样, 使耗时与区域大小无关
+REGION_MAX_SAMPLES = 65536
+# Pillow 只能按8位读取多通道的16位图片, 这些格式在安装了 imageio 时用它读取
+HIGH_BIT_EXTENSIONS = ('.png', '.tif', '.tiff', '.exr', '.hdr')
+# 这些格式保存的是线性光值, 默认按sRGB曲线编码
+LINEAR_EXTENSIONS = ('.exr', '.hdr')
+# Pillow 中16位和32位单通道图片的模式
+HIGH_BIT_MODES = ('I;16', 'I;16L', 'I;16B', 'I', 'F')
+
+
+def load_image_pixels(path, max_pixels=DEFAULT_MAX_PIXELS, linear=None):
+    """读取图片并缩小到不超过 max_pixels 个像素, 返回 (N, 3) 的像素数组和原始尺寸
+
+    8位图片返回 uint8, 16位图片返回 uint16, 浮点图片返回 0-255 标度的 float32。
+    linear 指定浮点数据是否为线性光值, 默认只对 EXR/HDR 成立。
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if linear is None:
+        linear = extension in LINEAR_EXTENSIONS
+    if extension == '.npy':
+        # 内存映射: 只读取抽样到的行
+        return _array_pixels(np.load(path, mmap_mode='r'), max_pixels, linear)
+    if extension in HIGH_BIT_EXTENSIONS:
+        try:
+            import imageio.v3 as iio
+        except ImportError:
+            if extension in LINEAR_EXTENSIONS:
+                raise ImportError("读取EXR/HDR图片需要安装imageio: pip install imageio") from None
+        else:
+            array = iio.imread(path)
+            if array.dtype != np.uint8:
+                return _array_pixels(array, max_pixels, linear)
+
+    from PIL import Image
+
+    with Image.open(path) as image:
+        if image.mode in HIGH_BIT_MODES:
+            return _array_pixels(np.asarray(image), max_pixels, linear)
+        original_size = image.size
+        width, height = image.size
+        scale = (width * height / max_pixels) ** 0.5 if max_pixels else 1
+        if scale > 1:
+            target = (max(1, int(width / scale)), max(1, int(height / scale)))
+            # JPEG可以在解码时直接按1/2、1/4、1/8缩小, 大图只需解码一小部分数据
+            image.draft('RGB', target)
+        image = image.convert('RGB')
+        width, height = image.size
+        scale = (width * height / max_pixels) ** 0.5 if max_pixels else 1
+        if scale > 1:
+            factor = int(scale)
+            if factor > 1:
+                image = image.reduce(factor)
+            if image.size[0] * image.size[1] > max_pixels:
+                image.thumbnail((int(width / scale), int(height / scale)), Image.BILINEAR)
+        pixels = np.asarray(image, dtype=np.uint8).reshape(-1, 3)
+    return pixels, original_size
+
+
+def _array_pixels(array, max_pixels, linear):
+    """将 (高, 宽[, 通道]) 的高位深数组按步长抽样并转换为 (N, 3) 像素
+
+    先抽样再转换类型, 内存映射的数组只读取需要的部分。整数保持 uint16;
+    浮点数据按 0-1 解释, 线性值按sRGB曲线编码, 统一为 0-255 标度的 float32。
+    """
+    height, width = array.shape[:2]
+    original_size = (width, height)
+    if array.ndim == 2:
+        array = array[..., None]
+    pixels, _ = sample_region(array, max_pixels)
+    pixels = pixels.reshape(-1, array.shape[-1])
+    # 灰度复制为三个通道, 带透明度的图片丢弃透明通道
+    pixels = np.repeat(pixels, 3, axis=1) if pixels.shape[1] < 3 else pixels[:, :3]
+    if pixels.dtype.kind == 'f':
+        if linear:
+            from color_convert import linear_to_srgb
+
+            pixels = linear_to_srgb(pixels).astype(np.float32)
+        else:
+            pixels = np.multiply(pixels, 255, dtype=np.float32)
+    elif pixels.dtype != np.uint8:
+        pixels = np.clip(pixels, 0, 65535).astype(np.uint16)
+    return np.ascontiguousarray(pixels), original_size
+
+
+def quantize_pixels(pixels, bits=QUANTIZE_BITS):
+    """将像素按每通道 bits 位量化, 返回 (颜色桶的平均RGB, 像素数)
+
+    uint16 直接取高 bits 位, 浮点按 0-255 标度截断到范围内再量化;
+    平均值统一为 0-255 标度。
+    """
+    pixels = np.asarray(pixels).reshape(-1, 3)
+    if pixels.dtype == np.uint16:
+        q = (pixels >> (16 - bits)).astype(np.int32)
+        values = rgb_array_to_255(pixels)
+    elif pixels.dtype.kind == 'f':
+        values = np.clip(pixels, 0, 255)
+        q = values.astype(np.int32) >> (8 - bits)
+    else:
+        values = pixels = pixels.astype(np.uint8, copy=False)
+        q = (pixels >> (8 - bits)).astype(np.int32)
+    packed = (q[:, 0] << (2 * bits)) | (q[:, 1] << bits) | q[:, 2]
+    size = 1 << (3 * bits)
+    counts = np.bincount(packed, minlength=size)
+    occupied = np.nonzero(counts)[0]
+    weights = counts[occupied].astype(np.float64)
+    # 每个桶用桶内像素的平均值代表, 比桶中心更准确
+    sums = np.stack([np.bincount(packed, weights=values[:, c], minlength=size)[occupied]
+                     for c in range(3)], axis=1)
+    return sums / weights[:, None], weights
+
+
+def weighted_kmeans(points, weights, k, iterations=20, seed=0, tolerance=1e-3):
+    """加权k-means (k-means++ 初始化), 返回 (聚类中心, 每个聚类的权重)"""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(points))
+    if k == 0:
+        return np.empty((0, 3)), np.empty(0)
+
+    # k-means++ 初始化: 按到已选中心距离平方乘以权重的概率选择下一个中心
+    centers = np.empty((k, points.shape[1]))
+    centers[0] = points[np.argmax(weights)]
+    closest = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        probabilities = closest * weights
+        total = probabilities.sum()
+        if total <= 0:
+            centers = centers[:i]
+            break
+        centers[i] = points[rng.choice(len(points), p=probabilities / total)]
+        closest = np.minimum(closest, ((points - centers[i]) ** 2).sum(axis=1))
+
+    for _ in range(iterations):
+        distances = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        cluster_weights = np.bincount(labels, weights=weights, minlength=len(centers))
+        new_centers = np.stack([np.bincount(labels, weights=weights * points[:, c], minlength=len(centers))
+                                for c in range(points.shape[1])], axis=1)
+        nonempty = cluster_weights > 0
+        new_centers[nonempty] /= cluster_weights[nonempty, None]
+        new_centers[~nonempty] = centers[~nonempty]
+        shift = np.abs(new_centers - centers).max()
+        centers = new_centers
+        if shift < tolerance:
+            break
+
+    distances = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+    labels = distances.argmin(axis=1)
+    cluster_weights = np.bincount(labels, weights=weights, minlength=len(centers))
+    keep = cluster_weights > 0
+    return centers[keep], cluster_weights[keep]
+
+
+def weighted_median_cut(points, weights, k):
+    """加权中位切分
+
+    反复选择加权方差最大的盒子, 沿跨度最大的通道在使两侧平方误差之和最小的位置切分。
+    """
+    def box_error(box):
+        w = weights[box]
+        mean = np.average(points[box], axis=0, weights=w)
+        return float((w[:, None] * (points[box] - mean) ** 2).sum())
+
+    boxes = [np.arange(len(points))]
+    errors = [box_error(boxes[0])]
+    while len(boxes) < k:
+        index = int(np.argmax(errors))
+        if errors[index] <= 0:
+            break
+        box = boxes.pop(index)
+        errors.pop(index)
+        box_points = points[box]
+        channel = np.argmax(box_points.max(axis=0) - box_points.min(axis=0))
+        order = box[np.argsort(box_points[:, channel], kind='stable')]
+        values = points[order, channel]
+        w = weights[order]
+        cw, cs, cq = np.cumsum(w), np.cumsum(w * values), np.cumsum(w * values ** 2)
+        # 在第 i 个元素之后切分时两侧沿该通道的平方误差之和
+        left = cq[:-1] - cs[:-1] ** 2 / cw[:-1]
+        right = (cq[-1] - cq[:-1]) - (cs[-1] - cs[:-1]) ** 2 / (cw[-1] - cw[:-1])
+        split = int(np.argmin(left + right)) + 1
+        for part in (order[:split], order[split:]):
+            boxes.append(part)
+            errors.append(box_error(part))
+
+    box_weights = np.array([weights[box].sum() for box in boxes])
+    centers = np.stack([np.average(points[box], axis=0, weights=weights[box]) for box in boxes])
+    return centers, box_weights
+
+
+def extract_dominant_colors(pixels, k=8, method='kmeans', seed=0):
+    """从像素中提取主色, 返回按占比从高到低排列的 [(rgb元组, 占比)]"""
+    points, weights = quantize_pixels(pixels)
+    if len(points) == 0:
+        return []
+    if method == 'median-cut':
+        centers, cluster_weights = weighted_median_cut(points, weights, k)
+    else:
+        centers, cluster_weights = weighted_kmeans(points, weights, k, seed=seed)
+
+    order = np.argsort(-cluster_weights, kind='stable')
+    total = cluster_weights.sum()
+    rgb = np.clip(np.rint(centers[order]), 0, 255).astype(np.int64)
+    return [(tuple(int(v) for v in color), float(weight / total))
+            for color, weight in zip(rgb, cluster_weights[order])]
+
+
+def name_dominant_colors(finder, colors, databases=('all',), metric='rgb'):
+    """对每个数据库执行一次批量查询, 返回 [{数据库: {'name', 'distance'}}]"""
+    results = [{} for _ in colors]
+    if not colors:
+        return results
+    rgb = np.array(colors, dtype=np.int32)
+    for database in databases:
+        names, distances = finder.find_closest_colors(rgb, database, metric)
+        for result, name, distance in zip(results, names, distances):
+            result[database] = {'name': name, 'distance': round(float(distance), 4)}
+    return results
+
+
+def analyze_image(path, finder=None, k=8, databases=('all',), metric='rgb', method='kmeans',
+                  max_pixels=DEFAULT_MAX_PIXELS, histogram=None, linear=None):
+    """分析图片主色并命名, 返回结果字典
+
+    传入 ColorHistogram 时同时将(缩小后的)像素累计到直方图中。
+    """
+    finder = finder or ColorNameFinder()
+    start = time.perf_counter()
+    pixels, size = load_image_pixels(path, max_pixels, linear)
+    if histogram is not None:
+        histogram.add_pixels(pixels)
+    loaded = time.perf_counter()
+    colors = extract_dominant_colors(pixels, k, method)
+    clustered = time.perf_counter()
+    names = name_dominant_colors(finder, [rgb for rgb, _ in colors], databases, metric)
+    finished = time.perf_counter()
+
+    return {
+        'image': path,
+        'size': list(size),
+        'sampled_pixels': int(len(pixels)),
+        'dtype': str(pixels.dtype),
+        'method': method,
+        'metric': metric,
+        'colors': [{'rgb': list(rgb), 'hex': '#%02X%02X%02X' % rgb, 'fraction': round(fraction, 4),
+                    'names': color_names}
+                   for (rgb, fraction), color_names in zip(colors, names)],
+        'timings': {'load': round(loaded - start, 4), 'cluster': round(clustered - loaded, 4),
+                    'name': round(finished - clustered, 4), 'total': round(finished - start, 4)},
+    }
+
+
+def sample_region(pixels, max_samples=REGION_MAX_SAMPLES):
+    """对 (高, 宽, 3) 的区域像素按行列等步长抽样, 返回 ((N, 3) 像素, 步长); 保持原数据类型"""
+    pixels = np.asarray(pixels)
+    height, width = pixels.shape[:2]
+    step = max(1, math.ceil(math.sqrt(height * width / max_samples))) if max_samples else 1
+    return pixels[::step, ::step].reshape(-1, pixels.shape[-1]), step
+
+
+def average_color(pixels, median=False):
+    """像素的平均色 (或各通道中位数), 返回四舍五入到 0-255 的整数元组"""
+    values = rgb_array_to_255(np.asarray(pixels).reshape(-1, 3))
+    center = np.median(values, axis=0) if median else values.mean(axis=0, dtype=np.float64)
+    return tuple(int(v) for v in np.clip(np.rint(center), 0, 255))
+
+
+def analyze_region(pixels, finder=None, k=5, databases=('all',), metric='rgb',
+                   max_samples=REGION_MAX_SAMPLES):
+    """分析一块屏幕区域的平均色、中位色和前k个主色, 并批量命名
+
+    pixels 为 (高, 宽, 3) 的 uint8、uint16 或浮点数组; 区域过大时先抽样到不超过 max_samples 个像素。
+    """
+    finder = finder or ColorNameFinder()
+    start = time.perf_counter()
+    height, width = np.shape(pixels)[:2]
+    samples, step = sample_region(pixels, max_samples)
+    if len(samples) == 0:
+        raise ValueError("选择的区域为空")
+
+    average = average_color(samples)
+    median = average_color(samples, median=True)
+    dominant = extract_dominant_colors(samples, k)
+    colors = [average, median] + [rgb for rgb, _ in dominant]
+    names = name_dominant_colors(finder, colors, databases, metric)
+
+    def entry(rgb, color_names, fraction=None):
+        return {'rgb': list(rgb), 'hex': '#%02X%02X%02X' % rgb,
+                'fraction': round(fraction, 4) if fraction is not None else None, 'names': color_names}
+
+    return {
+        'size': [int(width), int(height)],
+        'sampled_pixels': int(len(samples)),
+        'step': step,
+        'metric': metric,
+        'average': entry(average, names[0]),
+        'median': entry(median, names[1]),
+        'colors': [entry(rgb, color_names, fraction)
+                   for (rgb, fraction), color_names in zip(dominant, names[2:])],
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='提取图片主色并在各颜色标准中命名')
+    parser.add_argument('images', nargs='+', help='图片文件')
+    parser.add_argument('-k', '--colors', type=int, default=8, help='提取的主色数量 (默认: 8)')
+    parser.add_argument('-d', '--database', action='append', choices=['all'] + list(DATABASES),
+                        help='用于命名的数据库, 可重复指定 (默认: 所有数据库分别命名)')
+    parser.add_argument('-m', '--metric', default='rgb', choices=METRICS, help='颜色距离度量 (默认: rgb)')
+    parser.add_argument('--method', default='kmeans', choices=['kmeans', 'median-cut'], help='聚类方法')
+    parser.add_argument('--max-pixels', type=int, default=DEFAULT_MAX_PIXELS, help='分析前缩小到的最大像素数')
+    parser.add_argument('--linear', action='store_const', const=True, help='浮点数据为线性光值 (EXR/HDR默认如此)')
+    parser.add_argument('--no-linear', dest='linear', action='store_const', const=False,
+                        help='浮点数据已经是sRGB编码值')
+    args = parser.parse_args(argv)
+
+    finder = ColorNameFinder()
+    databases = args.database or list(DATABASES)
+    for path in args.images:
+        result = analyze_image(path, finder, args.colors, databases, args.metric, args.method, args.max_pixels,
+                               linear=args.linear)
+        print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""逐像素颜色分割
+
+将图片的每个像素映射到指定数据库(如RAL)中最接近的标准色, 统计每种标准色的
+像素面积, 并可输出索引标签图。图片按条带逐段读取和处理:
+
+- 二进制PPM (P6) 直接从文件逐行读取, 整个流程的内存占用与图片大小无关;
+- 其他格式由PIL解码后按条带裁剪处理, 解码后的原图由PIL持有。
+
+RGB到标准色下标的映射使用按需填充的 2^24 项查找表 (int16, 32MB):
+每个条带只对查找表中尚未出现过的颜色做一次向量化最近邻搜索。
+
+用法:
+    python image_segmentation.py panel.ppm -d ral --labels labels.pgm --preview preview.ppm
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from color_core import DATABASES, METRICS, ColorNameFinder
+
+DEFAULT_STRIP_HEIGHT = 256
+
+
+class NearestColorTable:
+    """按需填充的 RGB -> 数据库下标 查找表"""
+    def __init__(self, finder, database='ral', metric='rgb'):
+        self.finder = finder
+        self.database = database
+        self.metric = metric
+        self.names, points = finder.get_palette_arrays(database, metric)
+        if not self.names:
+            raise ValueError(f"数据库为空: {database}")
+        if len(self.names) > np.iinfo(np.int16).max:
+            raise ValueError("数据库颜色过多, 无法使用16位查找表")
+        self.palette = np.array(list(finder.get_color_table(database).keys()), dtype=np.uint8)
+        self.table = np.full(1 << 24, -1, dtype=np.int16)
+        self.filled = 0
+
+    def lookup(self, pixels):
+        """将 (..., 3) 的 uint8 像素映射为数据库下标, 返回形状相同(去掉最后一维)的 int16 数组"""
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        flat = pixels.reshape(-1, 3).astype(np.int32)
+        packed = (flat[:, 0] << 16) | (flat[:, 1] << 8) | flat[:, 2]
+        indices = self.table[packed]
+        missing = indices < 0
+        if missing.any():
+            new_keys = np.unique(packed[missing])
+            rgb = np.stack([(new_keys >> 16) & 255, (new_keys >> 8) & 255, new_keys & 255], axis=1)
+            nearest, _ = self.finder.find_closest_indices(rgb, self.database, self.metric)
+            self.table[new_keys] = nearest
+            self.filled += len(new_keys)
+            indices = self.table[packed]
+        return indices.reshape(pixels.shape[:-1])
+
+
+def _read_pnm_token(f):
+    """读取PNM文件头中的下一个字段, 跳过注释"""
+    token = b''
+    while True:
+        c = f.read(1)
+        if not c:
+            return token
+        if c == b'#':
+            f.readline()
+            continue
+        if c.isspace():
+            if token:
+                return token
+            continue
+        token += c
+
+
+def iter_image_strips(path, strip_height=DEFAULT_STRIP_HEIGHT):
+    """逐条带读取图片, 先产出 (宽, 高), 之后每次产出 (strip_height, 宽, 3) 以内的 uint8 数组"""
+    with open(path, 'rb') as f:
+        is_ppm = f.read(2) == b'P6'
+        if is_ppm:
+            width, height, maxval = (int(_read_pnm_token(f)) for _ in range(3))
+            if maxval != 255:
+                is_ppm = False
+            else:
+                yield width, height
+                row_bytes = width * 3
+                for top in range(0, height, strip_height):
+                    rows = min(strip_height, height - top)
+                    data = f.read(row_bytes * rows)
+                    if len(data) != row_bytes * rows:
+                        raise ValueError("PPM文件数据不完整")
+                    yield np.frombuffer(data, dtype=np.uint8).reshape(rows, width, 3)
+                return
+
+    from PIL import Image
+
+    with Image.open(path) as image:
+        width, height = image.size
+        yield width, height
+        for top in range(0, height, strip_height):
+            bottom = min(top + strip_height, height)
+            strip = image.crop((0, top, width, bottom)).convert('RGB')
+            yield np.asarray(strip, dtype=np.uint8)
+
+
+class StreamingPnmWriter:
+    """逐行写出PGM (标签图) 或PPM (预览图)"""
+    def __init__(self, path, width, height, channels=1, maxval=255):
+        self.f = open(path, 'wb')
+        self.dtype = np.dtype('>u2') if maxval > 255 else np.dtype(np.uint8)
+        magic = b'P6' if channels == 3 else b'P5'
+        self.f.write(magic + f"\n{width} {height}\n{maxval}\n".encode('ascii'))
+
+    def write(self, rows):
+        self.f.write(np.ascontiguousarray(rows, dtype=self.dtype).tobytes())
+
+    def close(self):
+        self.f.close()
+
+
+def segment_image(path, finder=None, database='ral', metric='rgb', strip_height=DEFAULT_STRIP_HEIGHT,
+                  labels_path=None, preview_path=None, table=None, histogram=None):
+    """对图片逐像素分割, 返回各标准色的面积统计
+
+    labels_path 写出PGM标签图, 像素值为颜色在结果 'palette' 中的下标;
+    preview_path 写出用标准色填充的PPM预览图; histogram 为 ColorHistogram 时同时累计所有像素。
+    """
+    finder = finder or ColorNameFinder()
+    table = table or NearestColorTable(finder, database, metric)
+    counts = np.zeros(len(table.names), dtype=np.int64)
+    start = time.perf_counter()
+
+    strips = iter_image_strips(path, strip_height)
+    width, height = next(strips)
+    labels = preview = None
+    try:
+        if labels_path:
+            labels = StreamingPnmWriter(labels_path, width, height, 1, max(1, len(table.names) - 1))
+        if preview_path:
+            preview = StreamingPnmWriter(preview_path, width, height, 3)
+        for strip in strips:
+            indices = table.lookup(strip)
+            counts += np.bincount(indices.ravel(), minlength=len(counts))
+            if histogram is not None:
+                histogram.add_pixels(strip)
+            if labels is not None:
+                labels.write(indices)
+            if preview is not None:
+                preview.write(table.palette[indices])
+    finally:
+        for writer in (labels, preview):
+            if writer is not None:
+                writer.close()
+
+    total = int(counts.sum())
+    order = np.argsort(-counts, kind='stable')
+    areas = [{'index': int(i), 'name': table.names[i], 'rgb': table.palette[i].tolist(),
+              'pixels': int(counts[i]), 'fraction': round(float(counts[i]) / total, 6) if total else 0.0}
+             for i in order if counts[i]]
+    return {
+        'image': path,
+        'size': [width, height],
+        'database': database,
+        'metric': metric,
+        'pixels': total,
+        'areas': areas,
+        'palette': [{'index': i, 'name': name, 'rgb': rgb}
+                    for i, (name, rgb) in enumerate(zip(table.names, table.palette.tolist()))]
+        if labels_path else None,
+        'distinct_colors': table.filled,
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='逐像素映射到标准色并统计面积')
+    parser.add_argument('image', help='图片文件 (二进制PPM可流式处理)')
+    parser.add_argument('-d', '--database', default='ral', choices=['all'] + list(DATABASES),
+                        help='标准色数据库 (默认: ral)')
+    parser.add_argument('-m', '--metric', default='rgb', choices=METRICS, help='颜色距离度量 (默认: rgb)')
+    parser.add_argument('--strip-height', type=int, default=DEFAULT_STRIP_HEIGHT, help='每个条带的行数')
+    parser.add_argument('--labels', help='输出PGM标签图路径')
+    parser.add_argument('--preview', help='输出PPM预览图路径')
+    parser.add_argument('--top', type=int, default=0, help='只输出面积最大的若干种颜色')
+    args = parser.parse_args(argv)
+
+    result = segment_image(args.image, database=args.database, metric=args.metric,
+                           strip_height=args.strip_height, labels_path=args.labels,
+                           preview_path=args.preview)
+    if args.top:
+        result['areas'] = result['areas'][:args.top]
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
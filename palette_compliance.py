@@ -0,0 +1,249 @@
+"""色板合规检查
+
+检查设计稿、CSS或导出文件中使用的所有颜色是否都在认可色板(如Pantone的一个子集)
+的ΔE容差以内。候选颜色先去重, 再转换到Lab后一次性向量化查找最近的色板颜色,
+超出容差的颜色连同出现位置一起列入报告。
+
+用法:
+    python palette_compliance.py styles.css -d pantone --include "^PANTONE 18" --tolerance 3
+    python palette_compliance.py colors.txt --palette brand.json --format csv -o report.csv
+"""
+import argparse
+import bisect
+import csv
+import json
+import re
+import sys
+import time
+
+import numpy as np
+
+from color_core import (DATABASES, METRICS, ColorNameFinder, nearest_palette_indices,
+                        normalize_color_table, parse_rgb_value, rgb_array_to_metric)
+
+# 文本中的 #RGB / #RRGGBB / #RRGGBBAA 和 rgb()/rgba() 颜色
+HEX_COLOR = re.compile(r'#([0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3})\b')
+RGB_FUNCTION = re.compile(r'rgba?\(\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*[,\s]\s*(\d{1,3})\s*(?:[,/][^)]*)?\)',
+                          re.IGNORECASE)
+DEFAULT_TOLERANCE = 2.0
+# 报告中各度量的距离名称
+DISTANCE_LABELS = {'lab': 'ΔE', 'oklab': 'ΔEok', 'cam16ucs': "ΔE'"}
+
+
+def _selector_hex_positions(lines):
+    """样式表中不是颜色值的 #xxx (如 id选择器 "#add {"), 返回 {(行号, 列)}
+
+    文本中有 "{" 时按样式表处理: 以 ";"、"{"、"}" 分段, 以 "{" 结尾的段 (选择器) 中的都不是颜色,
+    其余段中只有 ":"、"="、"(" 之后的才是颜色 (声明的值、属性值和函数参数)。
+    """
+    text = '\n'.join(lines)
+    if '{' not in text:
+        return set()
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+    skipped = set()
+    for match in HEX_COLOR.finditer(text):
+        start = match.start()
+        segment_start = max(text.rfind(char, 0, start) for char in ';{}') + 1
+        ends = [end for end in (text.find(char, match.end()) for char in ';{}') if end >= 0]
+        terminator = text[min(ends)] if ends else ''
+        prefix = text[segment_start:start]
+        if terminator == '{' or not any(char in prefix for char in ':=('):
+            number = bisect.bisect_right(line_starts, start)
+            skipped.add((number, start - line_starts[number - 1]))
+    return skipped
+
+
+def extract_colors(lines):
+    """从文本行中提取颜色, 返回 [(rgb, 行号, 原文)]
+
+    每行先查找十六进制和 rgb() 写法; 都没有时把整行当作一个颜色值解析(如 "255, 0, 0")。
+    样式表中选择器里的 #xxx (id) 不算颜色, 见 _selector_hex_positions。
+    """
+    lines = [line.rstrip('\r\n') for line in lines]
+    skipped = _selector_hex_positions(lines)
+    found = []
+    for number, line in enumerate(lines, 1):
+        matches = []
+        selector = False
+        for match in HEX_COLOR.finditer(line):
+            if (number, match.start()) in skipped:
+                selector = True
+                continue
+            digits = match.group(1)
+            if len(digits) == 3:
+                digits = ''.join(c * 2 for c in digits)
+            matches.append((match.start(), tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4)), match.group(0)))
+        for match in RGB_FUNCTION.finditer(line):
+            rgb = tuple(int(v) for v in match.groups())
+            if all(0 <= v <= 255 for v in rgb):
+                matches.append((match.start(), rgb, match.group(0)))
+        if matches:
+            found.extend((rgb, number, text) for _, rgb, text in sorted(matches))
+            continue
+        text = line.strip()
+        rgb = parse_rgb_value(text) if text and not selector else None
+        if rgb is not None:
+            found.append((rgb, number, text))
+    return found
+
+
+def load_target_palette(finder, database=None, palette_file=None, include=None):
+    """读取目标色板, 返回 (名称列表, (M, 3) RGB数组)
+
+    palette_file 可以是颜色数据库格式的JSON, 也可以是任意包含颜色的文本;
+    include 为正则表达式, 只保留名称匹配的颜色。
+    """
+    if palette_file:
+        with open(palette_file, 'r', encoding='utf-8-sig') as f:
+            text = f.read()
+        try:
+            table = normalize_color_table(json.loads(text))
+        except (ValueError, AttributeError, TypeError):
+            table = {}
+            for rgb, _, source in extract_colors(text.splitlines()):
+                table.setdefault(rgb, source)
+    else:
+        table = finder.get_color_table(database or 'all')
+
+    pattern = re.compile(include) if include else None
+    items = [(rgb, name) for rgb, name in table.items() if pattern is None or pattern.search(name)]
+    if not items:
+        raise ValueError("目标色板为空")
+    names = [name for _, name in items]
+    return names, np.array([rgb for rgb, _ in items], dtype=np.int32)
+
+
+def check_compliance(candidates, palette_rgb, tolerance=DEFAULT_TOLERANCE, metric='lab'):
+    """为每个候选颜色查找最近的色板颜色
+
+    candidates 为 (N, 3) 的RGB数组。距离为所选度量颜色空间中的欧氏距离 (lab 即 ΔE76)。
+    返回字典: 'indices' 最近色板颜色下标, 'distances' 距离, 'passed' 是否在容差以内。
+    重复的候选颜色只计算一次。
+    """
+    candidates = np.asarray(candidates, dtype=np.int32).reshape(-1, 3)
+    # 打包成24位整数后去重, 比按行去重快得多
+    packed, inverse = np.unique((candidates[:, 0] << 16) | (candidates[:, 1] << 8) | candidates[:, 2],
+                                return_inverse=True)
+    unique = np.stack([packed >> 16, (packed >> 8) & 255, packed & 255], axis=1)
+    indices, squared = nearest_palette_indices(rgb_array_to_metric(unique, metric),
+                                               rgb_array_to_metric(palette_rgb, metric))
+    distances = np.sqrt(squared)
+    return {
+        'indices': indices[inverse],
+        'distances': distances[inverse],
+        'passed': (distances <= tolerance)[inverse],
+        'unique': len(unique),
+    }
+
+
+def build_report(found, palette_names, palette_rgb, result, tolerance, metric):
+    """汇总检查结果, 返回报告字典; 不合规的颜色按距离从大到小排列并合并相同颜色的出现位置
+
+    found 为 [(rgb, 文件, 行号, 原文)], 出现位置记为 "文件:行号"。
+    """
+    failures = {}
+    for (rgb, path, line, text), index, distance, passed in zip(
+            found, result['indices'].tolist(), result['distances'].tolist(), result['passed'].tolist()):
+        if passed:
+            continue
+        entry = failures.get(rgb)
+        if entry is None:
+            nearest = tuple(int(v) for v in palette_rgb[index])
+            entry = failures[rgb] = {
+                'rgb': list(rgb), 'hex': '#%02X%02X%02X' % rgb,
+                'nearest': palette_names[index], 'nearest_hex': '#%02X%02X%02X' % nearest,
+                'distance': round(distance, 3), 'count': 0, 'locations': [], 'sources': [],
+            }
+        entry['count'] += 1
+        entry['locations'].append(f"{path}:{line}")
+        if text not in entry['sources']:
+            entry['sources'].append(text)
+
+    return {
+        'metric': metric,
+        'tolerance': tolerance,
+        'palette_size': len(palette_names),
+        'colors': len(found),
+        'unique_colors': result['unique'],
+        'failed': sum(entry['count'] for entry in failures.values()),
+        'max_distance': round(float(result['distances'].max()), 3) if len(found) else 0.0,
+        'violations': sorted(failures.values(), key=lambda entry: -entry['distance']),
+    }
+
+
+def write_report(report, output, output_format):
+    if output_format == 'json':
+        json.dump(report, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+    elif output_format == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(['hex', 'rgb', 'nearest', 'nearest_hex', 'distance', 'count', 'locations'])
+        for entry in report['violations']:
+            writer.writerow([entry['hex'], ','.join(map(str, entry['rgb'])), entry['nearest'],
+                             entry['nearest_hex'], entry['distance'], entry['count'],
+                             ' '.join(entry['locations'])])
+    else:
+        label = DISTANCE_LABELS.get(report['metric'], 'RGB距离')
+        output.write(f"共 {report['colors']} 处颜色 ({report['unique_colors']} 种), "
+                     f"目标色板 {report['palette_size']} 色, 容差 {label} ≤ {report['tolerance']:g}\n")
+        if not report['violations']:
+            output.write("全部合规\n")
+            return
+        output.write(f"{report['failed']} 处颜色超出容差 ({len(report['violations'])} 种):\n")
+        for entry in report['violations']:
+            locations = ', '.join(entry['locations'][:10]) + (' ...' if len(entry['locations']) > 10 else '')
+            output.write(f"  {entry['hex']}  {label}={entry['distance']:g}  最近: {entry['nearest']} "
+                         f"({entry['nearest_hex']})  位置: {locations}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='检查文件中的颜色是否都在目标色板的容差以内')
+    parser.add_argument('files', nargs='*', help='待检查的文件 (CSS、颜色列表等), 省略时读取标准输入')
+    parser.add_argument('-d', '--database', default='all', choices=['all'] + list(DATABASES),
+                        help='作为目标色板的数据库 (默认: all)')
+    parser.add_argument('--palette', help='目标色板文件, 指定后忽略 --database')
+    parser.add_argument('--include', help='只保留名称匹配此正则表达式的色板颜色')
+    parser.add_argument('-t', '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'容差 (默认: ΔE {DEFAULT_TOLERANCE:g})')
+    parser.add_argument('-m', '--metric', default='lab', choices=METRICS, help='颜色距离度量 (默认: lab)')
+    parser.add_argument('--format', default='text', choices=['text', 'json', 'csv'], help='报告格式')
+    parser.add_argument('-o', '--output', help='报告输出文件 (默认输出到标准输出)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    finder = ColorNameFinder()
+    try:
+        palette_names, palette_rgb = load_target_palette(finder, args.database, args.palette, args.include)
+    except (OSError, ValueError, re.error) as e:
+        print(f"无法读取目标色板: {e}", file=sys.stderr)
+        return 2
+
+    # 多个文件的行号各自从1开始, 每处颜色都带上所在文件
+    found = []
+    for path in args.files or ['-']:
+        if path == '-':
+            colors = extract_colors(sys.stdin)
+            path = 'stdin'
+        else:
+            with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                colors = extract_colors(f)
+        found.extend((rgb, path, number, text) for rgb, number, text in colors)
+
+    rgb = np.array([rgb for rgb, _, _, _ in found], dtype=np.int32).reshape(-1, 3)
+    result = check_compliance(rgb, palette_rgb, args.tolerance, args.metric)
+    report = build_report(found, palette_names, palette_rgb, result, args.tolerance, args.metric)
+    report['seconds'] = round(time.perf_counter() - start, 4)
+
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        write_report(report, output, args.format)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if report['violations'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""配色生成
+
+根据基准色在HSL/HSV空间中批量生成配色: 明调(tints)、暗调(shades)、灰调(tones)、
+互补色、类似色、三角配色、分裂互补、四角配色以及两色渐变。所有色阶一次性以
+numpy数组生成, 每组配色的名称用一次批量最近色查询得到。
+
+PaletteGenerator 按基准色缓存结果: 同一个基准色的所有方案在第一次请求时一起生成
+并命名, 之后在界面上切换方案或色阶数只是查缓存。
+
+用法:
+    python palette_generator.py "#3366CC" -s triadic -s tints -n 7 -d chinese
+    python palette_generator.py "#FF0000" --to "#0000FF" -s gradient -n 9
+"""
+import argparse
+import json
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from color_convert import hsl_array_to_rgb, hsv_array_to_rgb, rgb_array_to_hsl, rgb_array_to_hsv
+from color_core import DATABASES, METRICS, ColorNameFinder, parse_rgb_value
+
+# 方案代号 -> 显示名称
+SCHEMES = {
+    'tints': '明调',
+    'shades': '暗调',
+    'tones': '灰调',
+    'complementary': '互补色',
+    'analogous': '类似色',
+    'triadic': '三角配色',
+    'split-complementary': '分裂互补',
+    'tetradic': '四角配色',
+    'monochrome': '单色系',
+    'gradient': '渐变',
+}
+DEFAULT_STEPS = 7
+
+
+def _hue_rotations(hsl, offsets):
+    """按一组色相偏移(度)旋转, 返回 (len(offsets), 3) 的HSL数组"""
+    result = np.repeat(hsl[None, :], len(offsets), axis=0)
+    result[:, 0] = (hsl[0] + np.asarray(offsets, dtype=np.float64)) % 360
+    return result
+
+
+def generate_scheme(base, scheme, steps=DEFAULT_STEPS, end=None):
+    """生成一种配色方案, 返回 (N, 3) 的 uint8 RGB数组, 第一个颜色通常为基准色本身
+
+    steps 为明调/暗调/灰调/单色系/渐变的色阶数; 渐变需要提供终点颜色 end。
+    """
+    base_rgb = np.asarray(base, dtype=np.float64)
+    hsl = rgb_array_to_hsl(base_rgb)
+    steps = max(2, int(steps))
+    ramp = np.linspace(0.0, 1.0, steps)
+
+    if scheme == 'tints':
+        # 亮度从基准色线性升高到接近白色
+        colors = np.repeat(hsl[None, :], steps, axis=0)
+        colors[:, 2] = hsl[2] + (97 - hsl[2]) * ramp
+        rgb = hsl_array_to_rgb(colors)
+    elif scheme == 'shades':
+        colors = np.repeat(hsl[None, :], steps, axis=0)
+        colors[:, 2] = hsl[2] * (1 - ramp * 0.95)
+        rgb = hsl_array_to_rgb(colors)
+    elif scheme == 'tones':
+        colors = np.repeat(hsl[None, :], steps, axis=0)
+        colors[:, 1] = hsl[1] * (1 - ramp)
+        rgb = hsl_array_to_rgb(colors)
+    elif scheme == 'monochrome':
+        # 同一色相下明度和饱和度同时变化
+        hsv = np.repeat(rgb_array_to_hsv(base_rgb)[None, :], steps, axis=0)
+        hsv[:, 1] = np.clip(hsv[:, 1] * (1.2 - 0.8 * ramp), 0, 100)
+        hsv[:, 2] = 20 + 80 * ramp
+        rgb = hsv_array_to_rgb(hsv)
+    elif scheme == 'complementary':
+        rgb = hsl_array_to_rgb(_hue_rotations(hsl, [0, 180]))
+    elif scheme == 'analogous':
+        rgb = hsl_array_to_rgb(_hue_rotations(hsl, [0, -30, 30, -60, 60]))
+    elif scheme == 'triadic':
+        rgb = hsl_array_to_rgb(_hue_rotations(hsl, [0, 120, 240]))
+    elif scheme == 'split-complementary':
+        rgb = hsl_array_to_rgb(_hue_rotations(hsl, [0, 150, 210]))
+    elif scheme == 'tetradic':
+        rgb = hsl_array_to_rgb(_hue_rotations(hsl, [0, 90, 180, 270]))
+    elif scheme == 'gradient':
+        if end is None:
+            raise ValueError("渐变需要指定终点颜色")
+        rgb = base_rgb + (np.asarray(end, dtype=np.float64) - base_rgb) * ramp[:, None]
+    else:
+        raise ValueError(f"未知配色方案: {scheme}")
+
+    if scheme != 'gradient':
+        # 基准色保持原值, 避免HSL往返带来的取整误差
+        rgb[0] = base_rgb
+    return np.clip(np.rint(rgb), 0, 255).astype(np.uint8)
+
+
+class PaletteGenerator:
+    """生成配色并批量命名, 按基准色缓存
+
+    cache_size 为缓存的基准色组合数, 超出时淘汰最久未使用的。
+    """
+    def __init__(self, finder=None, database='all', metric='lab', cache_size=64):
+        self.finder = finder or ColorNameFinder()
+        self.database = database
+        self.metric = metric
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def variations(self, base, steps=DEFAULT_STEPS, end=None):
+        """返回基准色的所有配色方案 {方案: [{'rgb', 'hex', 'name', 'distance'}]}"""
+        base = tuple(int(v) for v in base)
+        end = tuple(int(v) for v in end) if end is not None else None
+        key = (base, steps, end, self.database, self.metric, self.finder.locale)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        schemes = [scheme for scheme in SCHEMES if scheme != 'gradient' or end is not None]
+        arrays = [generate_scheme(base, scheme, steps, end) for scheme in schemes]
+        # 所有方案的色阶合并后只做一次最近色查询
+        stacked = np.concatenate(arrays)
+        names, distances = self.finder.find_closest_colors(stacked.astype(np.int32), self.database, self.metric)
+        stops = [{'rgb': rgb, 'hex': '#%02X%02X%02X' % tuple(rgb), 'name': name,
+                  'distance': round(float(distance), 4)}
+                 for rgb, name, distance in zip(stacked.tolist(), names, distances)]
+
+        result = {}
+        offset = 0
+        for scheme, array in zip(schemes, arrays):
+            result[scheme] = stops[offset:offset + len(array)]
+            offset += len(array)
+
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def palette(self, base, scheme, steps=DEFAULT_STEPS, end=None):
+        """返回单个配色方案的色阶列表"""
+        if scheme not in SCHEMES:
+            raise ValueError(f"未知配色方案: {scheme}")
+        if scheme == 'gradient' and end is None:
+            raise ValueError("渐变需要指定终点颜色")
+        return self.variations(base, steps, end)[scheme]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='根据基准色生成配色并命名')
+    parser.add_argument('color', help='基准色, 如 "#3366CC" 或 "51, 102, 204"')
+    parser.add_argument('-s', '--scheme', action='append', choices=list(SCHEMES),
+                        help='配色方案, 可重复指定 (默认: 全部)')
+    parser.add_argument('-n', '--steps', type=int, default=DEFAULT_STEPS, help='色阶数 (默认: 7)')
+    parser.add_argument('--to', help='渐变的终点颜色')
+    parser.add_argument('-d', '--database', default='all', choices=['all'] + list(DATABASES),
+                        help='用于命名的数据库 (默认: all)')
+    parser.add_argument('-m', '--metric', default='lab', choices=METRICS, help='颜色距离度量 (默认: lab)')
+    args = parser.parse_args(argv)
+
+    base = parse_rgb_value(args.color)
+    end = parse_rgb_value(args.to) if args.to else None
+    if base is None or (args.to and end is None):
+        parser.error(f"无法解析颜色: {args.color if base is None else args.to}")
+
+    generator = PaletteGenerator(database=args.database, metric=args.metric)
+    variations = generator.variations(base, args.steps, end)
+    for scheme in args.scheme or list(variations):
+        if scheme not in variations:
+            parser.error("渐变需要用 --to 指定终点颜色")
+        print(json.dumps({'scheme': scheme, 'colors': variations[scheme]}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
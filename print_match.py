@@ -0,0 +1,427 @@
+"""印刷色匹配 (CMYK特性化)
+
+ColorNameFinder.rgb_to_cmyk 是不考虑油墨、纸张和网点扩大的简单公式, 不能用来判断
+印刷品与 Pantone/RAL 标准色是否一致。本模块按印刷条件的特性化数据把CMYK换算为
+Lab, 再在Lab中与标准色比较 ΔE76。
+
+特性化数据 (CMYK -> Lab 的规则网格) 从本地文件读取:
+- CGATS 文本或CSV格式的测量数据, 需包含 CMYK_C/CMYK_M/CMYK_Y/CMYK_K 和
+  LAB_L/LAB_A/LAB_B 列, 且CMYK值构成完整的规则网格;
+- CMYK输出型ICC配置文件, 通过 Pillow 的 LittleCMS 在网格节点上求值
+  (Pillow 的Lab输出为8位, 约有 ±0.2 的量化误差);
+- 本模块保存的 .npz 文件。
+测量数据和ICC的Lab按D50记录, 读入时用Bradford变换换算到D65, 与数据库中的颜色一致。
+
+网格内的Lab用四线性插值计算, 插值结果是所在网格单元16个角点的凸组合; 最近标准色
+在Lab中占据的区域 (Voronoi单元) 是凸的, 所以16个角点的最近标准色相同时, 单元内
+任意一点的最近标准色也必然是它。名称网格预先记录每个单元是否如此, 落在这类单元中的
+CMYK值查询时不需要搜索。名称网格按特性化数据和色板的摘要缓存到磁盘。
+
+用法:
+    python print_match.py build fogra39.txt -o fogra39.npz
+    python print_match.py match fogra39.npz "0, 100, 100, 0" "C20 M0 Y80 K10" -d pantone -d ral
+    python print_match.py recipe fogra39.npz "RAL 3020" -d ral
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from color_convert import D65_WHITE, lab_array_to_xyz, xyz_array_to_lab
+from color_core import DATABASES, ColorNameFinder, nearest_palette_indices, parse_rgb_value
+from color_profile import D50_WHITE, _bradford_adaptation, read_icc_tags
+
+# 从ICC配置文件采样时每个通道的网格节点数
+DEFAULT_ICC_STEPS = 17
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'print_grids')
+# 印刷匹配默认使用的数据库
+PRINT_DATABASES = ('pantone', 'ral')
+
+_D50_TO_D65 = _bradford_adaptation(D50_WHITE, D65_WHITE)
+_D65_TO_D50 = np.linalg.inv(_D50_TO_D65)
+
+# 测量数据中各列可能的名称 (不区分大小写)
+_COLUMN_ALIASES = {
+    'c': ('cmyk_c', 'c', 'cyan'), 'm': ('cmyk_m', 'm', 'magenta'),
+    'y': ('cmyk_y', 'y', 'yellow'), 'k': ('cmyk_k', 'k', 'black'),
+    'l': ('lab_l', 'l', 'l*'), 'a': ('lab_a', 'a', 'a*'), 'b': ('lab_b', 'b', 'b*'),
+}
+_CMYK_TEXT_PATTERN = re.compile(r'^\s*(?:cmyk)?\s*\(?\s*'
+                                + r'\s*[,;\s]\s*'.join([rf'{c}?\s*(\d+(?:\.\d+)?)\s*%?' for c in 'CMYK'])
+                                + r'\s*\)?\s*$', re.I)
+
+
+def parse_cmyk_value(text):
+    """解析 "0, 100, 100, 0"、"C20 M0 Y80 K10"、"CMYK(0%, 100%, 100%, 0%)" 等形式, 无效时返回None"""
+    match = _CMYK_TEXT_PATTERN.match(text)
+    if not match:
+        return None
+    cmyk = tuple(float(v) for v in match.groups())
+    return cmyk if all(0 <= v <= 100 for v in cmyk) else None
+
+
+def d50_lab_to_d65(lab):
+    """D50 的Lab (ICC连接空间和测量数据) 换算为本程序使用的 D65 Lab"""
+    xyz = lab_array_to_xyz(lab) / D65_WHITE * D50_WHITE
+    return xyz_array_to_lab(xyz @ _D50_TO_D65.T)
+
+
+def d65_lab_to_d50(lab):
+    xyz = lab_array_to_xyz(lab) @ _D65_TO_D50.T
+    return xyz_array_to_lab(xyz / D50_WHITE * D65_WHITE)
+
+
+def read_measurements(path):
+    """读取CGATS或CSV格式的测量数据, 返回 (CMYK (n, 4) 0-100, D50 Lab (n, 3))"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = [line.strip() for line in f]
+    if any(line.upper() == 'BEGIN_DATA' for line in lines):
+        upper = [line.upper() for line in lines]
+        header = lines[upper.index('BEGIN_DATA_FORMAT') + 1:upper.index('END_DATA_FORMAT')]
+        fields = ' '.join(header).split()
+        rows = [line.replace('"', '').split() for line in lines[upper.index('BEGIN_DATA') + 1:upper.index('END_DATA')]]
+    else:
+        data = [line for line in lines if line and not line.startswith('#')]
+        delimiter = max(',;\t', key=data[0].count) if data else ','
+        fields = [field.strip() for field in data[0].split(delimiter)]
+        rows = [[value.strip() for value in line.split(delimiter)] for line in data[1:]]
+
+    lower = [field.lower() for field in fields]
+    columns = []
+    for key, aliases in _COLUMN_ALIASES.items():
+        found = next((lower.index(alias) for alias in aliases if alias in lower), None)
+        if found is None:
+            raise ValueError(f"测量数据缺少列: {aliases[0].upper()}")
+        columns.append(found)
+    try:
+        values = np.array([[float(row[c]) for c in columns] for row in rows if row], dtype=np.float64)
+    except (ValueError, IndexError) as e:
+        raise ValueError(f"无法解析测量数据: {e}")
+    if len(values) == 0:
+        raise ValueError("测量数据为空")
+    return values[:, :4], values[:, 4:]
+
+
+def _grid_from_measurements(cmyk, lab):
+    """将散列的测量数据排列为规则网格, 返回 (各通道节点, (n_c, n_m, n_y, n_k, 3) Lab)"""
+    nodes = [np.unique(cmyk[:, c]) for c in range(4)]
+    shape = tuple(len(n) for n in nodes)
+    if any(s < 2 for s in shape):
+        raise ValueError("每个通道至少需要两个网格节点")
+    if int(np.prod(shape)) != len(cmyk):
+        raise ValueError(f"CMYK值不是完整的规则网格: {len(cmyk)} 个色块, 节点数 {shape}")
+    cells = [np.searchsorted(n, cmyk[:, c]) for c, n in enumerate(nodes)]
+    flat = np.ravel_multi_index(cells, shape)
+    if len(np.unique(flat)) != len(flat):
+        raise ValueError("测量数据中有重复的CMYK值")
+    grid = np.empty((len(flat), 3))
+    grid[flat] = lab
+    return nodes, grid.reshape(shape + (3,))
+
+
+def _littlecms_grid(data, steps):
+    """用 Pillow 的 LittleCMS 在网格节点上求 CMYK -> D50 Lab (绝对色度)"""
+    try:
+        from PIL import Image, ImageCms
+    except ImportError:
+        raise ValueError("从ICC配置文件生成特性化数据需要安装Pillow")
+    values = np.rint(np.linspace(0.0, 255.0, steps))
+    grid = np.stack(np.meshgrid(values, values, values, values, indexing='ij'), axis=-1).astype(np.uint8)
+    image = Image.fromarray(grid.reshape(steps ** 3, steps, 4), 'CMYK')
+    transform = ImageCms.buildTransform(ImageCms.ImageCmsProfile(io.BytesIO(data)), ImageCms.createProfile('LAB'),
+                                        'CMYK', 'LAB', renderingIntent=ImageCms.Intent.ABSOLUTE_COLORIMETRIC)
+    result = np.asarray(ImageCms.applyTransform(image, transform)).reshape(-1, 3)
+    # Pillow 的 LAB 模式: L 按 0-255 保存, a、b 为有符号8位整数
+    lab = np.empty(result.shape)
+    lab[:, 0] = result[:, 0] * (100.0 / 255.0)
+    lab[:, 1:] = result[:, 1:].view(np.int8)
+    return [values / 2.55] * 4, lab.reshape((steps,) * 4 + (3,))
+
+
+class CMYKCharacterization:
+    """印刷条件的 CMYK -> Lab (D65) 规则网格
+
+    nodes 为4个通道各自递增的节点 (0-100), lab 为 (n_c, n_m, n_y, n_k, 3) 的Lab值。
+    """
+    def __init__(self, nodes, lab, source=None):
+        self.nodes = [np.asarray(n, dtype=np.float64) for n in nodes]
+        self.lab = np.ascontiguousarray(lab, dtype=np.float64)
+        self.shape = self.lab.shape[:4]
+        self.source = source or {}
+        self._flat = self.lab.reshape(-1, 3)
+        self._strides = np.array([self.shape[1] * self.shape[2] * self.shape[3],
+                                  self.shape[2] * self.shape[3], self.shape[3], 1])
+        # 单元16个角点相对于单元起点的一维偏移, 与角点的二进制编号 (c, m, y, k) 对应
+        corners = np.array([[(i >> (3 - c)) & 1 for c in range(4)] for i in range(16)])
+        self._corners = corners
+        self._corner_offsets = corners @ self._strides
+        digest = hashlib.sha1(self.lab.tobytes())
+        for n in self.nodes:
+            digest.update(n.tobytes())
+        self.digest = digest.hexdigest()
+
+    @classmethod
+    def from_measurements(cls, path):
+        """读取CGATS/CSV测量数据 (D50 Lab)"""
+        cmyk, lab = read_measurements(path)
+        nodes, grid = _grid_from_measurements(cmyk, d50_lab_to_d65(lab))
+        return cls(nodes, grid, {'path': path, 'method': 'measurements'})
+
+    @classmethod
+    def from_icc(cls, path, steps=DEFAULT_ICC_STEPS):
+        """在CMYK输出型ICC配置文件的网格节点上求值"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        header, _ = read_icc_tags(data)
+        if header['color_space'] != 'CMYK':
+            raise ValueError(f"印刷配置文件应为CMYK颜色空间, 实际为 {header['color_space']}")
+        nodes, lab = _littlecms_grid(data, steps)
+        return cls(nodes, d50_lab_to_d65(lab), {'path': path, 'method': 'littlecms', 'steps': steps,
+                                                 'sha1': hashlib.sha1(data).hexdigest()})
+
+    @classmethod
+    def load(cls, path, steps=DEFAULT_ICC_STEPS):
+        """按扩展名读取保存的网格 (.npz)、ICC配置文件 (.icc/.icm) 或测量数据"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.npz':
+            with np.load(path) as data:
+                lab = data['lab']
+                nodes = np.split(data['nodes'], np.cumsum(lab.shape[:3]))
+                return cls(nodes, lab, json.loads(bytes(data['source']).decode('utf-8')))
+        if extension in ('.icc', '.icm'):
+            return cls.from_icc(path, steps)
+        return cls.from_measurements(path)
+
+    def save(self, path):
+        source = np.frombuffer(json.dumps(self.source).encode('utf-8'), dtype=np.uint8)
+        np.savez(path, lab=self.lab, nodes=np.concatenate(self.nodes), source=source)
+
+    def locate(self, cmyk):
+        """返回 (N, 4) 的单元下标和单元内的插值权重; 超出网格的值截断到边界"""
+        cells = np.empty(cmyk.shape, dtype=np.intp)
+        weights = np.empty(cmyk.shape)
+        for c, nodes in enumerate(self.nodes):
+            values = np.clip(cmyk[:, c], nodes[0], nodes[-1])
+            cell = np.clip(np.searchsorted(nodes, values, side='right') - 1, 0, len(nodes) - 2)
+            low = nodes[cell]
+            cells[:, c] = cell
+            weights[:, c] = (values - low) / (nodes[cell + 1] - low)
+        return cells, weights
+
+    def interpolate(self, cells, weights):
+        """按单元和权重四线性插值, 返回 (N, 3) Lab"""
+        values = np.take(self._flat, (cells @ self._strides)[:, None] + self._corner_offsets, axis=0)
+        # 角点按 (c, m, y, k) 的二进制编号排列, 前一半和后一半正好是沿当前最高位轴的两端,
+        # 依次沿 c、m、y、k 轴插值
+        for c in range(4):
+            half = values.shape[1] // 2
+            low = values[:, :half]
+            values = low + (values[:, half:] - low) * weights[:, c, None, None]
+        return values[:, 0]
+
+    def cmyk_to_lab(self, cmyk):
+        """批量将 (..., 4) 的CMYK (0-100) 换算为D65 Lab"""
+        cmyk = np.asarray(cmyk, dtype=np.float64)
+        shape = cmyk.shape[:-1]
+        lab = self.interpolate(*self.locate(cmyk.reshape(-1, 4)))
+        return lab.reshape(shape + (3,))
+
+    def subdivide(self, factor):
+        """每个网格区间细分为 factor 段, 新节点上的值按原网格插值, 插值结果不变"""
+        if factor <= 1:
+            return self
+        # 多线性插值可以逐轴进行: 依次沿每个轴在相邻节点之间线性插值
+        t = np.arange(factor) / factor
+        nodes, lab = [], self.lab
+        for axis, n in enumerate(self.nodes):
+            nodes.append(np.append((n[:-1, None] + (n[1:] - n[:-1])[:, None] * t).ravel(), n[-1]))
+            low = np.moveaxis(lab, axis, 0)
+            shape = (len(nodes[-1]) - 1,) + low.shape[1:]
+            fine = (low[:-1, None] + (low[1:] - low[:-1])[:, None] * t.reshape((1, factor) + (1,) * (low.ndim - 1)))
+            lab = np.moveaxis(np.concatenate([fine.reshape(shape), low[-1:]]), 0, axis)
+        return CMYKCharacterization(nodes, lab, dict(self.source, subdivide=factor))
+
+    def node_cmyk(self, index):
+        """一维节点下标对应的CMYK值"""
+        cells = np.unravel_index(index, self.shape)
+        return np.stack([self.nodes[c][cells[c]] for c in range(4)], axis=-1)
+
+
+class PrintMatcher:
+    """按特性化数据把CMYK匹配到标准色
+
+    每个数据库的名称网格在第一次使用时建立 (有 cache_dir 时写入磁盘), 单个CMYK值的
+    查询结果按输入缓存。
+    """
+    def __init__(self, characterization, finder=None, cache_dir=None, subdivide=1, memo_size=4096):
+        self.grid = characterization.subdivide(subdivide)
+        self.finder = finder or ColorNameFinder()
+        self.cache_dir = cache_dir
+        self.memo_size = memo_size
+        self._cell_labels = {}
+        self._memo = {}
+
+    def _cache_path(self, database, names, points):
+        digest = hashlib.sha1(self.grid.digest.encode('ascii'))
+        digest.update(database.encode('utf-8'))
+        digest.update('\n'.join(names).encode('utf-8'))
+        digest.update(np.ascontiguousarray(points).tobytes())
+        return os.path.join(self.cache_dir, f'print_grid_{digest.hexdigest()[:20]}.npz')
+
+    def cell_labels(self, database):
+        """每个网格单元的最近标准色下标, 16个角点的最近标准色不一致的单元为 -1"""
+        labels = self._cell_labels.get(database)
+        if labels is not None:
+            return labels
+        names, points = self.finder.get_palette_arrays(database, 'lab')
+        path = self._cache_path(database, names, points) if self.cache_dir and names else None
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                labels = data['labels']
+        else:
+            labels = self._build_cell_labels(points) if names else None
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.savez(path, labels=labels)
+        self._cell_labels[database] = labels
+        return labels
+
+    def _build_cell_labels(self, points):
+        shape = self.grid.shape
+        nodes = nearest_palette_indices(self.grid._flat, points)[0].reshape(shape)
+        first = nodes[:-1, :-1, :-1, :-1]
+        uniform = np.ones(first.shape, dtype=bool)
+        for dc, dm, dy, dk in self.grid._corners[1:]:
+            uniform &= nodes[dc:shape[0] - 1 + dc, dm:shape[1] - 1 + dm,
+                             dy:shape[2] - 1 + dy, dk:shape[3] - 1 + dk] == first
+        dtype = np.int16 if len(points) < np.iinfo(np.int16).max else np.int32
+        return np.where(uniform, first, -1).astype(dtype)
+
+    def match_array(self, cmyk, database='all'):
+        """批量匹配 (..., 4) 的CMYK, 返回 (Lab, 下标数组, ΔE数组); 数据库为空时下标为 -1"""
+        cmyk = np.asarray(cmyk, dtype=np.float64).reshape(-1, 4)
+        cells, weights = self.grid.locate(cmyk)
+        lab = self.grid.interpolate(cells, weights)
+        names, points = self.finder.get_palette_arrays(database, 'lab')
+        if not names:
+            return lab, np.full(len(cmyk), -1, dtype=np.intp), np.full(len(cmyk), np.inf)
+        indices = self.cell_labels(database)[tuple(cells.T)].astype(np.intp)
+        unresolved = indices < 0
+        if unresolved.any():
+            indices[unresolved] = nearest_palette_indices(lab[unresolved], points)[0]
+        delta_e = np.sqrt(((lab - points[indices]) ** 2).sum(axis=1))
+        return lab, indices, delta_e
+
+    def match(self, cmyk, database='all'):
+        """单个CMYK值的最接近标准色, 返回 (名称, ΔE); 重复的查询直接返回缓存结果"""
+        key = (database,) + tuple(cmyk)
+        result = self._memo.get(key)
+        if result is None:
+            names = self.finder.get_palette_arrays(database, 'lab')[0]
+            _, indices, delta_e = self.match_array([cmyk], database)
+            result = (names[indices[0]] if names else "未知颜色", float(delta_e[0]))
+            if len(self._memo) >= self.memo_size:
+                del self._memo[next(iter(self._memo))]
+            self._memo[key] = result
+        return result
+
+    def recipe(self, lab):
+        """印刷条件下最接近某个Lab颜色的网格节点, 返回 (CMYK元组, ΔE)
+
+        ΔE 明显大于网格间距带来的误差时, 该颜色超出了这一印刷条件的色域。
+        """
+        index, squared = nearest_palette_indices(np.asarray(lab, dtype=np.float64).reshape(1, 3), self.grid._flat)
+        return tuple(float(v) for v in self.grid.node_cmyk(index[0])), float(np.sqrt(squared[0]))
+
+
+def find_entry(finder, database, entry):
+    """按完整名称、名称前缀或RGB值查找数据库中的颜色, 返回 (名称, Lab) 或 None"""
+    names, points = finder.get_palette_arrays(database, 'lab')
+    for candidates in ([i for i, name in enumerate(names) if name == entry],
+                       [i for i, name in enumerate(names) if name.lower().startswith(entry.lower())]):
+        if candidates:
+            return names[candidates[0]], points[candidates[0]]
+    rgb = parse_rgb_value(entry)
+    if rgb is not None:
+        _, rgb_points = finder.get_palette_arrays(database, 'rgb')
+        hits = np.nonzero((rgb_points == np.array(rgb)).all(axis=1))[0]
+        if len(hits):
+            return names[hits[0]], points[hits[0]]
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按印刷特性化数据将CMYK与Pantone/RAL等标准色匹配')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='将测量数据或ICC配置文件保存为特性化网格文件')
+    build.add_argument('characterization', help='CGATS/CSV测量数据或CMYK的ICC配置文件')
+    build.add_argument('-o', '--output', required=True, help='输出的 .npz 文件')
+    match = subparsers.add_parser('match', help='查找CMYK值最接近的标准色')
+    match.add_argument('characterization', help='特性化网格文件、测量数据或ICC配置文件')
+    match.add_argument('colors', nargs='+', help='CMYK值, 如 "0, 100, 100, 0" 或 "C20 M0 Y80 K10"')
+    recipe = subparsers.add_parser('recipe', help='查找最接近某个标准色的CMYK')
+    recipe.add_argument('characterization', help='特性化网格文件、测量数据或ICC配置文件')
+    recipe.add_argument('entries', nargs='+', help='颜色名称 (可为前缀, 如 "RAL 3020") 或RGB值')
+    for sub in (build, match, recipe):
+        sub.add_argument('--steps', type=int, default=DEFAULT_ICC_STEPS, help='ICC配置文件的采样节点数 (默认: 17)')
+    for sub in (match, recipe):
+        sub.add_argument('-d', '--database', action='append', choices=['all'] + list(DATABASES),
+                         help='标准色数据库, 可重复指定 (默认: pantone 和 ral)')
+        sub.add_argument('--subdivide', type=int, default=1, help='名称网格在特性化网格上的细分倍数 (默认: 1)')
+        sub.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='名称网格的缓存目录')
+    args = parser.parse_args(argv)
+
+    try:
+        characterization = CMYKCharacterization.load(args.characterization, args.steps)
+    except (OSError, ValueError) as e:
+        print(f"无法读取特性化数据: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == 'build':
+        characterization.save(args.output)
+        print(f"已保存 {'×'.join(map(str, characterization.shape))} 特性化网格: {args.output}", file=sys.stderr)
+        return 0
+
+    matcher = PrintMatcher(characterization, cache_dir=args.cache_dir, subdivide=args.subdivide)
+    databases = args.database or list(PRINT_DATABASES)
+    status = 0
+    if args.command == 'match':
+        for text in args.colors:
+            cmyk = parse_cmyk_value(text)
+            if cmyk is None:
+                print(f"无法解析CMYK值: {text}", file=sys.stderr)
+                status = 1
+                continue
+            lab = characterization.cmyk_to_lab(cmyk)
+            matches = {}
+            for database in databases:
+                name, delta_e = matcher.match(cmyk, database)
+                matches[database] = {'name': name, 'delta_e': round(delta_e, 2)}
+            print(json.dumps({'input': text, 'cmyk': list(cmyk), 'lab': [round(v, 2) for v in lab.tolist()],
+                              'matches': matches}, ensure_ascii=False))
+        return status
+
+    for entry in args.entries:
+        for database in databases:
+            found = find_entry(matcher.finder, database, entry)
+            if found is None:
+                continue
+            name, lab = found
+            cmyk, delta_e = matcher.recipe(lab)
+            print(json.dumps({'input': entry, 'database': database, 'name': name,
+                              'cmyk': [round(v, 1) for v in cmyk], 'delta_e': round(delta_e, 2)},
+                             ensure_ascii=False))
+            break
+        else:
+            print(f"没有找到: {entry}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+import color_convert as cc
+from color_core import ColorNameFinder, rgb_array_to_lab, rgb_to_lab
+
+EDGES = [0, 1, 2, 127, 128, 254, 255]
+SCALAR = {'CMYK': 'rgb_to_cmyk', 'HSV': 'rgb_to_hsv', 'HSL': 'rgb_to_hsl'}
+ROUND_TRIPS = [
+    (cc.rgb_array_to_cmyk, cc.cmyk_array_to_rgb),
+    (cc.rgb_array_to_hsv, cc.hsv_array_to_rgb),
+    (cc.rgb_array_to_hsl, cc.hsl_array_to_rgb),
+    (cc.rgb_array_to_xyz, cc.xyz_array_to_rgb),
+    (rgb_array_to_lab, cc.lab_array_to_rgb),
+    (cc.rgb_array_to_lch, cc.lch_array_to_rgb),
+    (cc.rgb_array_to_oklab, cc.oklab_array_to_rgb),
+    (cc.rgb_array_to_cam16ucs, cc.cam16ucs_array_to_rgb),
+]
+
+
+@pytest.fixture(scope='module')
+def finder():
+    return ColorNameFinder(conversion_cache_size=0)
+
+
+def channel_sweeps():
+    """每个通道取遍0-255, 其余两个通道取边界附近的值"""
+    full = np.arange(256)
+    colors = []
+    for channel in range(3):
+        for a in EDGES:
+            for b in EDGES:
+                block = np.empty((256, 3), dtype=np.int32)
+                block[:, channel] = full
+                block[:, (channel + 1) % 3] = a
+                block[:, (channel + 2) % 3] = b
+                colors.append(block)
+    return np.unique(np.concatenate(colors), axis=0)
+
+
+def grid(step):
+    values = np.unique(np.append(np.arange(0, 256, step), 255))
+    return np.stack(np.meshgrid(values, values, values, indexing='ij'), axis=-1).reshape(-1, 3).astype(np.int32)
+
+
+def assert_formats_equal(finder, rgb):
+    vectorized = cc.format_color_formats(rgb)
+    for (r, g, b), formats in zip(rgb.tolist(), vectorized):
+        assert formats == finder.get_color_formats(r, g, b), (r, g, b)
+
+
+def test_formats_match_scalar_on_channel_sweeps(finder):
+    assert_formats_equal(finder, channel_sweeps())
+
+
+def test_formats_match_scalar_on_grid(finder):
+    assert_formats_equal(finder, grid(7))
+
+
+def test_rounding_boundaries_match_scalar(finder):
+    """未取整的值恰好 (或几乎) 为 .5 的颜色, 取整方向必须与标量版本的 round() 相同"""
+    a, b = np.meshgrid(np.arange(256), np.arange(256), indexing='ij')
+    rgb = np.concatenate([np.stack([a.ravel(), b.ravel(), np.full(a.size, c)], axis=1) for c in (0, 51, 128, 255)])
+    raw = {'CMYK': cc.rgb_array_to_cmyk(rgb), 'HSV': cc.rgb_array_to_hsv(rgb), 'HSL': cc.rgb_array_to_hsl(rgb)}
+    rounded = cc.color_format_arrays(rgb)
+    checked = 0
+    for name, values in raw.items():
+        boundary = (np.abs(values % 1 - 0.5) < 1e-6).any(axis=1)
+        for color, expected in zip(rgb[boundary].tolist(), rounded[name][boundary].tolist()):
+            assert list(getattr(finder, SCALAR[name])(*color)) == expected, (name, color)
+            checked += 1
+    assert checked > 1000
+
+
+def test_extremes(finder):
+    rgb = np.array([[0, 0, 0], [255, 255, 255], [255, 0, 0], [0, 255, 255]])
+    assert_formats_equal(finder, rgb)
+    assert cc.format_color_formats(rgb)[0]['CMYK'] == 'CMYK(0%, 0%, 0%, 100%)'
+
+
+def test_lab_matches_scalar():
+    rgb = grid(17)
+    np.testing.assert_allclose(rgb_array_to_lab(rgb), [rgb_to_lab(color) for color in rgb.tolist()], atol=1e-9)
+
+
+@pytest.mark.parametrize('forward, backward', ROUND_TRIPS)
+def test_round_trips(forward, backward):
+    rgb = grid(15)
+    np.testing.assert_allclose(backward(forward(rgb)), rgb, atol=1e-6)
+
+
+def test_hex_round_trip():
+    rgb = grid(15)
+    assert np.array_equal(cc.hex_array_to_rgb(cc.rgb_array_to_hex(rgb)), rgb)
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+import color_locale
+from color_core import DATABASES, DEFAULT_LOCALE, LOCALES, ColorNameFinder
+from color_histogram import ColorHistogram
+from color_parser import ColorParser
+from color_search import ColorSearchIndex
+from compiled_palette import CompiledPalettes
+from palette_generator import PaletteGenerator
+
+OTHER_LOCALES = [locale for locale in LOCALES if locale != DEFAULT_LOCALE]
+
+
+@pytest.fixture(scope='module')
+def palettes():
+    return CompiledPalettes.load(finder=ColorNameFinder(preload=True))
+
+
+@pytest.fixture
+def finder():
+    """每个测试使用新的实例, 切换语言不影响其他测试"""
+    return ColorNameFinder(preload=True)
+
+
+@pytest.fixture(scope='module')
+def colors():
+    return np.random.default_rng(0).integers(0, 256, (5000, 3), dtype=np.uint8)
+
+
+def matched_rgb(finder, colors, database):
+    indices, _ = finder.find_closest_indices(colors, database, 'lab')
+    return np.array(list(finder.get_color_table(database)))[indices]
+
+
+@pytest.mark.parametrize('locale', list(LOCALES))
+def test_compiled_tables_match_direct_merge(palettes, locale):
+    assert palettes.locale_tables(locale) == color_locale.locale_tables(ColorNameFinder(), locale)
+
+
+@pytest.mark.parametrize('locale', OTHER_LOCALES)
+def test_locale_tables_keep_colors(finder, palettes, locale):
+    """其他语言的表只改变名称, 颜色与原始表相同"""
+    for database, table in palettes.locale_tables(locale).items():
+        assert set(table) == set(finder.get_database(database, original=True))
+
+
+def test_english_names_found(finder, palettes):
+    """合并后的每个英文名称都能由 color_parser 和 color_search 找到对应的RGB"""
+    parser = ColorParser(finder)
+    index = ColorSearchIndex(finder, palettes=palettes)
+    missing = []
+    for database in color_locale.ENGLISH_FILES:
+        for rgb, names in palettes.locale_records(database):
+            # 只有英文的颜色不在中文的表中; 同一RGB的其他英文写法如 grey/gray 不保留
+            name = names['en']
+            if not names['zh'] or not name or name == names['zh']:
+                continue
+            parsed = parser.parse(name)
+            found = any(tuple(r['rgb']) == rgb for r in index.search(name, 50, [database]))
+            if parsed is None or not found:
+                missing.append((database, name))
+    assert missing == []
+
+
+@pytest.mark.parametrize('locale', OTHER_LOCALES)
+def test_switch_keeps_matches(finder, palettes, colors, locale):
+    """各语言匹配到的颜色完全相同, 来回切换后中文的结果与从未切换时一致"""
+    databases = ['all'] + list(DATABASES)
+    expected = {database: finder.find_closest_indices(colors, database, 'lab') for database in databases}
+    matched = {database: matched_rgb(finder, colors, database) for database in databases}
+    finder.set_locale(locale, palettes.locale_tables(locale))
+    assert finder.locale == locale
+    for database in databases:
+        assert np.array_equal(matched_rgb(finder, colors, database), matched[database]), database
+    finder.set_locale(DEFAULT_LOCALE)
+    finder.set_locale(locale)
+    finder.set_locale(DEFAULT_LOCALE)
+    for database, (indices, distances) in expected.items():
+        again = finder.find_closest_indices(colors, database, 'lab')
+        assert np.array_equal(again[0], indices) and np.array_equal(again[1], distances), database
+
+
+def test_switch_without_tables(finder, palettes):
+    finder.set_locale('en')
+    assert finder.get_color_table('css') == palettes.locale_tables('en')['css']
+    assert finder.get_database('css', original=True) != finder.get_color_table('css')
+
+
+def test_histogram_rollup_follows_locale(finder, palettes, colors):
+    histogram = ColorHistogram()
+    histogram.add_pixels(colors)
+    chinese = histogram.rollup(finder, 'css')
+    finder.set_locale('en', palettes.locale_tables('en'))
+    english = histogram.rollup(finder, 'css')
+    table = finder.get_color_table('css')
+    assert english != chinese and all(name in table.values() for name, _, _ in english)
+    assert [count for _, count, _ in english] == [count for _, count, _ in chinese]
+    finder.set_locale(DEFAULT_LOCALE)
+    assert histogram.rollup(finder, 'css') == chinese
+
+
+def test_palette_generator_follows_locale(finder, palettes):
+    generator = PaletteGenerator(finder, 'css')
+    chinese = generator.variations((200, 80, 40))
+    finder.set_locale('en', palettes.locale_tables('en'))
+    english = generator.variations((200, 80, 40))
+    names = set(finder.get_color_table('css').values())
+    assert all(stop['name'] in names for stops in english.values() for stop in stops)
+    assert [[stop['rgb'] for stop in stops] for stops in english.values()] == \
+        [[stop['rgb'] for stop in stops] for stops in chinese.values()]
+    finder.set_locale(DEFAULT_LOCALE)
+    assert generator.variations((200, 80, 40)) is chinese
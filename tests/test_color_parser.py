@@ -0,0 +1,96 @@
+import pytest
+
+from color_core import ColorNameFinder
+from color_parser import ColorParser
+
+MALFORMED = ['#GGHHII', 'rgb(300, 0, 0)', 'hsl(10, 200%, 50%)', 'cmyk(1, 2, 3)', 'RAL 99999',
+             '不存在的颜色', '1, 2', 'rgb(1, 2, x)', '#12345', 'hsv()']
+
+
+@pytest.fixture(scope='module')
+def finder():
+    return ColorNameFinder()
+
+
+@pytest.fixture(scope='module')
+def parser(finder):
+    return ColorParser(finder)
+
+
+@pytest.mark.parametrize('text, rgb, notation', [
+    ('#FF0000', (255, 0, 0), 'hex'),
+    ('ff0000', (255, 0, 0), 'hex'),
+    ('#f00', (255, 0, 0), 'hex'),
+    ('(1, 2, 3)', (1, 2, 3), 'rgb'),
+    ('1, 2, 3', (1, 2, 3), 'rgb'),
+    ('rgb(1 2 3)', (1, 2, 3), 'rgb'),
+    ('rgb(100%, 0%, 0%)', (255, 0, 0), 'rgb'),
+    ('rgba(255,0,0,0.5)', (255, 0, 0), 'rgb'),
+    ('hsl(0, 100%, 50%)', (255, 0, 0), 'hsl'),
+    ('HSV(120°, 100%, 100%)', (0, 255, 0), 'hsv'),
+    ('hsb(240,100%,100%)', (0, 0, 255), 'hsv'),
+    ('cmyk(0%,100%,100%,0%)', (255, 0, 0), 'cmyk'),
+])
+def test_notations(parser, text, rgb, notation):
+    assert parser.parse(text) == (rgb, notation, None)
+
+
+@pytest.mark.parametrize('text, database, name', [
+    ('RAL 3020', 'ral', 'RAL 3020 鲑鱼红'),
+    ('ral3020', 'ral', 'RAL 3020 鲑鱼红'),
+    ('PANTONE 14-1210 TCX', 'pantone', 'PANTONE 14-1210 TCX Almond Buff'),
+    ('14-1210 tcx', 'pantone', 'PANTONE 14-1210 TCX Almond Buff'),
+    ('GB 01-01', 'gb', '白'),
+])
+def test_codes(finder, parser, text, database, name):
+    rgb, notation, source = parser.parse(text)
+    assert notation == 'code' and source == (database, name)
+    assert finder.get_color_table(database)[rgb] == name
+
+
+def test_ncs_codes(finder, parser):
+    for code, name, rgb in list(finder.iter_color_entries('ncs'))[:50]:
+        assert parser.parse(code)[0] == rgb
+
+
+@pytest.mark.parametrize('text, rgb', [('aliceblue', (240, 248, 255)), ('AliceBlue', (240, 248, 255)),
+                                       ('朱红', (255, 56, 0))])
+def test_names(parser, text, rgb):
+    assert parser.parse(text)[0] == rgb
+
+
+@pytest.mark.parametrize('text', MALFORMED)
+def test_malformed(parser, text):
+    assert parser.parse(text) is None
+    assert parser.parse_line(text) is None
+
+
+def test_format_round_trip(finder, parser):
+    """RGB/HEX 完全一致, HSV/HSL/CMYK 取整后最多相差几级"""
+    worst = {}
+    for r in range(0, 256, 15):
+        for g in range(0, 256, 15):
+            for b in range(0, 256, 15):
+                for key, text in finder.get_color_formats(r, g, b).items():
+                    parsed = parser.parse(text)
+                    assert parsed is not None, text
+                    error = max(abs(x - y) for x, y in zip(parsed[0], (r, g, b)))
+                    worst[key] = max(worst.get(key, 0), error)
+    assert worst['RGB'] == 0 and worst['HEX'] == 0
+    assert max(worst.values()) <= 12
+
+
+def test_parse_line_fields(parser):
+    assert parser.parse_line('标题,#FF0000,备注') == ((255, 0, 0), 'hex', None)
+    assert parser.parse_line('序号\tRAL 3020')[2] == ('ral', 'RAL 3020 鲑鱼红')
+    assert parser.parse_line('编号7,10,20,30') == ((10, 20, 30), 'rgb', None)
+    assert parser.parse_line('a,b,c') is None
+
+
+def test_parse_lines_reports_errors(parser):
+    lines = ['#FF0000', '', 'rgb(300, 0, 0)', '朱红', '  ', '#12345', 'hsl(0, 100%, 50%)']
+    errors = []
+    results = list(parser.parse_lines(lines, errors))
+    assert [line_number for line_number, _, _ in results] == [1, 3, 4, 6, 7]
+    assert errors == [(3, 'rgb(300, 0, 0)'), (6, '#12345')]
+    assert all(result is not None for line_number, _, result in results if line_number not in (3, 6))
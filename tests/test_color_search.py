@@ -0,0 +1,105 @@
+import pytest
+
+from color_core import ColorNameFinder
+from color_search import ColorSearchIndex
+from compiled_palette import CompiledPalettes
+from transliteration import pinyin_keys, transliteration_keys
+
+FUZZY_CASES = [('朱红', '红'), ('杏仁黄', '仁黄'), ('樱桃红', '樱挑红'), ('RAL 3020 鲑鱼红', 'ral 302 鲑鱼'),
+               ('PANTONE 14-1210 TCX Almond Buff', 'almond buf'), ('杏仁黄', 'xingrenhuan'),
+               ('杏仁黄', 'xinrenhuang'), ('桜色', 'sakura'), ('紅梅色', 'kobai')]
+
+
+@pytest.fixture(scope='module')
+def finder():
+    return ColorNameFinder(preload=True)
+
+
+@pytest.fixture(scope='module')
+def palettes(finder):
+    return CompiledPalettes.load(finder=finder)
+
+
+@pytest.fixture(scope='module')
+def index(finder, palettes):
+    return ColorSearchIndex(finder, palettes=palettes)
+
+
+def found(index, query, entry_id, match=None, limit=50):
+    database, _, name, rgb = index.entries[entry_id]
+    return any(result['name'] == name and tuple(result['rgb']) == rgb and (match is None or result['match'] == match)
+               for result in index.search(query, limit, [database]))
+
+
+def test_exact_and_prefix(index):
+    """每个颜色都能按完整名称和编号精确找到, 输入名称的最后一个字之前就能找到"""
+    missing = []
+    for entry_id, (database, code, name, _) in enumerate(index.entries):
+        queries = [(name, 'exact'), (name[:-1] if len(name) > 2 else name, None)] + ([(code, 'exact')] if code else [])
+        missing += [(database, name, query) for query, match in queries if not found(index, query, entry_id, match)]
+    assert missing == []
+
+
+@pytest.mark.parametrize('query, name', [('RAL 3020', 'RAL 3020 鲑鱼红'), ('ral3020', 'RAL 3020 鲑鱼红'),
+                                         ('3020', 'RAL 3020 鲑鱼红'), ('朱红', '朱红'), ('aliceblue', '爱丽丝蓝')])
+def test_exact_first(index, query, name):
+    result = index.search(query, 5)[0]
+    assert result['name'] == name and result['match'] == 'exact' and result['score'] == 1.0
+
+
+@pytest.mark.parametrize('name, query', FUZZY_CASES)
+def test_fuzzy(index, name, query):
+    assert any(result['name'] == name for result in index.search(query, 50))
+
+
+def test_results_are_unique_and_limited(index):
+    results = index.search('红', 20)
+    assert len(results) == 20
+    assert len({(r['database'], r['name'], tuple(r['rgb'])) for r in results}) == 20
+    assert index.search('', 20) == [] and index.search('红', 0) == []
+
+
+def test_databases_filter(index):
+    results = index.search('红', 50, ['ral'])
+    assert results and all(result['database'] == 'ral' for result in results)
+
+
+def test_entry_without_score(index):
+    result = index.entry(0)
+    database, code, name, rgb = index.entries[0]
+    assert result['name'] == name and tuple(result['rgb']) == rgb
+    assert result['match'] is None and result['score'] is None
+    assert result['hex'] == '#%02X%02X%02X' % rgb
+
+
+def test_pinyin_keys():
+    assert pinyin_keys('杏仁黄') == ['xingrenhuang', 'xrh']
+    assert pinyin_keys('绿色') == ['lvse', 'luse', 'ls']
+
+
+@pytest.mark.parametrize('query, name', [('xingrenhuang', '杏仁黄'), ('xrh', '杏仁黄'), ('lvse', '绿色'),
+                                         ('luse', '绿色'), ('koubaiiro', '紅梅色'), ('kobaiiro', '紅梅色')])
+def test_transliteration_exact(index, query, name):
+    results = index.search(query, 10)
+    assert any(result['name'] == name and result['match'] == 'exact' for result in results)
+
+
+def test_romaji_prefix(index):
+    result = index.search('sakura', 5)[0]
+    assert result['name'] == '桜色' and result['match'] == 'prefix'
+
+
+def test_compiled_transliterations(finder, palettes):
+    """编译后调色板中的键与由读音表生成的键相同"""
+    for database in palettes.databases:
+        compiled = palettes.transliterations(database)
+        for _, name, _ in finder.iter_color_entries(database):
+            assert compiled[name] == transliteration_keys(database, name), (database, name)
+
+
+def test_every_transliteration_key_found(index, palettes):
+    transliterated = {(database, name): keys for database in palettes.databases
+                      for name, keys in palettes.transliterations(database).items()}
+    missing = [(database, name, key) for entry_id, (database, _, name, _) in enumerate(index.entries)
+               for key in transliterated.get((database, name), ()) if not found(index, key, entry_id, 'exact')]
+    assert missing == []
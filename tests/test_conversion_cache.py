@@ -0,0 +1,70 @@
+import random
+import threading
+
+import numpy as np
+
+import color_core
+from color_core import ColorNameFinder, rgb_to_lab
+
+
+def test_linearization_table_matches_formula():
+    assert all(color_core.SRGB_TO_LINEAR[c] == color_core._linearize(c) for c in range(256))
+
+
+def test_lab_table_matches_formula():
+    rng = np.random.default_rng(0)
+    for rgb in rng.integers(0, 256, (1024, 3)).tolist():
+        assert rgb_to_lab(tuple(rgb)) == rgb_to_lab(tuple(float(v) for v in rgb))
+
+
+def test_cached_results_equal_uncached():
+    plain = ColorNameFinder(conversion_cache_size=0)
+    cached = ColorNameFinder(conversion_cache_size=64)
+    rng = np.random.default_rng(1)
+    colors = [tuple(c) for c in rng.integers(0, 256, (200, 3)).tolist()] * 2
+    for color in colors:
+        assert cached.get_color_formats(*color) == plain.get_color_formats(*color)
+        assert cached.query_lab(color) == plain.query_lab(color)
+    assert len(cached._format_cache) <= 64
+
+
+def test_numpy_scalar_keys_do_not_collide():
+    finder = ColorNameFinder(conversion_cache_size=64)
+    first = finder.get_color_formats(np.uint8(10), np.uint8(20), np.uint8(30))
+    second = finder.get_color_formats(np.uint8(99), np.uint8(77), np.uint8(30))
+    assert first['RGB'] == 'RGB(10, 20, 30)'
+    assert second['RGB'] == 'RGB(99, 77, 30)'
+    assert finder.get_color_formats(10, 20, 30) == first
+
+
+def test_out_of_range_channels_bypass_cache():
+    finder = ColorNameFinder(conversion_cache_size=64)
+    assert finder.get_color_formats(0, 256, 0)['RGB'] == 'RGB(0, 256, 0)'
+    assert finder.get_color_formats(1, 0, 0)['RGB'] == 'RGB(1, 0, 0)'
+    assert list(finder._format_cache) == [1 << 16]
+
+
+def test_float_channels_bypass_cache():
+    finder = ColorNameFinder(conversion_cache_size=64)
+    finder.query_lab((1.5, 2.0, 3.0))
+    assert not finder._query_caches['lab']
+
+
+def test_concurrent_eviction():
+    finder = ColorNameFinder(conversion_cache_size=16)
+    errors = []
+
+    def run(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(20000):
+                finder.query_lab((rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('PIL.ImageCms')
+
+import color_profile as cp  # noqa: E402
+from benchmarks.bench_display_lut import build_profile, littlecms_convert, primaries_matrix  # noqa: E402
+from color_convert import D65_WHITE, RGB_TO_XYZ  # noqa: E402
+
+P3 = primaries_matrix([(0.680, 0.320), (0.265, 0.690), (0.150, 0.060)], D65_WHITE)
+PROFILES = [('srgb', RGB_TO_XYZ, False), ('srgb-sampled', RGB_TO_XYZ, True),
+            ('p3', P3, False), ('p3-sampled', P3, True)]
+
+
+@pytest.fixture(scope='module')
+def rgb():
+    return np.random.default_rng(0).integers(0, 256, (50000, 3), dtype=np.uint8)
+
+
+def load_lut(directory, matrix, sampled):
+    data = build_profile(matrix, sampled)
+    path = os.path.join(directory, 'profile.icc')
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data, cp.DisplayLUT.from_icc(path)
+
+
+@pytest.mark.parametrize('name, matrix, sampled', PROFILES)
+def test_matches_littlecms(tmp_path, rgb, name, matrix, sampled):
+    """矩阵/曲线型的查找表与 LittleCMS 逐像素转换最多相差1级"""
+    data, lut = load_lut(tmp_path, matrix, sampled)
+    assert np.abs(lut.apply(rgb).astype(np.int32) - littlecms_convert(data, rgb)).max() <= 1
+
+
+def test_srgb_profile_is_identity(tmp_path, rgb):
+    _, lut = load_lut(tmp_path, RGB_TO_XYZ, False)
+    assert np.array_equal(lut.apply(rgb), rgb)
+
+
+@pytest.mark.parametrize('name, matrix, sampled', PROFILES[::2])
+def test_apply_pixel_matches_apply(tmp_path, rgb, name, matrix, sampled):
+    _, lut = load_lut(tmp_path, matrix, sampled)
+    converted = lut.apply(rgb[:2000]).tolist()
+    assert [list(lut.apply_pixel(r, g, b)) for r, g, b in rgb[:2000].tolist()] == converted
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from color_convert import to_rgb8
+from color_core import ColorNameFinder, rgb_array_to_lab, srgb_array_to_linear
+from color_histogram import ColorHistogram
+from image_analysis import quantize_pixels
+
+DTYPES = [np.uint16, np.float32, np.float64]
+
+
+def as_dtype(rgb, dtype):
+    """同一组8位颜色的其他表示: uint16 为 v*257, 浮点为 0-255 标度"""
+    if dtype == np.uint16:
+        return rgb.astype(np.uint16) * 257
+    return rgb.astype(dtype)
+
+
+@pytest.fixture(scope='module')
+def finder():
+    return ColorNameFinder()
+
+
+@pytest.fixture(scope='module')
+def rgb8():
+    rng = np.random.default_rng(0)
+    # 包括每个通道的全部256个值
+    ramp = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+    return np.concatenate([ramp, rng.integers(0, 256, (20000, 3), dtype=np.uint8)])
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_linearization_and_lab(rgb8, dtype):
+    tolerance = 1e-6 if dtype != np.float64 else 1e-12
+    np.testing.assert_allclose(srgb_array_to_linear(as_dtype(rgb8, dtype)), srgb_array_to_linear(rgb8),
+                               atol=tolerance)
+    np.testing.assert_allclose(rgb_array_to_lab(as_dtype(rgb8, dtype)), rgb_array_to_lab(rgb8),
+                               atol=1e-3 if dtype != np.float64 else 1e-9)
+
+
+@pytest.mark.parametrize('metric', ['rgb', 'lab'])
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_nearest_matches_uint8(finder, rgb8, dtype, metric):
+    expected_indices, expected_distances = finder.find_closest_indices(rgb8, 'all', metric)
+    indices, distances = finder.find_closest_indices(as_dtype(rgb8, dtype), 'all', metric)
+    # 精度较低的类型只允许在几乎等距的颜色之间选择不同
+    assert np.abs(distances - expected_distances).max() < 1e-3
+    if dtype == np.float64:
+        assert np.array_equal(indices, expected_indices)
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_rgb_histogram_bins_match_uint8(rgb8, dtype):
+    histogram = ColorHistogram(16)
+    assert np.array_equal(histogram.bin_indices(as_dtype(rgb8, dtype)), histogram.bin_indices(rgb8))
+
+
+def test_lab_histogram_float64_matches_uint8(rgb8):
+    histogram = ColorHistogram(16, 'lab')
+    assert np.array_equal(histogram.bin_indices(rgb8.astype(np.float64)), histogram.bin_indices(rgb8))
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_quantize_matches_uint8(rgb8, dtype):
+    colors, counts = quantize_pixels(as_dtype(rgb8, dtype))
+    expected_colors, expected_counts = quantize_pixels(rgb8)
+    assert np.array_equal(counts, expected_counts)
+    assert np.abs(colors - expected_colors).max() < 1e-3
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_to_rgb8_round_trip(rgb8, dtype):
+    assert np.array_equal(to_rgb8(as_dtype(rgb8, dtype)), rgb8)
+
+
+def test_numpy_scalar_channels(finder):
+    for metric in ('rgb', 'lab', 'oklab'):
+        color = (np.uint8(0), np.uint8(0), np.uint8(5))
+        assert finder.find_closest_color(color, 'css', metric) == finder.find_closest_color((0, 0, 5), 'css', metric)
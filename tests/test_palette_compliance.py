@@ -0,0 +1,41 @@
+import numpy as np
+
+from palette_compliance import build_report, check_compliance, extract_colors
+
+STYLESHEET = """#add { color: #abc; }
+#bad,
+#fed {
+  background: #FFF;
+  border: 1px solid rgb(1, 2, 3);
+}
+a:hover #cab > p { fill: #123456 }
+#dab
+{
+  color: #00ff00 !important;
+}
+$brand: #0a0b0c;
+"""
+
+
+def test_stylesheet_ids_are_not_colors():
+    found = extract_colors(STYLESHEET.splitlines(True))
+    assert [(text, line) for _, line, text in found] == [
+        ('#abc', 1), ('#FFF', 4), ('rgb(1, 2, 3)', 5), ('#123456', 7), ('#00ff00', 10), ('#0a0b0c', 12)]
+
+
+def test_plain_color_lists_unchanged():
+    found = extract_colors(['#FF0000', '255, 0, 0', 'abc', "<rect fill='#0f0'/>"])
+    assert [rgb for rgb, _, _ in found] == [(255, 0, 0), (255, 0, 0), (170, 187, 204), (0, 255, 0)]
+
+
+def test_report_locations_include_file():
+    found = [((18, 52, 86), 'a.css', 1, '#123456'), ((18, 52, 86), 'b.css', 1, '#123456'),
+             ((255, 0, 0), 'b.css', 2, '#f00')]
+    palette = np.array([[255, 0, 0], [0, 0, 255]], dtype=np.int32)
+    rgb = np.array([item[0] for item in found], dtype=np.int32)
+    result = check_compliance(rgb, palette, tolerance=2.0)
+    assert result['passed'].tolist() == [False, False, True]
+    report = build_report(found, ['red', 'blue'], palette, result, 2.0, 'lab')
+    assert report['failed'] == 2
+    assert report['violations'][0]['locations'] == ['a.css:1', 'b.css:1']
+    assert report['violations'][0]['nearest'] == 'blue'
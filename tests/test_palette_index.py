@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from color_core import (DATABASES, METRICS, ColorNameFinder, PaletteIndex, nearest_palette_indices,
+                        rgb_array_to_metric)
+
+
+@pytest.fixture(scope='module')
+def finder():
+    return ColorNameFinder()
+
+
+def linear_scan(points, query):
+    """并列时取下标最小的点"""
+    distances = [sum((p - q) ** 2 for p, q in zip(point, query)) for point in points]
+    best = min(range(len(points)), key=lambda i: (distances[i], i))
+    return best, distances[best]
+
+
+@pytest.mark.parametrize('metric', METRICS)
+@pytest.mark.parametrize('database', ['all', 'css', 'ral', 'pantone'])
+def test_kd_tree_matches_linear_scan(finder, database, metric):
+    names, index = finder.get_palette_index(database, metric)
+    for color in np.random.default_rng(0).integers(0, 256, (300, 3)).tolist():
+        query = finder.query_point(tuple(color), metric)
+        assert index.nearest(query) == linear_scan(index.points, query)
+
+
+def test_ties_choose_lowest_index():
+    rng = np.random.default_rng(1)
+    points = [tuple(p) for p in rng.integers(0, 8, (200, 3)).tolist()]
+    index = PaletteIndex(points)
+    for query in rng.integers(0, 8, (500, 3)).tolist():
+        assert index.nearest(query) == linear_scan(points, query)
+
+
+def test_empty_index():
+    assert PaletteIndex([]).nearest((0, 0, 0)) == (-1, float('inf'))
+
+
+@pytest.mark.parametrize('metric', METRICS)
+def test_scalar_matches_batch(finder, metric):
+    colors = np.random.default_rng(2).integers(0, 256, (500, 3))
+    names, points = finder.get_palette_arrays('all', metric)
+    indices, _ = nearest_palette_indices(rgb_array_to_metric(colors, metric), points)
+    for color, i in zip(colors.tolist(), indices.tolist()):
+        assert finder.find_closest_color(tuple(color), 'all', metric)[0] == names[i]
+
+
+def test_every_database_builds(finder):
+    for database in DATABASES:
+        names, index = finder.get_palette_index(database, 'lab')
+        assert len(names) == len(index.points) == len(finder.get_color_table(database))
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+import print_match as pm
+from benchmarks.bench_print_match import build_cmyk_profile, print_model, write_cgats
+from color_core import ColorNameFinder, nearest_palette_indices
+
+STEPS = 9
+
+
+@pytest.fixture(scope='module')
+def finder():
+    return ColorNameFinder()
+
+
+@pytest.fixture(scope='module')
+def model():
+    """(CMYK节点, 模型的D65 Lab), 使用 bench_print_match 的模拟印刷条件"""
+    nodes = np.linspace(0, 100, STEPS)
+    cmyk = np.stack(np.meshgrid(nodes, nodes, nodes, nodes, indexing='ij'), axis=-1).reshape(-1, 4)
+    return cmyk, print_model(cmyk)
+
+
+@pytest.fixture(scope='module')
+def characterization(model, tmp_path_factory):
+    cmyk, lab = model
+    path = os.path.join(tmp_path_factory.mktemp('print'), 'characterization.txt')
+    # 倒序写入, 读取时应重新排成网格
+    write_cgats(path, cmyk[::-1], pm.d65_lab_to_d50(lab)[::-1])
+    return pm.CMYKCharacterization.load(path)
+
+
+def test_measurement_grid_matches_model(characterization, model):
+    assert np.abs(characterization._flat - model[1]).max() < 1e-3
+
+
+def test_icc_profile_matches_model(model, tmp_path):
+    """LittleCMS 的节点取整到8位CMYK, 按模型在取整后的节点上比较, 差异在8位Lab的量化误差以内"""
+    pytest.importorskip('PIL.ImageCms')
+    path = os.path.join(tmp_path, 'printer.icc')
+    with open(path, 'wb') as f:
+        f.write(build_cmyk_profile(pm.d65_lab_to_d50(model[1]), STEPS))
+    icc = pm.CMYKCharacterization.load(path, STEPS)
+    rounded = np.stack(np.meshgrid(*icc.nodes, indexing='ij'), axis=-1).reshape(-1, 4)
+    assert np.sqrt(((icc._flat - print_model(rounded)) ** 2).sum(axis=1)).max() <= 1.5
+
+
+@pytest.mark.parametrize('subdivide', [1, 2])
+@pytest.mark.parametrize('database', ['pantone', 'ral', 'all'])
+def test_cell_labels_match_direct_search(characterization, finder, tmp_path, database, subdivide):
+    """名称网格的查询结果与逐个在Lab中搜索的结果完全一致, 读取磁盘缓存后也相同"""
+    queries = np.random.default_rng(0).uniform(0, 100, (20000, 4))
+    queries[::2] = np.rint(queries[::2])
+    _, points = finder.get_palette_arrays(database, 'lab')
+    matcher = pm.PrintMatcher(characterization, finder, str(tmp_path), subdivide)
+    lab, indices, delta_e = matcher.match_array(queries, database)
+    expected, squared = nearest_palette_indices(lab, points)
+    assert np.array_equal(indices, expected)
+    assert np.allclose(delta_e, np.sqrt(squared))
+    cached = pm.PrintMatcher(characterization, finder, str(tmp_path), subdivide)
+    assert np.array_equal(cached.cell_labels(database), matcher.cell_labels(database))
+
+
+def test_single_match_uses_batch_result(characterization, finder):
+    matcher = pm.PrintMatcher(characterization, finder)
+    names, _ = finder.get_palette_arrays('ral', 'lab')
+    _, indices, delta_e = matcher.match_array([(10, 80, 60, 5)], 'ral')
+    assert matcher.match((10, 80, 60, 5), 'ral') == (names[indices[0]], float(delta_e[0]))
+    assert matcher.match((10, 80, 60, 5), 'ral') is matcher.match((10, 80, 60, 5), 'ral')
+
+
+def test_recipe_in_gamut(characterization, model):
+    """网格节点本身的配方就是该节点"""
+    cmyk, lab = model
+    recipe, delta_e = pm.PrintMatcher(characterization).recipe(lab[1234])
+    assert np.allclose(recipe, cmyk[1234]) and delta_e < 1e-3
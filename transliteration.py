@@ -0,0 +1,176 @@
+"""颜色名称的拼音和罗马字
+
+搜索时可以输入拼音或罗马字代替汉字: "xingrenhuang"、"xrh" 找到杏仁黄,
+"sakura" 找到桜色。读音来自随程序附带的 transliteration.json, 运行时不需要联网或
+安装其他库:
+    pinyin    {汉字: [拼音, ...]}, 覆盖颜色数据库 (包括 中文/ 下的完整版本) 用到的汉字,
+              多音字只保留在颜色名称中实际出现的读音
+    romaji    {日本传统色名称: [罗马字词, ...]}, 日文读音依赖词语, 按整个名称保存
+
+每个名称的查找键为全拼 (ü 写作 v, 另加写作 u 的键)、拼音首字母, 日本传统色为
+罗马字 (另加省略长音 ou/uu 的键)。表中缺少的汉字所在的名称不生成拼音键。
+
+数据库增加了新的汉字或日本传统色时重新生成 (需要安装 pypinyin 和 pykakasi):
+    python transliteration.py build
+    python transliteration.py show 杏仁黄 -d chinese
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import sys
+
+from color_core import DATABASES, normalize_color_table, read_color_json, split_color_code
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transliteration.json')
+# 多音字组合出的全拼键最多保留的数量
+MAX_PINYIN_COMBINATIONS = 8
+
+_table = None
+
+
+def is_cjk(char):
+    return '㐀' <= char <= '鿿' or '豈' <= char <= '﫿'
+
+
+def load_table(path=TABLE_PATH):
+    """读取读音表, 结果缓存; 文件不存在时返回空表"""
+    global _table
+    if _table is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _table = json.load(f)
+        except (OSError, ValueError):
+            _table = {}
+        _table.setdefault('pinyin', {})
+        _table.setdefault('romaji', {})
+    return _table
+
+
+def pinyin_keys(text):
+    """文本的全拼和拼音首字母键, 含有表中没有的汉字时返回空列表"""
+    table = load_table()['pinyin']
+    choices = []
+    for char in text.casefold():
+        if is_cjk(char):
+            readings = table.get(char)
+            if not readings:
+                return []
+            choices.append(readings)
+        elif char.isalnum():
+            choices.append([char])
+    if not any(is_cjk(char) for char in text):
+        return []
+    keys = []
+    for readings in itertools.islice(itertools.product(*choices), MAX_PINYIN_COMBINATIONS):
+        full = ''.join(readings)
+        keys.append(full)
+        if 'v' in full:
+            keys.append(full.replace('v', 'u'))
+    keys.append(''.join(readings[0][0] for readings in choices))
+    return list(dict.fromkeys(keys))
+
+
+def romaji_keys(name):
+    """日本传统色名称的罗马字键, 表中没有时返回空列表"""
+    words = load_table()['romaji'].get(name)
+    if not words:
+        return []
+    full = ''.join(words)
+    return list(dict.fromkeys([full, full.replace('ou', 'o').replace('uu', 'u')]))
+
+
+def transliteration_keys(database, name):
+    """数据库中一个颜色名称的拼音或罗马字查找键"""
+    if database == 'japanese':
+        return romaji_keys(name)
+    return pinyin_keys(split_color_code(name)[1])
+
+
+def _source_names(directory):
+    """各数据库及 中文/ 下各版本文件中的 {数据库: 名称集合}"""
+    names = {}
+    for database, (_, _, filename) in DATABASES.items():
+        stem = os.path.splitext(filename)[0]
+        paths = [os.path.join(directory, filename)] + glob.glob(os.path.join(directory, '中文', f'{stem} - *.json'))
+        for path in paths:
+            try:
+                data = read_color_json(path)
+            except (OSError, ValueError):
+                continue
+            if database == 'gb':
+                found = [entry.get('name', '') for entry in data.values() if isinstance(entry, dict)]
+            else:
+                found = list(normalize_color_table(data).values())
+            names.setdefault(database, set()).update(found)
+    return names
+
+
+def build_table(directory=None, path=TABLE_PATH):
+    """由颜色数据库生成读音表并写入 path, 需要 pypinyin 和 pykakasi"""
+    try:
+        from pypinyin import lazy_pinyin
+        import pykakasi
+    except ImportError as e:
+        raise ImportError("生成读音表需要安装 pypinyin 和 pykakasi: pip install pypinyin pykakasi") from e
+    names = _source_names(directory or os.path.dirname(os.path.abspath(__file__)))
+
+    # 按词语整体注音, 多音字只保留在颜色名称中出现过的读音 (按出现次数排序)
+    counts = {}
+    for database, found in names.items():
+        if database == 'japanese':
+            continue
+        for name in found:
+            text = ''.join(char for char in split_color_code(name)[1] if is_cjk(char))
+            for char, reading in zip(text, lazy_pinyin(text, errors=lambda chars: [''] * len(chars))):
+                if reading.isalpha():
+                    char_counts = counts.setdefault(char, {})
+                    char_counts[reading] = char_counts.get(reading, 0) + 1
+    pinyin = {char: sorted(readings, key=lambda r: (-readings[r], r)) for char, readings in sorted(counts.items())}
+
+    kakasi = pykakasi.kakasi()
+    romaji = {}
+    for name in sorted(names.get('japanese', ())):
+        # 去掉 "kon'iro" 中分隔音节的撇号
+        words = [item['hepburn'].replace("'", '') for item in kakasi.convert(name) if item['hepburn'].strip()]
+        if words and all(word.isascii() and word.isalpha() for word in words):
+            romaji[name] = words
+
+    table = {'pinyin': pinyin, 'romaji': romaji}
+    # 每个条目一行, 便于比较不同版本
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        for i, (section, entries) in enumerate(table.items()):
+            f.write(f'  {json.dumps(section)}: {{\n')
+            lines = [f'    {json.dumps(key, ensure_ascii=False)}: {json.dumps(value)}' for key, value in entries.items()]
+            f.write(',\n'.join(lines) + '\n')
+            f.write('  }' + (',' if i < len(table) - 1 else '') + '\n')
+        f.write('}\n')
+    global _table
+    _table = None
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='颜色名称的拼音和罗马字')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='由颜色数据库重新生成读音表 (需要 pypinyin 和 pykakasi)')
+    build.add_argument('-o', '--output', default=TABLE_PATH, help='输出文件')
+    show = subparsers.add_parser('show', help='显示名称的查找键')
+    show.add_argument('name', nargs='+', help='颜色名称')
+    show.add_argument('-d', '--database', default='chinese', choices=list(DATABASES), help='名称所在的数据库')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        table = build_table(path=args.output)
+        print(f"已生成 {args.output}: {len(table['pinyin'])} 个汉字, {len(table['romaji'])} 个日本传统色",
+              file=sys.stderr)
+        return 0
+    for name in args.name:
+        print(name, ' '.join(transliteration_keys(args.database, name)) or '(无)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())